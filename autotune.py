@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Parameter autotuner for Face Navigator
+Replays recorded landmark traces with labelled clicks and still periods
+against grids of blink and cursor settings. The blink state machine and
+the cursor movement law are evaluated for every candidate setting at once
+with numpy, and the best settings are written as a config file per user.
+
+Labels live next to each trace as <trace>.labels.json:
+    {"user": "alice",
+     "clicks": [[12.40, "left"], [15.05, "right"]],
+     "still": [[3.0, 8.0], [20.0, 25.0]]}
+clicks are the times the user blinked to click, and still the intervals in
+which they held their head at rest and expected the cursor to stay put.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from observation import eye_aspect_ratio_series
+from session_recorder import load_session
+from settings import load_config
+
+# Candidate values; the blink and cursor grids are independent and tuned separately
+BLINK_GRID = {
+    'eye_ar_threshold': np.round(np.arange(0.15, 0.351, 0.01), 2),
+    'blink_min_ms': np.arange(40, 241, 20),
+    'blink_cooldown': np.round(np.arange(0.2, 1.01, 0.1), 1),
+}
+CURSOR_GRID = {
+    'smoothing_factor': np.round(np.arange(0.0, 0.951, 0.05), 2),
+    'movement_threshold': np.arange(0.0, 30.1, 1.0),
+}
+
+# Same as the live code: EyeBlinkDetector hysteresis and gap, calibration frames and running average,
+# and the most frame intervals one cursor step covers
+HYSTERESIS = 0.02
+MAX_GAP = 0.5
+CALIBRATION_FRAMES = 30
+CALIBRATION_ALPHA = 0.1
+MAX_CURSOR_STEPS = 4.0
+
+# Eye code of a blink of both eyes in blink_events (0 is left, 1 right)
+BOTH = 2
+
+
+def load_trace(path):
+    """Return (timestamps, landmarks) of the frames with a face in an .npz trace or .npy recording"""
+    if path.endswith('.npy'):
+        records = load_session(path)
+        found = records['found']
+        return records['timestamp'][found].astype(np.float64), records['landmarks'][found].astype(np.float64)
+    data = np.load(path)
+    found = data['found'].astype(bool) if 'found' in data else np.ones(len(data['landmarks']), dtype=bool)
+    return data['timestamps'][found].astype(np.float64), data['landmarks'][found].astype(np.float64)
+
+
+def load_labels(path):
+    """Return the labels next to a trace, or None"""
+    labels_path = os.path.splitext(path)[0] + ".labels.json"
+    if not os.path.exists(labels_path):
+        return None
+    with open(labels_path, 'r') as f:
+        labels = json.load(f)
+    return {
+        "user": labels.get('user', 'default'),
+        "clicks": [(float(t), eye) for t, eye in labels.get('clicks', [])],
+        "still": [(float(start), float(end)) for start, end in labels.get('still', [])]
+    }
+
+
+def _crossing_times(ear, timestamps, j, levels):
+    """Interpolated times at which ear crossed levels between samples j - 1 and j (j = 0: the first sample)"""
+    previous = np.maximum(j - 1, 0)
+    v0, v1 = ear[previous], ear[j]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fraction = np.where(v0 == v1, 1.0, np.clip((v0 - levels) / (v0 - v1), 0.0, 1.0))
+    return timestamps[previous] + fraction * (timestamps[j] - timestamps[previous])
+
+
+def _closures(ear, timestamps, thresholds, hysteresis=HYSTERESIS, max_gap=MAX_GAP):
+    """Closed state after each sample and the closures that ended, for every threshold at once
+
+    Returns the (K, N) closed states and, per ended closure, its threshold
+    row, end sample, duration and whether the eye opened (False for a
+    closure cut short by a gap). See eye_closures.
+    """
+    n = len(ear)
+    reset = np.concatenate(([False], np.diff(timestamps) > max_gap))
+    closing = (ear[None, :] < thresholds[:, None]) & ~reset
+    opening = (ear[None, :] > thresholds[:, None] + hysteresis) | reset
+
+    # The state after each sample is set by the last sample that crossed either level
+    last = np.where(closing | opening, np.arange(n), -1)
+    np.maximum.accumulate(last, axis=1, out=last)
+    closed = np.take_along_axis(closing, np.maximum(last, 0), axis=1) & (last >= 0)
+
+    # Open before the first sample, so every closure starts with a transition
+    change = np.diff(closed.astype(np.int8), axis=1, prepend=0)
+    start_k, start_j = np.nonzero(change == 1)
+    end_k, end_j = np.nonzero(change == -1)
+
+    # Pair each end with the start before it in the same row; a closure still open at the end is dropped
+    ends_per_row = np.bincount(end_k, minlength=len(thresholds))
+    start_rank = np.arange(len(start_k)) - np.searchsorted(start_k, start_k)
+    complete = start_rank < ends_per_row[start_k]
+    start_j = start_j[complete]
+
+    started = _crossing_times(ear, timestamps, start_j, thresholds[end_k])
+    ended = _crossing_times(ear, timestamps, end_j, thresholds[end_k] + hysteresis)
+
+    # A closure cut short by a gap ended without the eye opening, so it is not a blink
+    valid = ~reset[end_j]
+    return closed, end_k, end_j, ended - started, valid
+
+
+def eye_closures(ear, timestamps, thresholds, hysteresis=HYSTERESIS, max_gap=MAX_GAP):
+    """Closures of one eye for every threshold at once
+
+    Returns (K, E) end times and durations (NaN-padded) for K thresholds:
+    the eye closes below the threshold and opens above threshold +
+    hysteresis, as in EyeBlinkDetector with a fixed threshold. The first
+    sample after a gap of more than max_gap forces the eye open, as the
+    live detector's reset does, so a closure can start right after it.
+    """
+    _, end_k, end_j, closure_durations, valid = _closures(ear, timestamps, thresholds, hysteresis, max_gap)
+    ends_per_row = np.bincount(end_k, minlength=len(thresholds))
+    end_rank = np.arange(len(end_k)) - np.searchsorted(end_k, end_k)
+    width = max(int(ends_per_row.max()) if len(end_k) else 0, 1)
+    end_times = np.full((len(thresholds), width), np.nan)
+    durations = np.full((len(thresholds), width), np.nan)
+    end_times[end_k[valid], end_rank[valid]] = timestamps[end_j[valid]]
+    durations[end_k[valid], end_rank[valid]] = closure_durations[valid]
+    return end_times, durations
+
+
+def blink_events(ears, timestamps, thresholds):
+    """Blinks of both eyes for every threshold, as BlinkDetector reports them before its cooldown
+
+    Returns (K, E) NaN-padded end times, shorter and longer closure
+    durations, and eyes (0 left, 1 right, BOTH). Overlapping closures of
+    the two eyes are one bilateral blink when the second eye opens, which
+    is accepted only if both closure lengths are. Pairing follows the live
+    detector's state, so it is stepped through per threshold.
+    """
+    eyes = [_closures(ears[:, eye], timestamps, thresholds) for eye in range(2)]
+    rows = []
+    for k in range(len(thresholds)):
+        # (end sample, eye, duration, eye opened), left first on ties
+        ends = sorted((j, eye, d, v) for eye, (_, end_k, end_j, durations, valid) in enumerate(eyes)
+                      for j, d, v in zip(end_j[end_k == k], durations[end_k == k], valid[end_k == k]))
+        events = []
+        pending = {}
+        i = 0
+        while i < len(ends):
+            j = ends[i][0]
+            ended = {}
+            while i < len(ends) and ends[i][0] == j:
+                if ends[i][3]:
+                    ended[ends[i][1]] = ends[i][2]
+                i += 1
+
+            if len(ended) == 2:
+                events.append((timestamps[j], min(ended.values()), max(ended.values()), BOTH))
+                pending.clear()
+            elif ended:
+                (eye, duration), = ended.items()
+                if 1 - eye in pending:
+                    other = pending.pop(1 - eye)
+                    events.append((timestamps[j], min(duration, other), max(duration, other), BOTH))
+                elif eyes[1 - eye][0][k, j]:
+                    pending[eye] = duration
+                else:
+                    events.append((timestamps[j], duration, duration, eye))
+            for eye in list(pending):
+                if not eyes[1 - eye][0][k, j]:
+                    del pending[eye]
+        rows.append(events)
+
+    width = max(max((len(events) for events in rows), default=0), 1)
+    table = np.full((4, len(thresholds), width), np.nan)
+    for k, events in enumerate(rows):
+        if events:
+            table[:, k, :len(events)] = np.array(events).T
+    return table[0], table[1], table[2], table[3]
+
+
+def blink_counts(timestamps, landmarks, clicks, thresholds, min_durations, cooldowns, max_duration,
+                 both_action='none', tolerance=0.5):
+    """True positive, false positive and false negative clicks for every (threshold, min, cooldown)
+
+    Returns three (K, M, C) arrays. A click counts as a true positive when
+    it is on the labelled eye within tolerance seconds of a labelled blink.
+    Bilateral blinks click as both_action says, and start the cooldown
+    even when they do not click.
+    """
+    ears = eye_aspect_ratio_series(landmarks)
+    times, shortest, longest, eyes = blink_events(ears, timestamps, thresholds)
+
+    # Blink length accepted, per minimum duration: (K, M, E)
+    with np.errstate(invalid='ignore'):
+        accepted = ((shortest[:, None, :] >= min_durations[None, :, None] / 1000.0)
+                    & (longest[:, None, :] <= max_duration))
+    clicking = eyes != BOTH
+    if both_action != 'none':
+        eyes = np.where(eyes == BOTH, 0 if both_action == 'left' else 1, eyes)
+        clicking = ~np.isnan(eyes)
+
+    # The cooldown depends on the previous click, so step through the events, vectorised over settings
+    shape = (len(thresholds), len(min_durations), len(cooldowns))
+    fired = np.zeros(shape + (times.shape[1],), dtype=bool)
+    last_click = np.full(shape, -np.inf)
+    for e in range(times.shape[1]):
+        t = times[:, e][:, None, None]
+        with np.errstate(invalid='ignore'):
+            click = accepted[:, :, e][:, :, None] & (t - last_click >= cooldowns[None, None, :])
+        fired[..., e] = click & clicking[:, e][:, None, None]
+        last_click = np.where(click, t, last_click)
+
+    # Each closure's labelled blink (same eye, within tolerance), independent of the settings
+    label_times = np.array([t for t, _ in clicks], dtype=np.float64)
+    label_eyes = np.array([0 if eye == 'left' else 1 for _, eye in clicks])
+    if len(clicks):
+        distance = np.abs(times[:, :, None] - label_times[None, None, :])
+        distance[eyes[:, :, None] != label_eyes[None, None, :]] = np.inf
+        distance[np.isnan(distance)] = np.inf
+        nearest = distance.argmin(axis=2)
+        matches = (nearest[:, :, None] == np.arange(len(clicks))) & (distance.min(axis=2) <= tolerance)[:, :, None]
+        hits = np.einsum('kmce,kel->kmcl', fired.astype(np.float32), matches.astype(np.float32))
+        true_positives = (hits > 0).sum(axis=3)
+    else:
+        true_positives = np.zeros(shape, dtype=np.int64)
+    false_positives = fired.sum(axis=3) - true_positives
+    false_negatives = len(clicks) - true_positives
+    return true_positives, false_positives, false_negatives
+
+
+def cursor_paths(timestamps, landmarks, still, sensitivity, thresholds, target_fps):
+    """Head-offset path sums while still and while moving, per movement threshold
+
+    In move_cursor_with_face the smoothed position is a * last + (1 - a) * (last
+    + steps * movement), with steps the frame intervals at target_fps since the
+    last frame, so each move is (1 - a) * steps * movement: the cursor path is
+    (1 - a) times the sum of the scaled movements that pass the threshold.
+    Returns (still path, moving path) per threshold and the (still, moving) seconds.
+    """
+    centres = landmarks.mean(axis=1)
+    baseline = centres[0].copy()
+    for centre in centres[1:CALIBRATION_FRAMES]:
+        baseline = (1 - CALIBRATION_ALPHA) * baseline + CALIBRATION_ALPHA * centre
+    movement = np.linalg.norm((centres - baseline) * sensitivity, axis=1)
+    movement[:CALIBRATION_FRAMES] = 0.0
+
+    is_still = np.zeros(len(timestamps), dtype=bool)
+    for start, end in still:
+        is_still |= (timestamps >= start) & (timestamps <= end)
+    dt = np.diff(timestamps, prepend=timestamps[0])
+    moving = ~is_still
+    moving[:CALIBRATION_FRAMES] = False
+
+    steps = np.minimum(dt * target_fps, MAX_CURSOR_STEPS)
+    steps[0] = 1.0
+    passed = (movement * steps)[None, :] * (movement[None, :] >= thresholds[:, None])
+    return passed[:, is_still].sum(axis=1), passed[:, moving].sum(axis=1), dt[is_still].sum(), dt[moving].sum()
+
+
+def tune_user(traces, config, speed_tolerance=0.15):
+    """Evaluate the grids over one user's (path, timestamps, landmarks, labels) traces"""
+    grid = BLINK_GRID
+    current = {key: np.array([config[key]], dtype=np.float64) for key in list(BLINK_GRID) + list(CURSOR_GRID)}
+    shape = tuple(len(values) for values in grid.values())
+    totals = [np.zeros(shape), np.zeros(shape), np.zeros(shape)]
+    before = np.zeros(3)
+    still_path = np.zeros(len(CURSOR_GRID['movement_threshold']))
+    moving_path = np.zeros_like(still_path)
+    current_paths = np.zeros(2)
+    still_time = moving_time = 0.0
+
+    for _, timestamps, landmarks, labels in traces:
+        for candidates, target in (((grid['eye_ar_threshold'], grid['blink_min_ms'], grid['blink_cooldown']),
+                                    totals),
+                                   ((current['eye_ar_threshold'], current['blink_min_ms'],
+                                     current['blink_cooldown']), None)):
+            counts = blink_counts(timestamps, landmarks, labels['clicks'], *candidates,
+                                  max_duration=config['blink_max_ms'] / 1000.0,
+                                  both_action=config['blink_both_action'])
+            if target is None:
+                before += [float(count.ravel()[0]) for count in counts]
+            else:
+                for total, count in zip(target, counts):
+                    total += count
+        if labels['still']:
+            paths = cursor_paths(timestamps, landmarks, labels['still'], config['sensitivity'],
+                                 CURSOR_GRID['movement_threshold'], config['target_fps'])
+            still_path += paths[0]
+            moving_path += paths[1]
+            still_time += paths[2]
+            moving_time += paths[3]
+            current_still, current_moving, _, _ = cursor_paths(timestamps, landmarks, labels['still'],
+                                                               config['sensitivity'],
+                                                               current['movement_threshold'],
+                                                               config['target_fps'])
+            current_paths += [current_still[0], current_moving[0]]
+
+    def f1(tp, fp, fn):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(tp > 0, 2 * tp / (2 * tp + fp + fn), 0.0)
+
+    # Best F1, then the fewest false clicks
+    true_positives, false_positives, false_negatives = totals
+    score = f1(true_positives, false_positives, false_negatives) - 1e-6 * false_positives
+    best = np.unravel_index(np.argmax(score), shape)
+    result = {
+        "settings": {key: float(values[i]) for (key, values), i in zip(grid.items(), best)},
+        "blink_f1": float(f1(*(t[best] for t in totals))),
+        "blink_f1_before": float(f1(*before)),
+        "false_clicks": int(false_positives[best]),
+        "missed_clicks": int(false_negatives[best]),
+        "configurations": int(np.prod(shape))
+    }
+
+    if still_time > 0 and moving_time > 0:
+        # Keep deliberate movement as fast as with the current settings and minimise drift while still
+        gain = 1.0 - CURSOR_GRID['smoothing_factor'][:, None]
+        speed = gain * moving_path[None, :] / moving_time
+        drift = gain * still_path[None, :] / still_time
+        target_speed = (1.0 - config['smoothing_factor']) * current_paths[1] / moving_time
+        allowed = np.abs(speed - target_speed) <= speed_tolerance * target_speed
+        if allowed.any():
+            # Least drift, then the speed closest to the current one
+            cost = drift + 1e-6 * np.abs(speed - target_speed)
+            a, t = np.unravel_index(np.argmin(np.where(allowed, cost, np.inf)), drift.shape)
+            result["settings"]["smoothing_factor"] = float(CURSOR_GRID['smoothing_factor'][a])
+            result["settings"]["movement_threshold"] = float(CURSOR_GRID['movement_threshold'][t])
+            result["drift"] = float(drift[a, t])
+            result["drift_before"] = float((1.0 - config['smoothing_factor']) * current_paths[0] / still_time)
+        result["configurations"] += drift.size
+    return result
+
+
+def write_config(path, config):
+    partial = path + ".part"
+    with open(partial, 'w') as f:
+        json.dump(config, f, indent=4)
+    os.replace(partial, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tune blink and cursor settings on labelled landmark traces')
+    parser.add_argument('traces', nargs='+', help='.npz landmark traces or .npy session recordings with labels')
+    parser.add_argument('--config', default='config.json', help='Configuration to start from')
+    parser.add_argument('--output-dir', default='tuned', help='Directory for the per-user config files')
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    users = {}
+    for path in args.traces:
+        labels = load_labels(path)
+        if labels is None:
+            print(f"{path}: no labels, skipped")
+            continue
+        timestamps, landmarks = load_trace(path)
+        users.setdefault(labels['user'], []).append((path, timestamps, landmarks, labels))
+    if not users:
+        print("No labelled traces")
+        return 1
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for user, traces in sorted(users.items()):
+        start = time.perf_counter()
+        result = tune_user(traces, config)
+        elapsed = time.perf_counter() - start
+
+        tuned = dict(config)
+        tuned.update(result['settings'])
+        tuned['blink_min_ms'] = int(tuned['blink_min_ms'])
+        # The tuned threshold is this user's own, so it replaces the adaptive one
+        tuned['blink_adaptive_threshold'] = False
+        output = os.path.join(args.output_dir, f"config_{user}.json")
+        write_config(output, tuned)
+
+        print(f"{user}: {len(traces)} traces, {result['configurations']} configurations in {elapsed:.2f}s")
+        print(f"  blinks: F1 {result['blink_f1_before']:.3f} -> {result['blink_f1']:.3f} "
+              f"({result['false_clicks']} false, {result['missed_clicks']} missed clicks)")
+        if 'drift' in result:
+            print(f"  cursor drift while still: {result['drift_before']:.1f} -> {result['drift']:.1f} px/s "
+                  f"at the same speed for deliberate movement")
+        print("  " + ", ".join(f"{key} {value:g}" for key, value in result['settings'].items()) + f" -> {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
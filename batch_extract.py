@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Offline landmark extraction for Face Navigator
+Splits recorded videos into chunks of frames and runs the live loop's
+detector and landmark predictor on them in a pool of worker processes.
+Each video becomes a compressed .npz landmark trace or a memory-mapped .npy
+session recording; both replay with --input and feed the benchmarks.
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+from numpy.lib import format as npy_format
+
+from observation import eye_aspect_ratios
+from parallel_pipeline import LandmarkAnalyzer
+from session_recorder import RECORD_DTYPE
+from settings import load_config
+
+OUTPUT_FORMATS = ('npz', 'npy')
+
+# Analyzer of this worker process, set up once by the pool initializer
+_analyzer = None
+
+
+def video_chunks(path, chunk_frames):
+    """Return (path, start, count, fps) tasks covering every frame of a video"""
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise IOError(f"Could not open video {path}")
+    total = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+    capture.release()
+    if total <= 0:
+        # Unknown length: one chunk that reads to the end
+        return [(path, 0, sys.maxsize, fps)]
+    return [(path, start, min(chunk_frames, total - start), fps) for start in range(0, total, chunk_frames)]
+
+
+def _init_worker(analyzer):
+    global _analyzer
+    # One OpenCV thread per worker: the pool already uses every core
+    cv2.setNumThreads(1)
+    analyzer.setup()
+    _analyzer = analyzer
+
+
+def _open_at(path, start):
+    """Open a video positioned at frame start, decoding from the beginning if seeking is inexact"""
+    capture = cv2.VideoCapture(path)
+    if start:
+        capture.set(cv2.CAP_PROP_POS_FRAMES, start)
+        if int(capture.get(cv2.CAP_PROP_POS_FRAMES)) != start:
+            capture.release()
+            capture = cv2.VideoCapture(path)
+            for _ in range(start):
+                capture.grab()
+    return capture
+
+
+def _extract_chunk(task):
+    """Worker: landmarks of one chunk as (path, start, timestamps, landmarks, rects, found, seconds)"""
+    path, start, count, fps = task
+    began = time.perf_counter()
+    # The tracker must not carry a face over from another chunk
+    _analyzer.reset()
+    capture = _open_at(path, start)
+    capacity = min(count, 4096)
+    landmarks = np.zeros((capacity, 68, 2), dtype=np.int32)
+    rects = np.full((capacity, 4), -1, dtype=np.int32)
+    found = np.zeros(capacity, dtype=bool)
+
+    frames = 0
+    while frames < count:
+        ret, frame = capture.read()
+        if not ret:
+            break
+        if frames == capacity:
+            capacity *= 2
+            landmarks = np.resize(landmarks, (capacity, 68, 2))
+            rects = np.resize(rects, (capacity, 4))
+            found = np.resize(found, capacity)
+        points, rect = _analyzer(frame)
+        found[frames] = points is not None
+        landmarks[frames] = points if points is not None else 0
+        rects[frames] = rect if rect is not None else -1
+        frames += 1
+    capture.release()
+
+    timestamps = (start + np.arange(frames)) / fps
+    return (path, start, timestamps, landmarks[:frames], rects[:frames], found[:frames],
+            time.perf_counter() - began)
+
+
+def write_trace(path, timestamps, landmarks, rects, found, output_format='npz'):
+    """Write one video's landmarks as an .npz trace or a .npy session recording"""
+    partial = path + ".part"
+    if output_format == 'npz':
+        with open(partial, 'wb') as f:
+            np.savez_compressed(f, timestamps=timestamps, landmarks=landmarks, rects=rects, found=found)
+    else:
+        records = npy_format.open_memmap(partial, mode='w+', dtype=RECORD_DTYPE, shape=(len(timestamps),))
+        records['frame'] = np.arange(1, len(timestamps) + 1)
+        records['timestamp'] = timestamps
+        records['found'] = found
+        records['rect'] = rects
+        records['landmarks'] = landmarks
+        for i in np.flatnonzero(found):
+            records['ear'][i] = eye_aspect_ratios(landmarks[i])
+        records.flush()
+        del records
+    os.replace(partial, path)
+
+
+def output_names(videos):
+    """Trace name of each video: its file name, or its path below the common directory on a clash"""
+    groups = {}
+    for video in videos:
+        groups.setdefault(os.path.splitext(os.path.basename(video))[0], []).append(video)
+    names = {}
+    for name, group in groups.items():
+        if len(group) == 1:
+            names[group[0]] = name
+            continue
+        common = os.path.commonpath([os.path.abspath(video) for video in group])
+        for video in group:
+            relative = os.path.relpath(os.path.abspath(video), common)
+            names[video] = os.path.splitext(relative)[0].replace(os.sep, '_')
+    clashes = sorted(video for video in names if list(names.values()).count(names[video]) > 1)
+    if clashes:
+        raise ValueError(f"Videos would overwrite each other's traces: {', '.join(clashes)}")
+    return names
+
+
+def extract(videos, analyzer, output_dir, workers, chunk_frames=300, output_format='npz'):
+    """Extract landmarks from every video with a pool of workers; returns per-video frame/face counts"""
+    # A video listed twice (under any spelling of its path) is extracted once
+    unique = {}
+    for video in videos:
+        unique.setdefault(os.path.realpath(video), video)
+    videos = list(unique.values())
+    names = output_names(videos)
+
+    os.makedirs(output_dir, exist_ok=True)
+    tasks = [task for video in videos for task in video_chunks(video, chunk_frames)]
+    pending = {video: sum(1 for task in tasks if task[0] == video) for video in videos}
+    chunks = {video: [] for video in videos}
+    summary = {}
+
+    # Longest chunks first, so a long tail does not leave workers idle at the end
+    tasks.sort(key=lambda task: -min(task[2], chunk_frames))
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(workers, initializer=_init_worker, initargs=(analyzer,)) as pool:
+        for result in pool.imap_unordered(_extract_chunk, tasks):
+            video = result[0]
+            chunks[video].append(result)
+            pending[video] -= 1
+            if pending[video]:
+                continue
+
+            # All chunks of this video are in: put them back in order and write it out
+            parts = sorted(chunks.pop(video), key=lambda part: part[1])
+            timestamps, landmarks, rects, found = (np.concatenate([part[i] for part in parts])
+                                                   for i in range(2, 6))
+            output = os.path.join(output_dir, f"{names[video]}.{output_format}")
+            write_trace(output, timestamps, landmarks, rects, found, output_format)
+            summary[video] = {
+                "output": output,
+                "frames": len(found),
+                "faces": int(found.sum()),
+                "worker_seconds": sum(part[6] for part in parts)
+            }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Extract landmark traces from recorded videos on all cores')
+    parser.add_argument('videos', nargs='+', help='Video files')
+    parser.add_argument('--output-dir', default='traces', help='Directory for the traces')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='npz',
+                        help='Compressed .npz trace or memory-mapped .npy session recording')
+    parser.add_argument('--workers', type=int, nargs='+', default=[os.cpu_count() or 1],
+                        help='Worker processes; several counts rerun the extraction and report the scaling')
+    parser.add_argument('--chunk-frames', type=int, default=300, help='Frames per task')
+    parser.add_argument('--predictor', default='shape_predictor_68_face_landmarks.dat',
+                        help='dlib 68-point landmark model')
+    parser.add_argument('--config', default='config.json', help='Configuration file path')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.predictor):
+        print(f"Landmark model {args.predictor} not found; run face_navigator.py once to download it")
+        return 1
+    analyzer = LandmarkAnalyzer(load_config(args.config), args.predictor)
+
+    print(f"{'workers':>7} {'frames':>7} {'seconds':>8} {'fps':>7} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        summary = extract(args.videos, analyzer, args.output_dir, workers, args.chunk_frames, args.format)
+        elapsed = time.perf_counter() - start
+        frames = sum(video['frames'] for video in summary.values())
+        fps = frames / elapsed if elapsed > 0 else 0.0
+        baseline = baseline or fps
+        print(f"{workers:>7} {frames:>7} {elapsed:8.1f} {fps:7.1f} {fps / baseline if baseline else 0.0:7.2f}x")
+
+    for video, result in summary.items():
+        print(f"{video}: {result['frames']} frames, {result['faces']} with a face -> {result['output']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,555 @@
+#!/usr/bin/env python3
+"""
+Offline benchmarks for Face Navigator
+Runs pipeline stages over recorded frames instead of a live camera
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from frame_sources import open_source
+from settings import load_config
+
+
+def load_frames(path, limit=300):
+    """Load up to limit grayscale frames from a video file or image directory"""
+    source = open_source(path)
+    frames = []
+
+    while len(frames) < limit:
+        ret, frame = source.read()
+        if not ret:
+            break
+        frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
+    source.release()
+
+    return frames
+
+
+def latency_summary(samples):
+    """Return mean/p50/p95/p99 of latency samples in milliseconds"""
+    samples = np.asarray(samples) * 1000.0
+    return {
+        "mean": float(samples.mean()),
+        "p50": float(np.percentile(samples, 50)),
+        "p95": float(np.percentile(samples, 95)),
+        "p99": float(np.percentile(samples, 99))
+    }
+
+
+def rectangle_shift(a, b):
+    """Mean absolute corner displacement in pixels between two dlib rectangles"""
+    return (abs(a.left() - b.left()) + abs(a.top() - b.top()) +
+            abs(a.right() - b.right()) + abs(a.bottom() - b.bottom())) / 4.0
+
+
+def benchmark_scales(frames, config, backend, scales):
+    """Compare detection latency and rectangle shift at several detection scales"""
+    from detectors import create_detector
+
+    # Full-resolution detections are the reference for the rectangle shift
+    full_resolution = create_detector(config, backend, scale=1.0)
+    reference = [full_resolution(gray) for gray in frames]
+
+    print(f"{'scale':>6} {'mean ms':>8} {'p50':>7} {'p95':>7} {'p99':>7} {'saved':>7} {'found':>6} {'shift px':>9}")
+    baseline_mean = None
+
+    for scale in scales:
+        detector = create_detector(config, backend, scale=scale)
+        timings = []
+        shifts = []
+        found = 0
+
+        for gray, ref in zip(frames, reference):
+            start = time.perf_counter()
+            faces = detector(gray)
+            timings.append(time.perf_counter() - start)
+
+            if faces:
+                found += 1
+                if ref:
+                    shifts.append(rectangle_shift(faces[0], ref[0]))
+
+        summary = latency_summary(timings)
+        if baseline_mean is None:
+            baseline_mean = summary['mean']
+        saved = baseline_mean - summary['mean']
+        shift = f"{np.mean(shifts):9.1f}" if shifts else f"{'-':>9}"
+
+        print(f"{scale:6.2f} {summary['mean']:8.2f} {summary['p50']:7.2f} {summary['p95']:7.2f} "
+              f"{summary['p99']:7.2f} {saved:7.2f} {found:6d} {shift}")
+
+
+def benchmark_detectors(frames, config, backends):
+    """Run every detector backend over the same frames"""
+    from detectors import create_detector
+
+    print(f"{'backend':>10} {'mean ms':>8} {'p50':>7} {'p95':>7} {'p99':>7} {'found %':>8}")
+
+    for backend in backends:
+        try:
+            detector = create_detector(config, backend)
+        except Exception as e:
+            print(f"{backend:>10} unavailable: {e}")
+            continue
+
+        timings = []
+        found = 0
+        for gray in frames:
+            start = time.perf_counter()
+            faces = detector(gray)
+            timings.append(time.perf_counter() - start)
+            if faces:
+                found += 1
+
+        summary = latency_summary(timings)
+        print(f"{backend:>10} {summary['mean']:8.2f} {summary['p50']:7.2f} {summary['p95']:7.2f} "
+              f"{summary['p99']:7.2f} {100.0 * found / len(frames):8.1f}")
+
+
+def benchmark_gate(frames, config, fps):
+    """Detector CPU and wake-up latency with and without the motion gate, replaying frames at fps"""
+    from detectors import create_detector
+    from motion_gate import MotionGate
+
+    detector = create_detector(config)
+    duration = len(frames) / fps
+
+    # Reference: detection on every frame
+    start = time.process_time()
+    present = [bool(detector(gray)) for gray in frames]
+    ungated_cpu = time.process_time() - start
+
+    gate = MotionGate(threshold=config['motion_threshold'], min_area=config['motion_min_area'],
+                      face_hold=config['motion_face_hold'], recheck_min=config['motion_recheck_min'],
+                      recheck_max=config['motion_recheck_max'])
+    found = []
+    detections = 0
+    start = time.process_time()
+    for i, gray in enumerate(frames):
+        timestamp = i / fps
+        face = False
+        if gate.should_detect(gray, timestamp):
+            detections += 1
+            face = bool(detector(gray))
+            if face:
+                gate.face_found(timestamp)
+        found.append(face)
+    gated_cpu = time.process_time() - start
+
+    # Arrivals: a face in view after at least face_hold seconds without one
+    hold = max(1, int(round(config['motion_face_hold'] * fps)))
+    latencies = []
+    for i, face in enumerate(present):
+        if face and i >= hold and not any(present[i - hold:i]):
+            later = [j for j in range(i, len(found)) if found[j]]
+            latencies.append((later[0] - i) / fps if later else float('inf'))
+    missed = sum(1 for p, f in zip(present, found) if p and not f)
+
+    print(f"{'mode':>8} {'detections':>11} {'CPU % of a core':>16}")
+    print(f"{'ungated':>8} {len(frames):11d} {100.0 * ungated_cpu / duration:16.1f}")
+    print(f"{'gated':>8} {detections:11d} {100.0 * gated_cpu / duration:16.1f}")
+    stats = gate.stats()
+    print(f"Gate skipped {stats['gated']} of {stats['frames']} frames, {stats['rechecks']} static rechecks; "
+          f"{missed} frames with a face were not detected")
+    if latencies:
+        print("Wake-up latency after each arrival: " +
+              ", ".join(f"{latency * 1000:.0f} ms" for latency in latencies))
+    else:
+        print(f"No arrivals (a face after {config['motion_face_hold']:g}s without one) in this recording")
+
+
+def load_trace_centres(path):
+    """Load (timestamps, face centres) for the frames with a face from a .npz landmark trace"""
+    data = np.load(path)
+    found = data['found'].astype(bool) if 'found' in data else np.ones(len(data['landmarks']), dtype=bool)
+    return data['timestamps'][found].astype(np.float64), data['landmarks'][found].mean(axis=1)
+
+
+def filter_quality(timestamps, raw, filtered, max_lag=0.5, still_speed=20.0):
+    """Return (jitter px, lag ms) of a filtered centre trace against the raw one
+
+    Jitter is the RMS frame-to-frame second difference of the output while the
+    head is still (raw speed under still_speed px/s over a quarter second); lag
+    is the time shift that best aligns the filtered trace with the raw one.
+    """
+    frame_time = float(np.median(np.diff(timestamps)))
+
+    # Still frames: little net raw motion across a quarter-second window
+    window = max(2, int(round(0.25 / frame_time)))
+    kernel = np.ones(window) / window
+    smooth = np.stack([np.convolve(raw[:, axis], kernel, mode='same') for axis in range(2)], axis=1)
+    speed = np.linalg.norm(smooth[window:] - smooth[:-window], axis=1) / (window * frame_time)
+    still = np.zeros(len(raw), dtype=bool)
+    still[window // 2:window // 2 + len(speed)] = speed < still_speed
+    still = still[1:-1]
+
+    second_difference = np.linalg.norm(np.diff(filtered, 2, axis=0), axis=1)
+    jitter_samples = second_difference[still] if still.any() else second_difference
+    jitter = float(np.sqrt(np.mean(jitter_samples ** 2)))
+
+    # Cross-correlate mean-removed positions and refine the peak with a parabola
+    a = raw - raw.mean(axis=0)
+    b = filtered - filtered.mean(axis=0)
+    max_shift = max(1, min(len(a) // 4, int(round(max_lag / frame_time))))
+    scores = []
+    for shift in range(-max_shift, max_shift + 1):
+        if shift >= 0:
+            scores.append(np.sum(a[:len(a) - shift] * b[shift:]) / (len(a) - shift))
+        else:
+            scores.append(np.sum(a[-shift:] * b[:shift]) / (len(a) + shift))
+    peak = int(np.argmax(scores))
+    offset = 0.0
+    if 0 < peak < len(scores) - 1:
+        left, centre, right = scores[peak - 1], scores[peak], scores[peak + 1]
+        denominator = left - 2 * centre + right
+        if denominator != 0:
+            offset = 0.5 * (left - right) / denominator
+    lag = (peak - max_shift + offset) * frame_time * 1000.0
+    return jitter, lag
+
+
+def benchmark_filters(paths, config, decimations):
+    """Compare face centre filters on recorded landmark traces at several frame rates"""
+    from filters import OneEuroFilter, KalmanFilter2D
+
+    def make_filters():
+        return [
+            ("one_euro", OneEuroFilter(config['one_euro_min_cutoff'], config['one_euro_beta']), 0.0),
+            ("kalman", KalmanFilter2D(config['kalman_process_noise'], config['kalman_measurement_noise']), 0.0),
+            ("kalman+lead", KalmanFilter2D(config['kalman_process_noise'], config['kalman_measurement_noise']),
+             config['filter_eval_lead_ms'] / 1000.0)
+        ]
+
+    print(f"{'trace':>20} {'fps':>6} {'filter':>12} {'jitter px':>10} {'lag ms':>8} {'us/frame':>9}")
+
+    for path in paths:
+        timestamps, centres = load_trace_centres(path)
+        name = os.path.basename(path)[:20]
+
+        for step in decimations:
+            t = timestamps[::step]
+            raw = centres[::step]
+            if len(t) < 10:
+                continue
+            fps = 1.0 / float(np.median(np.diff(t)))
+
+            raw_jitter, _ = filter_quality(t, raw, raw)
+            print(f"{name:>20} {fps:6.1f} {'raw':>12} {raw_jitter:10.2f} {0.0:8.1f} {'-':>9}")
+
+            for filter_name, face_filter, lead in make_filters():
+                start = time.perf_counter()
+                filtered = np.array([face_filter.filter(c, ts, lead) for c, ts in zip(raw, t)])
+                cost = (time.perf_counter() - start) / len(t) * 1e6
+                jitter, lag = filter_quality(t, raw, filtered)
+                print(f"{name:>20} {fps:6.1f} {filter_name:>12} {jitter:10.2f} {lag:8.1f} {cost:9.1f}")
+
+
+def benchmark_cursor(config, backends, moves=2000):
+    """Measure the cost of cursor moves for each output backend"""
+    from cursor_output import create_cursor_output
+
+    print(f"{'backend':>10} {'mean us':>8} {'p50':>7} {'p95':>7} {'p99':>7} {'skipped':>8}")
+
+    for backend in backends:
+        try:
+            cursor = create_cursor_output(config, backend)
+        except Exception as e:
+            print(f"{backend:>10} unavailable: {e}")
+            continue
+
+        # Small circle around the screen centre, with every other move repeating the last position
+        width, height = cursor.size()
+        angles = np.repeat(np.linspace(0, 4 * np.pi, moves // 2), 2)
+        xs = width / 2 + 100 * np.cos(angles)
+        ys = height / 2 + 100 * np.sin(angles)
+
+        timings = []
+        for x, y in zip(xs, ys):
+            start = time.perf_counter()
+            cursor.move_to(x, y)
+            timings.append(time.perf_counter() - start)
+        cursor.close()
+
+        summary = latency_summary(timings)
+        print(f"{backend:>10} {summary['mean'] * 1000:8.1f} {summary['p50'] * 1000:7.1f} "
+              f"{summary['p95'] * 1000:7.1f} {summary['p99'] * 1000:7.1f} {cursor.skipped_moves:8d}")
+
+
+def benchmark_pipeline(path, config, worker_counts, frames, per_worker, predictor_path):
+    """Throughput and frame latency of the multi-process pipeline by worker count"""
+    from parallel_pipeline import ParallelLandmarkPipeline, LandmarkAnalyzer
+
+    print(f"{'workers':>7} {'frames':>7} {'fps':>7} {'speedup':>8} {'p50 ms':>7} {'p95 ms':>7} "
+          f"{'worker ms':>10} {'found':>6}")
+
+    baseline = None
+    for workers in worker_counts:
+        source = open_source(path)
+        pipeline = ParallelLandmarkPipeline(source, LandmarkAnalyzer(config, predictor_path),
+                                            workers=workers, in_flight=workers * per_worker).start()
+        found = 0
+        delivered = 0
+        start = time.perf_counter()
+        try:
+            while delivered < frames:
+                ret, result = pipeline.read()
+                if not ret:
+                    break
+                delivered += 1
+                found += result[0] is not None
+        finally:
+            elapsed = time.perf_counter() - start
+            pipeline.release()
+
+        if not delivered:
+            print(f"{workers:>7} no frames")
+            continue
+        fps = delivered / elapsed
+        baseline = baseline or fps
+        latency = pipeline.latency
+        print(f"{workers:>7} {delivered:>7} {fps:7.1f} {fps / baseline:7.2f}x {latency.percentile(50) * 1000:7.1f} "
+              f"{latency.percentile(95) * 1000:7.1f} {pipeline.worker_time.mean() * 1000:10.1f} "
+              f"{found / delivered:6.0%}")
+
+
+def make_legacy_features():
+    """Per-frame features as computed before FaceObservation: list indexing and scipy distances"""
+    from scipy.spatial import distance as dist
+
+    left_eye_points = list(range(42, 48))
+    right_eye_points = list(range(36, 42))
+
+    def eye_aspect_ratio(eye):
+        a = dist.euclidean(eye[1], eye[5])
+        b = dist.euclidean(eye[2], eye[4])
+        c = dist.euclidean(eye[0], eye[3])
+        return (a + b) / (2.0 * c)
+
+    def legacy_features(landmarks):
+        centre = np.mean(landmarks, axis=0)
+        return centre, eye_aspect_ratio(landmarks[left_eye_points]), eye_aspect_ratio(landmarks[right_eye_points])
+
+    return legacy_features
+
+
+def benchmark_features(paths, repeat):
+    """Per-frame cost of the derived face features, before and after FaceObservation"""
+    from observation import FaceObservation
+
+    if paths:
+        frames = [landmarks.astype(np.int32) for path in paths for landmarks in np.load(path)['landmarks']]
+    else:
+        # Synthetic landmarks: a 68-point face with open eyes and some noise
+        rng = np.random.default_rng(0)
+        base = rng.uniform(200, 300, (68, 2))
+        frames = [(base + rng.normal(0, 2, base.shape)).astype(np.int32) for _ in range(500)]
+
+    # Both paths must agree before timing them
+    legacy_features = make_legacy_features()
+    centre, left_ear, right_ear = legacy_features(frames[0])
+    observation = FaceObservation(frames[0])
+    if not (np.allclose(centre, observation.centre) and np.isclose(left_ear, observation.left_ear)
+            and np.isclose(right_ear, observation.right_ear)):
+        print("Feature mismatch between the legacy path and FaceObservation")
+        return 1
+
+    print(f"{'path':>16} {'us/frame':>9} {'p95 us':>7}")
+    results = {}
+    for name, compute in (("legacy", legacy_features), ("FaceObservation", FaceObservation)):
+        timings = []
+        for _ in range(repeat):
+            for landmarks in frames:
+                start = time.perf_counter()
+                compute(landmarks)
+                timings.append(time.perf_counter() - start)
+        summary = latency_summary(timings)
+        results[name] = summary['mean']
+        print(f"{name:>16} {summary['mean'] * 1000:9.2f} {summary['p95'] * 1000:7.2f}")
+    print(f"Speedup: {results['legacy'] / results['FaceObservation']:.1f}x over {len(frames)} frames x {repeat}")
+    return 0
+
+
+def benchmark_pose(paths, frame_size, repeat):
+    """Per-frame cost and jitter of the head-pose nose pointer against the landmark centre"""
+    from head_pose import HeadPoseEstimator
+
+    print(f"{'trace':>24} {'source':>9} {'us/frame':>9} {'p95 us':>7} {'jitter px':>10} "
+          f"{'range px':>9} {'jitter %':>9}")
+    for path in paths:
+        data = np.load(path)
+        found = data['found'].astype(bool) if 'found' in data else np.ones(len(data['landmarks']), dtype=bool)
+        timestamps = data['timestamps'][found].astype(np.float64)
+        frames = data['landmarks'][found].astype(np.float64)
+        if len(frames) < 10:
+            print(f"{os.path.basename(path):>24} too few frames with a face")
+            continue
+
+        estimator = HeadPoseEstimator(frame_size)
+        pointers = np.zeros((len(frames), 2))
+        failures = 0
+        for i, landmarks in enumerate(frames):
+            pose = estimator.estimate(landmarks)
+            if pose is None:
+                failures += 1
+                pointers[i] = pointers[i - 1] if i else 0.0
+            else:
+                pointers[i] = pose.pointer
+
+        def cold(landmarks):
+            estimator.reset()
+            estimator.estimate(landmarks)
+
+        signals = (("centre", frames.mean(axis=1), lambda landmarks: landmarks.mean(axis=0)),
+                   ("warm", pointers, estimator.estimate),
+                   ("cold", pointers, cold))
+        for name, signal, compute in signals:
+            estimator.reset()
+            timings = []
+            for _ in range(repeat):
+                for landmarks in frames:
+                    start = time.perf_counter()
+                    compute(landmarks)
+                    timings.append(time.perf_counter() - start)
+            summary = latency_summary(timings)
+
+            # Jitter relative to the range the signal covers, since the two sources differ in gain
+            jitter, _ = filter_quality(timestamps, signal, signal)
+            low, high = np.percentile(signal, [5, 95], axis=0)
+            motion = float(np.linalg.norm(high - low))
+            print(f"{os.path.basename(path):>24} {name:>9} {summary['mean'] * 1000:9.1f} "
+                  f"{summary['p95'] * 1000:7.1f} {jitter:10.2f} {motion:9.1f} "
+                  f"{100.0 * jitter / motion if motion else 0.0:9.2f}")
+        if failures:
+            print(f"{failures} frames without a head-pose fit")
+    return 0
+
+
+def benchmark_camera(index, width, height, frames):
+    """Probe every candidate camera mode and show the one that would be selected"""
+    from camera_modes import probe_camera, select_mode
+
+    modes = probe_camera(index, width, height, grayscale=True, frames=frames)
+    modes += probe_camera(index, width, height, grayscale=False, frames=frames)
+    if not modes:
+        print(f"Camera {index} delivered no frames in any candidate mode")
+        return 1
+
+    print(f"{'format':>6} {'fps':>5} {'buffers':>8} {'output':>8} {'interval ms':>12} {'latency ms':>11}")
+    for mode in modes:
+        print(f"{mode.fourcc:>6} {mode.fps:5.0f} {mode.buffer_size or 0:8d} "
+              f"{'Y plane' if mode.grayscale else 'BGR':>8} {mode.frame_interval * 1000:12.1f} "
+              f"{mode.latency * 1000:11.1f}")
+    print(f"Selected: {select_mode(modes)}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Face Navigator offline benchmarks')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    scale_parser = subparsers.add_parser('scale', help='Detection latency and accuracy by detection scale')
+    scale_parser.add_argument('input', help='Video file or directory of images')
+    scale_parser.add_argument('--scales', type=float, nargs='+', default=[1.0, 0.75, 0.5, 0.35, 0.25],
+                              help='Detection scales to compare (first one is the latency baseline)')
+    scale_parser.add_argument('--backend', default=None,
+                              help='Detector backend to benchmark (default: detector_backend from config)')
+
+    detectors_parser = subparsers.add_parser('detectors', help='Compare detector backends on the same frames')
+    detectors_parser.add_argument('input', help='Video file or directory of images')
+    detectors_parser.add_argument('--backends', nargs='+', default=None,
+                                  help='Backends to compare (default: all)')
+
+    for subparser in (scale_parser, detectors_parser):
+        subparser.add_argument('--frames', type=int, default=300, help='Maximum number of frames to load')
+
+    filters_parser = subparsers.add_parser('filters', help='Jitter and lag of face centre filters on landmark traces')
+    filters_parser.add_argument('traces', nargs='+', help='.npz landmark traces')
+    filters_parser.add_argument('--decimate', type=int, nargs='+', default=[1, 2],
+                                help='Keep every n-th frame to simulate lower frame rates')
+    filters_parser.add_argument('--lead-ms', type=float, default=50.0,
+                                help='Prediction lead for the kalman+lead variant')
+
+    cursor_parser = subparsers.add_parser('cursor', help='Cost of cursor moves per output backend')
+    cursor_parser.add_argument('--backends', nargs='+', default=['null'],
+                               help='Cursor backends to compare (default: null)')
+    cursor_parser.add_argument('--moves', type=int, default=2000, help='Number of moves per backend')
+
+    camera_parser = subparsers.add_parser('camera', help='Capture-to-ready latency of each camera mode')
+    camera_parser.add_argument('--index', type=int, default=0, help='Camera index')
+    camera_parser.add_argument('--size', type=int, nargs=2, default=[640, 480], help='Frame width and height')
+    camera_parser.add_argument('--frames', type=int, default=60, help='Frames timed per mode')
+
+    pipeline_parser = subparsers.add_parser('pipeline', help='Throughput and latency of the multi-process pipeline')
+    pipeline_parser.add_argument('input', help='Video file or directory of images')
+    pipeline_parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4],
+                                 help='Worker counts to compare (first one is the speedup baseline)')
+    pipeline_parser.add_argument('--frames', type=int, default=300, help='Frames to process per worker count')
+    pipeline_parser.add_argument('--in-flight', type=int, default=2,
+                                 help='Frames queued per worker (more raises throughput and latency)')
+    pipeline_parser.add_argument('--predictor', default='shape_predictor_68_face_landmarks.dat',
+                                 help='dlib 68-point landmark model')
+
+    features_parser = subparsers.add_parser('features', help='Per-frame cost of centre and eye aspect ratios')
+    features_parser.add_argument('traces', nargs='*', help='.npz landmark traces (default: synthetic landmarks)')
+    features_parser.add_argument('--repeat', type=int, default=20, help='Passes over the landmarks')
+
+    gate_parser = subparsers.add_parser('gate', help='Detector CPU and wake-up latency with the motion gate')
+    gate_parser.add_argument('input', help='Video file or directory of images')
+    gate_parser.add_argument('--frames', type=int, default=900, help='Maximum frames to load')
+    gate_parser.add_argument('--fps', type=float, default=30.0, help='Frame rate the recording is replayed at')
+
+    pose_parser = subparsers.add_parser('pose', help='Cost and jitter of the head-pose pointer vs the centre')
+    pose_parser.add_argument('traces', nargs='+', help='.npz landmark traces')
+    pose_parser.add_argument('--size', type=int, nargs=2, default=[640, 480], metavar=('W', 'H'),
+                             help='Frame size the traces were recorded at')
+    pose_parser.add_argument('--repeat', type=int, default=5, help='Passes over each trace')
+
+    for subparser in (scale_parser, detectors_parser, filters_parser, cursor_parser, camera_parser,
+                      pipeline_parser, features_parser, pose_parser, gate_parser):
+        subparser.add_argument('--config', default='config.json', help='Configuration file path')
+
+    args = parser.parse_args()
+    config = load_config(args.config)
+
+    if args.command == 'pose':
+        return benchmark_pose(args.traces, args.size, args.repeat)
+    if args.command == 'features':
+        return benchmark_features(args.traces, args.repeat)
+    if args.command == 'pipeline':
+        benchmark_pipeline(args.input, config, args.workers, args.frames, args.in_flight, args.predictor)
+        return 0
+    if args.command == 'camera':
+        return benchmark_camera(args.index, args.size[0], args.size[1], args.frames)
+    if args.command == 'cursor':
+        benchmark_cursor(config, args.backends, args.moves)
+        return 0
+    if args.command == 'filters':
+        config['filter_eval_lead_ms'] = args.lead_ms
+        benchmark_filters(args.traces, config, args.decimate)
+        return 0
+
+    frames = load_frames(args.input, args.frames)
+    if not frames:
+        print(f"No frames could be loaded from {args.input}")
+        return 1
+    print(f"Loaded {len(frames)} frames of {frames[0].shape[1]}x{frames[0].shape[0]}")
+
+    if args.command == 'scale':
+        benchmark_scales(frames, config, args.backend, args.scales)
+    elif args.command == 'gate':
+        benchmark_gate(frames, config, args.fps)
+    elif args.command == 'detectors':
+        from detectors import DETECTOR_BACKENDS
+        benchmark_detectors(frames, config, args.backends or list(DETECTOR_BACKENDS))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
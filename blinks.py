@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Time-based blink detection for Face Navigator
+Each eye runs a small open/closed state machine on timestamped eye aspect
+ratios. Closure start and end are interpolated between samples, so blink
+durations are measured in milliseconds independently of the frame rate,
+and the closed-eye threshold adapts to the user's open-eye EAR.
+"""
+
+import math
+
+import numpy as np
+
+
+class EARHistory:
+    """Fixed-size ring buffer of (timestamp, EAR) samples"""
+
+    def __init__(self, size=64):
+        self.timestamps = np.zeros(size)
+        self.values = np.zeros(size)
+        self.size = size
+        self.count = 0
+
+    def append(self, timestamp, value):
+        i = self.count % self.size
+        self.timestamps[i] = timestamp
+        self.values[i] = value
+        self.count += 1
+
+    def last(self, n=1):
+        """Return the n-th most recent (timestamp, EAR) sample"""
+        i = (self.count - n) % self.size
+        return self.timestamps[i], self.values[i]
+
+    def __len__(self):
+        return min(self.count, self.size)
+
+    def samples(self):
+        """Return the buffered samples in time order"""
+        n = len(self)
+        order = (np.arange(self.count - n, self.count)) % self.size
+        return self.timestamps[order], self.values[order]
+
+
+def _crossing_time(t0, v0, t1, v1, level):
+    """Time at which the EAR crossed level between two samples, by linear interpolation"""
+    if v0 == v1:
+        return t1
+    fraction = min(max((v0 - level) / (v0 - v1), 0.0), 1.0)
+    return t0 + fraction * (t1 - t0)
+
+
+class EyeBlinkDetector:
+    """Open/closed state machine for one eye
+
+    update() returns the duration in seconds of each closure that ends
+    within [min_duration, max_duration]. With adaptive set, the threshold
+    follows the user's open-eye EAR: an exponentially weighted mean and
+    variance with time constant baseline_tau seconds, updated in O(1) on
+    open-eye samples, give threshold = min(mean * threshold_ratio,
+    mean - 4 * std). The configured threshold applies until warmup seconds
+    of open-eye samples have been seen.
+    """
+
+    def __init__(self, threshold=0.25, min_duration=0.1, max_duration=1.0, adaptive=True,
+                 threshold_ratio=0.75, baseline_tau=10.0, warmup=1.0, hysteresis=0.02,
+                 max_gap=0.5, history=64):
+        self.base_threshold = threshold
+        self.threshold = threshold
+        self.min_duration = min_duration
+        self.max_duration = max_duration
+        self.adaptive = adaptive
+        self.threshold_ratio = threshold_ratio
+        self.baseline_tau = baseline_tau
+        self.warmup = warmup
+        self.hysteresis = hysteresis
+        self.max_gap = max_gap
+        self.history = EARHistory(history)
+
+        self.closed = False
+        self.closed_since = None
+
+        # Open-eye EAR statistics
+        self.baseline_mean = None
+        self.baseline_var = 0.0
+        self.baseline_time = 0.0
+
+        # Counters; closures counts every closure that ended with the eye opening
+        self.closures = 0
+        self.blinks = 0
+        self.too_short = 0
+        self.too_long = 0
+
+    def update(self, ear, timestamp):
+        """Add one EAR sample; returns the blink duration when a qualifying blink just ended"""
+        blink = None
+        if len(self.history):
+            last_time, last_ear = self.history.last()
+            dt = timestamp - last_time
+            if dt <= 0:
+                return None
+            if dt > self.max_gap:
+                # The face was lost for a while: nothing can be said about the gap
+                self.closed = False
+                self.closed_since = None
+            elif not self.closed and ear < self.threshold:
+                self.closed = True
+                self.closed_since = _crossing_time(last_time, last_ear, timestamp, ear, self.threshold)
+            elif self.closed and ear > self.threshold + self.hysteresis:
+                self.closed = False
+                opened = _crossing_time(last_time, last_ear, timestamp, ear, self.threshold + self.hysteresis)
+                self.closures += 1
+                blink = self._closure_ended(opened - self.closed_since)
+            if not self.closed and dt <= self.max_gap:
+                self._update_baseline(ear, dt)
+        elif ear < self.threshold:
+            self.closed = True
+            self.closed_since = timestamp
+
+        self.history.append(timestamp, ear)
+        return blink
+
+    def _closure_ended(self, duration):
+        if duration < self.min_duration:
+            self.too_short += 1
+            return None
+        if duration > self.max_duration:
+            self.too_long += 1
+            return None
+        self.blinks += 1
+        return duration
+
+    def _update_baseline(self, ear, dt):
+        if not self.adaptive or ear <= self.threshold + self.hysteresis:
+            return
+        if self.baseline_mean is None:
+            self.baseline_mean = ear
+            return
+
+        # Time-based weight, so the baseline adapts at the same speed at any frame rate
+        alpha = 1.0 - math.exp(-dt / self.baseline_tau)
+        delta = ear - self.baseline_mean
+        self.baseline_mean += alpha * delta
+        self.baseline_var = (1.0 - alpha) * (self.baseline_var + alpha * delta * delta)
+        self.baseline_time += dt
+
+        if self.baseline_time >= self.warmup:
+            std = math.sqrt(self.baseline_var)
+            self.threshold = max(min(self.baseline_mean * self.threshold_ratio, self.baseline_mean - 4.0 * std), 0.05)
+
+    def reset(self):
+        """Forget the current closure (but keep the learned threshold)"""
+        self.closed = False
+        self.closed_since = None
+        self.history = EARHistory(self.history.size)
+
+    def stats(self):
+        return {
+            "blinks": self.blinks,
+            "too_short": self.too_short,
+            "too_long": self.too_long,
+            "threshold": self.threshold,
+            "baseline": self.baseline_mean if self.baseline_mean is not None else 0.0
+        }
+
+
+class BlinkDetector:
+    """Left and right eye state machines with a shared click cooldown
+
+    Closures of the two eyes that overlap in time are one bilateral blink,
+    reported as 'both' when the second eye opens (if both closures have an
+    accepted length) rather than as a blink of whichever eye opened first.
+    Natural blinks are bilateral; one-eyed blinks are reported at once.
+    """
+
+    def __init__(self, threshold=0.25, min_duration=0.1, max_duration=1.0, cooldown=0.5, adaptive=True,
+                 threshold_ratio=0.75):
+        self.left = EyeBlinkDetector(threshold, min_duration, max_duration, adaptive, threshold_ratio)
+        self.right = EyeBlinkDetector(threshold, min_duration, max_duration, adaptive, threshold_ratio)
+        self.cooldown = cooldown
+        self.last_blink_time = None
+
+        # Blink duration (None if not accepted) of an eye that opened while the other was still closed
+        self._pending = {}
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(threshold=config['eye_ar_threshold'],
+                   min_duration=config['blink_min_ms'] / 1000.0,
+                   max_duration=config['blink_max_ms'] / 1000.0,
+                   cooldown=config['blink_cooldown'],
+                   adaptive=config['blink_adaptive_threshold'],
+                   threshold_ratio=config['blink_threshold_ratio'])
+
+    def update(self, left_ear, right_ear, timestamp):
+        """Return [(eye, duration)] for the blinks that ended at this sample ('left', 'right' or 'both')"""
+        detectors = {'left': self.left, 'right': self.right}
+        ended = {}
+        for eye, ear in (('left', left_ear), ('right', right_ear)):
+            closures = detectors[eye].closures
+            duration = detectors[eye].update(ear, timestamp)
+            if detectors[eye].closures > closures:
+                ended[eye] = duration
+
+        blink = None
+        if len(ended) == 2:
+            blink = self._bilateral(ended['left'], ended['right'])
+            self._pending.clear()
+        elif ended:
+            (eye, duration), = ended.items()
+            other = 'right' if eye == 'left' else 'left'
+            if other in self._pending:
+                blink = self._bilateral(duration, self._pending.pop(other))
+            elif detectors[other].closed:
+                self._pending[eye] = duration
+            elif duration is not None:
+                blink = (eye, duration)
+
+        # A held closure whose partner was cut off by a tracking gap is no blink
+        for eye in list(self._pending):
+            if not detectors['right' if eye == 'left' else 'left'].closed:
+                del self._pending[eye]
+
+        if blink is None:
+            return []
+        if self.last_blink_time is not None and timestamp - self.last_blink_time < self.cooldown:
+            return []
+        self.last_blink_time = timestamp
+        return [blink]
+
+    @staticmethod
+    def _bilateral(duration, other):
+        if duration is None or other is None:
+            return None
+        return ('both', max(duration, other))
+
+    def open_levels(self):
+        """(left, right) EAR above which each eye counts as open again"""
+        return (self.left.threshold + self.left.hysteresis, self.right.threshold + self.right.hysteresis)
+
+    def reset(self):
+        self.left.reset()
+        self.right.reset()
+        self._pending.clear()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Calibration profiles and drift correction for Face Navigator
+Saved baselines let the cursor respond from the first frame, and the
+baseline follows slow shifts of the user's resting position while their
+head is still
+"""
+
+import json
+import math
+import os
+import time
+
+import numpy as np
+
+
+class CalibrationProfiles:
+    """JSON file of face centre baselines keyed by user profile and camera"""
+
+    def __init__(self, path):
+        self.path = path
+
+    @staticmethod
+    def key(profile, device):
+        return f"{profile}@{device or 'unknown'}"
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def load(self, key):
+        """Return the saved baseline for key as a float32 array, or None"""
+        entry = self._load().get(key)
+        if not entry:
+            return None
+        return np.array(entry['baseline'], dtype=np.float32)
+
+    def save(self, key, baseline):
+        if not self.path:
+            return
+        data = self._load()
+        data[key] = {
+            "baseline": [float(v) for v in baseline],
+            "updated": time.strftime('%Y-%m-%dT%H:%M:%S')
+        }
+        partial = self.path + ".part"
+        with open(partial, 'w') as f:
+            json.dump(data, f, indent=4)
+        os.replace(partial, self.path)
+
+
+class DriftCorrector:
+    """Pull the baseline towards the face centre while the head is at rest near it
+
+    The head counts as still when its speed is below still_speed (px/s),
+    estimated from how far the centre leads its own exponential average with
+    time constant speed_tau, which is robust to per-frame landmark noise at
+    any frame rate. While still and within radius pixels of the baseline, the
+    baseline moves towards the centre with time constant time_constant
+    seconds. Deliberate head turns are fast or far from the baseline, so
+    they are left alone. Costs O(1) per frame.
+    """
+
+    def __init__(self, time_constant=30.0, still_speed=15.0, radius=50.0, speed_tau=0.3):
+        self.time_constant = time_constant
+        self.still_speed = still_speed
+        self.radius = radius
+        self.speed_tau = speed_tau
+
+        self.smoothed = None
+        self.last_time = None
+        self.speed = float('inf')
+
+        # Counters
+        self.corrected_frames = 0
+        self.total_drift = 0.0
+
+    def update(self, baseline, centre, timestamp):
+        """Adjust baseline (in place) from one frame's face centre; returns True if it moved"""
+        x, y = float(centre[0]), float(centre[1])
+        if self.last_time is None or timestamp <= self.last_time:
+            if self.last_time is None:
+                self.smoothed = [x, y]
+                self.last_time = timestamp
+            return False
+
+        dt = timestamp - self.last_time
+        self.last_time = timestamp
+
+        # At constant speed v the average trails the centre by v * speed_tau
+        alpha = 1.0 - math.exp(-dt / self.speed_tau)
+        self.smoothed[0] += alpha * (x - self.smoothed[0])
+        self.smoothed[1] += alpha * (y - self.smoothed[1])
+        self.speed = math.hypot(x - self.smoothed[0], y - self.smoothed[1]) / self.speed_tau
+        if self.speed > self.still_speed:
+            return False
+
+        dx = x - float(baseline[0])
+        dy = y - float(baseline[1])
+        if math.hypot(dx, dy) > self.radius:
+            return False
+
+        weight = 1.0 - math.exp(-dt / self.time_constant)
+        baseline[0] += weight * dx
+        baseline[1] += weight * dy
+        self.corrected_frames += 1
+        self.total_drift += weight * math.hypot(dx, dy)
+        return True
+
+    def stats(self):
+        return {
+            "corrected": self.corrected_frames,
+            "drift": self.total_drift
+        }
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Camera mode negotiation for Face Navigator
+Probes the pixel formats, frame rates and driver buffer sizes a webcam
+accepts, keeps the mode with the lowest capture-to-ready latency and caches
+the choice per device. Where the backend hands out raw frames, only the
+luminance (Y) plane is extracted, skipping the BGR conversion entirely.
+"""
+
+import json
+import os
+import time
+
+import cv2
+import numpy as np
+
+# Formats to try, in order of preference when latencies tie
+CANDIDATE_FORMATS = ('MJPG', 'YUYV')
+CANDIDATE_FPS = (60, 30)
+
+
+def fourcc_code(fourcc):
+    return cv2.VideoWriter_fourcc(*fourcc)
+
+
+def fourcc_name(code):
+    code = int(code)
+    return ''.join(chr((code >> (8 * i)) & 0xFF) for i in range(4)).strip('\x00')
+
+
+class CameraMode:
+    """A negotiated camera configuration and its measured latency"""
+
+    def __init__(self, fourcc=None, width=640, height=480, fps=None, buffer_size=None,
+                 grayscale=False, latency=None, frame_interval=None):
+        self.fourcc = fourcc
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.buffer_size = buffer_size
+        self.grayscale = grayscale
+        # Estimated seconds from capture to a frame ready for processing
+        self.latency = latency
+        self.frame_interval = frame_interval
+
+    def to_dict(self):
+        return dict(self.__dict__)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def __repr__(self):
+        latency = f"{self.latency * 1000:.1f} ms" if self.latency is not None else "unmeasured"
+        return (f"CameraMode({self.fourcc or 'default'} {self.width}x{self.height} @ {self.fps or 'default'} fps, "
+                f"buffers={self.buffer_size or 'default'}, {'Y plane' if self.grayscale else 'BGR'}, {latency})")
+
+
+def configure_capture(capture, mode):
+    """Apply a mode to an open cv2.VideoCapture; returns True if raw frames are being delivered"""
+    if mode.fourcc:
+        capture.set(cv2.CAP_PROP_FOURCC, fourcc_code(mode.fourcc))
+    capture.set(cv2.CAP_PROP_FRAME_WIDTH, mode.width)
+    capture.set(cv2.CAP_PROP_FRAME_HEIGHT, mode.height)
+    if mode.fps:
+        capture.set(cv2.CAP_PROP_FPS, mode.fps)
+    if mode.buffer_size:
+        capture.set(cv2.CAP_PROP_BUFFERSIZE, mode.buffer_size)
+    if mode.grayscale:
+        return bool(capture.set(cv2.CAP_PROP_CONVERT_RGB, 0))
+    return False
+
+
+def raw_to_gray(raw, fourcc, width, height, image=None):
+    """Extract the luminance plane from a raw (unconverted) frame
+
+    YUYV frames interleave Y with chroma, so Y is every other byte. MJPG
+    frames are decoded straight to grayscale, which lets the JPEG decoder
+    skip chroma upsampling and colour conversion. Returns None for a raw
+    frame that does not match the mode.
+    """
+    if raw is None:
+        return None
+    if fourcc == 'YUYV':
+        if raw.size != width * height * 2:
+            return None
+        y_plane = raw.reshape(height, width * 2)[:, ::2]
+        if image is None or image.shape != (height, width):
+            return np.ascontiguousarray(y_plane)
+        np.copyto(image, y_plane)
+        return image
+    if fourcc == 'MJPG':
+        gray = cv2.imdecode(raw.reshape(-1), cv2.IMREAD_GRAYSCALE)
+        if gray is None or gray.shape != (height, width):
+            return None
+        return gray
+    return None
+
+
+def _measure(capture, mode, frames):
+    """Read frames in a mode; returns (frame interval, per-frame read time) or None if it fails"""
+    # Let auto-exposure and the driver queue settle before timing
+    for _ in range(5):
+        if not capture.grab():
+            return None
+
+    stamps = []
+    read_times = []
+    for _ in range(frames):
+        if not capture.grab():
+            return None
+        grabbed = time.perf_counter()
+        ret, frame = capture.retrieve()
+        if not ret:
+            return None
+        if mode.grayscale:
+            frame = raw_to_gray(frame, mode.fourcc, mode.width, mode.height)
+        elif frame is not None and frame.ndim == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if frame is None or frame.shape[:2] != (mode.height, mode.width):
+            return None
+        ready = time.perf_counter()
+        stamps.append(grabbed)
+        read_times.append(ready - grabbed)
+
+    interval = float(np.median(np.diff(stamps))) if len(stamps) > 1 else 0.0
+    return interval, float(np.mean(read_times))
+
+
+def probe_mode(index, mode, frames=30):
+    """Open the camera in one mode and measure it; returns the mode as delivered, or None"""
+    capture = cv2.VideoCapture(index)
+    try:
+        if not capture.isOpened():
+            return None
+        raw = configure_capture(capture, mode)
+
+        # Record what the driver actually accepted
+        accepted = CameraMode(
+            fourcc=fourcc_name(capture.get(cv2.CAP_PROP_FOURCC)) or mode.fourcc,
+            width=int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            height=int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            fps=capture.get(cv2.CAP_PROP_FPS) or mode.fps,
+            buffer_size=int(capture.get(cv2.CAP_PROP_BUFFERSIZE)) or None,
+            grayscale=raw and mode.fourcc in ('MJPG', 'YUYV'))
+        if mode.fourcc and accepted.fourcc != mode.fourcc:
+            return None
+        if not raw:
+            capture.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+
+        result = _measure(capture, accepted, frames)
+        if result is None and accepted.grayscale:
+            # Raw frames are not usable with this backend; measure with BGR conversion
+            accepted.grayscale = False
+            capture.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+            result = _measure(capture, accepted, frames)
+        if result is None:
+            return None
+
+        # A frame waits up to one interval per queued driver buffer before it is read
+        # (OpenCV's V4L2 backend queues 4 when the size is not reported)
+        accepted.frame_interval, read_time = result
+        accepted.latency = accepted.frame_interval * (accepted.buffer_size or 4) + read_time
+        return accepted
+    finally:
+        capture.release()
+
+
+def probe_camera(index=0, width=640, height=480, grayscale=True, frames=30,
+                 formats=CANDIDATE_FORMATS, fps_options=CANDIDATE_FPS):
+    """Measure every candidate mode; returns the modes that delivered frames"""
+    results = []
+    for fourcc in formats:
+        for fps in fps_options:
+            mode = CameraMode(fourcc, width, height, fps, buffer_size=1, grayscale=grayscale)
+            accepted = probe_mode(index, mode, frames)
+            if accepted is not None:
+                results.append(accepted)
+    return results
+
+
+def select_mode(modes):
+    """Pick the mode with the lowest capture-to-ready latency (earlier candidates win ties)"""
+    measured = [mode for mode in modes if mode.latency is not None]
+    if not measured:
+        return None
+    return min(measured, key=lambda mode: mode.latency)
+
+
+def device_key(index, width, height):
+    """Cache key for a camera: its index, name (where the OS exposes it) and resolution"""
+    name = ""
+    try:
+        with open(f"/sys/class/video4linux/video{index}/name") as f:
+            name = f.read().strip()
+    except OSError:
+        pass
+    return f"{index}:{name}:{width}x{height}"
+
+
+class CameraModeCache:
+    """JSON file of negotiated modes keyed by device"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, key):
+        data = self._load().get(key)
+        return CameraMode.from_dict(data) if data else None
+
+    def put(self, key, mode):
+        if not self.path:
+            return
+        data = self._load()
+        data[key] = mode.to_dict()
+        with open(self.path, 'w') as f:
+            json.dump(data, f, indent=4)
+
+
+def negotiate_camera_mode(index=0, width=640, height=480, grayscale=True, cache_path=None,
+                          reprobe=False, logger=None):
+    """Return the cached mode for this camera, probing (and caching) it first if needed
+
+    Falls back to the backend's default BGR mode when no candidate works.
+    """
+    cache = CameraModeCache(cache_path)
+    key = device_key(index, width, height)
+    if not reprobe:
+        mode = cache.get(key)
+        if mode is not None:
+            return mode
+
+    start = time.monotonic()
+    modes = probe_camera(index, width, height, grayscale)
+    mode = select_mode(modes)
+    if logger:
+        for candidate in modes:
+            logger.info(f"Camera probe: {candidate}")
+    if mode is None:
+        if logger:
+            logger.warning("Camera probe found no working mode, using the default settings")
+        return CameraMode(width=width, height=height)
+
+    if logger:
+        logger.info(f"Selected {mode} after {time.monotonic() - start:.1f}s of probing")
+    cache.put(key, mode)
+    return mode
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Threaded frame capture for Face Navigator
+Keeps camera reads off the processing loop so only the newest frame is used
+"""
+
+import threading
+import time
+
+import numpy as np
+
+
+class ThreadedCapture:
+    """Read frames on a background thread, keeping only the newest one"""
+
+    def __init__(self, camera, stale_after=0.1, reuse_buffers=False, logger=None):
+        self.camera = camera
+        self.stale_after = stale_after
+        self.logger = logger
+
+        # Mirror the wrapped frame source so the processing loop can treat both alike
+        self.live = getattr(camera, 'live', True)
+        self.realtime = getattr(camera, 'realtime', True)
+        self.provides_landmarks = getattr(camera, 'provides_landmarks', False)
+        self.device = getattr(camera, 'device', None)
+
+        # Triple buffering: [being written, newest, held by the processing loop].
+        # Landmark sources hand out (landmarks, rect) tuples, not images
+        self.reuse_buffers = reuse_buffers and not self.provides_landmarks
+        self._buffers = None
+
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+        self._ok = True
+        self.error = None
+
+        # Newest captured frame and the id of the last one handed out
+        self._frame = None
+        self._frame_time = 0.0
+        self._capture_time = 0.0
+        self._frame_id = 0
+        self._consumed_id = 0
+
+        # Timestamp and age of the frame most recently returned by read()
+        self.frame_timestamp = 0.0
+        self.capture_timestamp = 0.0
+        self.frame_age = 0.0
+
+        # Counters
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.frames_stale = 0
+        self.frames_read = 0
+
+    def start(self):
+        """Start the capture thread"""
+        if self._running:
+            return self
+        self._running = True
+        self._thread = threading.Thread(target=self._reader, name="frame-capture", daemon=True)
+        self._thread.start()
+        return self
+
+    def _reader(self):
+        """Capture loop: overwrite the pending frame with each new one"""
+        try:
+            self._capture_loop()
+        except Exception as e:
+            # A dead reader must not look like a camera that stopped delivering
+            self.error = e
+            if self.logger:
+                self.logger.error(f"Frame capture failed: {e!r}")
+            with self._cond:
+                self._ok = False
+                self._cond.notify_all()
+
+    def _capture_loop(self):
+        while self._running:
+            target = self._buffers[0] if self._buffers is not None else None
+            ret, frame = self.camera.read(target)
+            now = time.monotonic()
+            captured = getattr(self.camera, 'capture_timestamp', now)
+
+            with self._cond:
+                if not ret:
+                    self._ok = False
+                    self._cond.notify_all()
+                    break
+
+                # The previous frame was never picked up by the processing loop
+                if self._frame_id > self._consumed_id:
+                    self.frames_dropped += 1
+
+                if self.reuse_buffers:
+                    if self._buffers is None:
+                        self._buffers = [np.empty_like(frame), frame, np.empty_like(frame)]
+                    else:
+                        # The source may hand back a new array if the frame size changed
+                        self._buffers[0] = frame
+                        self._buffers[0], self._buffers[1] = self._buffers[1], self._buffers[0]
+                    frame = self._buffers[1]
+
+                self._frame = frame
+                self._frame_time = now
+                self._capture_time = captured
+                self._frame_id += 1
+                self.frames_captured += 1
+                self._cond.notify()
+
+    def read(self, image=None, timeout=5.0):
+        """Return (ret, frame) for the newest frame not yet processed
+
+        image is accepted for FrameSource compatibility and ignored; with
+        reuse_buffers the returned frame stays valid until the next read().
+        """
+        with self._cond:
+            self._cond.wait_for(self._frame_pending, timeout)
+            if self._frame_id == self._consumed_id:
+                return False, None
+
+            self._consumed_id = self._frame_id
+            if self.reuse_buffers:
+                self._buffers[1], self._buffers[2] = self._buffers[2], self._buffers[1]
+                frame = self._buffers[2]
+            else:
+                frame = self._frame
+            self.frame_timestamp = self._frame_time
+            self.capture_timestamp = self._capture_time
+
+        # A frame that waited longer than stale_after means processing is behind capture
+        self.frame_age = time.monotonic() - self.frame_timestamp
+        if self.frame_age > self.stale_after:
+            self.frames_stale += 1
+        self.frames_read += 1
+
+        return True, frame
+
+    def _frame_pending(self):
+        return self._frame_id > self._consumed_id or not self._ok
+
+    def stats(self):
+        """Return capture counters"""
+        return {
+            "captured": self.frames_captured,
+            "read": self.frames_read,
+            "dropped": self.frames_dropped,
+            "stale": self.frames_stale,
+            "last_age_ms": self.frame_age * 1000.0
+        }
+
+    def release(self):
+        """Stop the capture thread and release the camera"""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.camera.release()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Cursor output backends for Face Navigator
+Every backend tracks the cursor position itself instead of querying the
+display server each frame, and skips moves that would not change it
+"""
+
+import time
+
+
+class CursorOutput:
+    """Common interface for cursor output backends"""
+
+    name = None
+
+    def __init__(self, screen_size, position=None):
+        self.screen_width, self.screen_height = screen_size
+        if position is None:
+            position = (self.screen_width // 2, self.screen_height // 2)
+        self.x, self.y = int(position[0]), int(position[1])
+
+        # time.monotonic() when the last move was handed to the display server or device;
+        # set move_log to a list to collect (time, x, y) for every move
+        self.last_move_time = None
+        self.move_log = None
+
+        # Counters
+        self.moves = 0
+        self.skipped_moves = 0
+        self.clicks = 0
+
+    def position(self):
+        """Return the cursor position as last set by this backend"""
+        return self.x, self.y
+
+    def size(self):
+        return self.screen_width, self.screen_height
+
+    def move_to(self, x, y):
+        """Move the cursor to (x, y); returns False if the position did not change"""
+        x = int(round(x))
+        y = int(round(y))
+        if x == self.x and y == self.y:
+            self.skipped_moves += 1
+            return False
+
+        self._move(x, y)
+        self.last_move_time = time.monotonic()
+        self.x = x
+        self.y = y
+        self.moves += 1
+        if self.move_log is not None:
+            self.move_log.append((self.last_move_time, x, y))
+        return True
+
+    def click(self, button='left'):
+        """Click the given mouse button ('left' or 'right')"""
+        self._click(button)
+        self.clicks += 1
+
+    def close(self):
+        pass
+
+    def _move(self, x, y):
+        raise NotImplementedError
+
+    def _click(self, button):
+        raise NotImplementedError
+
+
+class NullCursorOutput(CursorOutput):
+    """Backend that only records events, for benchmarks and headless runs"""
+
+    name = "null"
+
+    def __init__(self, screen_size=(1920, 1080), position=None, record=False):
+        super().__init__(screen_size, position)
+        self.record = record
+        self.events = []
+
+    def _move(self, x, y):
+        if self.record:
+            self.events.append((time.monotonic(), 'move', x, y))
+
+    def _click(self, button):
+        if self.record:
+            self.events.append((time.monotonic(), 'click', button, None))
+
+
+class PyAutoGUICursorOutput(CursorOutput):
+    """pyautogui backend with its per-call pause disabled"""
+
+    name = "pyautogui"
+
+    def __init__(self):
+        import pyautogui
+        self.pyautogui = pyautogui
+        pyautogui.FAILSAFE = False
+        pyautogui.PAUSE = 0
+        super().__init__(pyautogui.size(), pyautogui.position())
+
+    def _move(self, x, y):
+        self.pyautogui.moveTo(x, y, _pause=False)
+
+    def _click(self, button):
+        self.pyautogui.click(button=button, _pause=False)
+
+
+class XTestCursorOutput(CursorOutput):
+    """Direct X11 XTest backend through python-xlib"""
+
+    name = "xtest"
+
+    BUTTONS = {'left': 1, 'middle': 2, 'right': 3}
+
+    def __init__(self):
+        from Xlib import X, display
+        from Xlib.ext import xtest
+        self.X = X
+        self.xtest = xtest
+        self.display = display.Display()
+        if not self.display.has_extension('XTEST'):
+            raise RuntimeError("X server does not support the XTEST extension")
+
+        screen = self.display.screen()
+        pointer = screen.root.query_pointer()
+        super().__init__((screen.width_in_pixels, screen.height_in_pixels), (pointer.root_x, pointer.root_y))
+
+    def _move(self, x, y):
+        self.xtest.fake_input(self.display, self.X.MotionNotify, x=x, y=y)
+        self.display.flush()
+
+    def _click(self, button):
+        code = self.BUTTONS[button]
+        self.xtest.fake_input(self.display, self.X.ButtonPress, code)
+        self.xtest.fake_input(self.display, self.X.ButtonRelease, code)
+        self.display.flush()
+
+    def close(self):
+        self.display.close()
+
+
+class UInputCursorOutput(CursorOutput):
+    """Linux uinput absolute-pointer backend through python-evdev (works under Wayland)"""
+
+    name = "uinput"
+
+    def __init__(self, screen_size):
+        from evdev import AbsInfo, UInput, ecodes
+        self.ecodes = ecodes
+        capabilities = {
+            ecodes.EV_KEY: [ecodes.BTN_LEFT, ecodes.BTN_RIGHT, ecodes.BTN_MIDDLE],
+            ecodes.EV_ABS: [
+                (ecodes.ABS_X, AbsInfo(value=0, min=0, max=screen_size[0] - 1, fuzz=0, flat=0, resolution=0)),
+                (ecodes.ABS_Y, AbsInfo(value=0, min=0, max=screen_size[1] - 1, fuzz=0, flat=0, resolution=0))
+            ]
+        }
+        self.device = UInput(capabilities, name="face-navigator-pointer")
+        self.buttons = {'left': ecodes.BTN_LEFT, 'middle': ecodes.BTN_MIDDLE, 'right': ecodes.BTN_RIGHT}
+        super().__init__(screen_size)
+
+    def _move(self, x, y):
+        self.device.write(self.ecodes.EV_ABS, self.ecodes.ABS_X, x)
+        self.device.write(self.ecodes.EV_ABS, self.ecodes.ABS_Y, y)
+        self.device.syn()
+
+    def _click(self, button):
+        code = self.buttons[button]
+        self.device.write(self.ecodes.EV_KEY, code, 1)
+        self.device.syn()
+        self.device.write(self.ecodes.EV_KEY, code, 0)
+        self.device.syn()
+
+    def close(self):
+        self.device.close()
+
+
+CURSOR_BACKENDS = ("auto", NullCursorOutput.name, PyAutoGUICursorOutput.name,
+                   XTestCursorOutput.name, UInputCursorOutput.name)
+
+
+def detect_screen_size():
+    """Ask the X server for the screen size, falling back to 1920x1080"""
+    try:
+        from Xlib import display
+        screen = display.Display().screen()
+        return screen.width_in_pixels, screen.height_in_pixels
+    except Exception:
+        return 1920, 1080
+
+
+def create_cursor_output(config, backend=None):
+    """Build the cursor backend selected in config (or by the backend argument)"""
+    backend = backend or config['cursor_backend']
+    screen_size = tuple(config['screen_size']) if config['screen_size'] else None
+
+    if backend == "auto":
+        # Prefer XTest, and fall back to pyautogui if python-xlib or XTEST is unavailable
+        try:
+            return XTestCursorOutput()
+        except Exception:
+            return PyAutoGUICursorOutput()
+    if backend == NullCursorOutput.name:
+        return NullCursorOutput(screen_size or (1920, 1080))
+    if backend == PyAutoGUICursorOutput.name:
+        return PyAutoGUICursorOutput()
+    if backend == XTestCursorOutput.name:
+        return XTestCursorOutput()
+    if backend == UInputCursorOutput.name:
+        return UInputCursorOutput(screen_size or detect_screen_size())
+
+    raise ValueError(f"Unknown cursor backend '{backend}' (choose from {', '.join(CURSOR_BACKENDS)})")
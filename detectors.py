@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Face detector backends for Face Navigator
+All backends take a grayscale frame and return dlib rectangles in
+full-resolution coordinates, so they can feed the tracker and the
+landmark predictor directly
+"""
+
+import os
+
+import cv2
+import dlib
+
+
+class FaceDetector:
+    """Common interface for face detector backends
+
+    min_scale is the smallest detection scale at which a face at working
+    distance is still large enough for the backend to find.
+    """
+
+    name = None
+    min_scale = 0.25
+
+    def __init__(self, scale=1.0):
+        self.scale = scale
+
+    def detect_boxes(self, gray):
+        """Return (left, top, right, bottom) boxes found in gray"""
+        raise NotImplementedError
+
+    def __call__(self, gray):
+        """Return face rectangles in full-resolution coordinates"""
+        if self.scale >= 1.0:
+            return [dlib.rectangle(*box) for box in self.detect_boxes(gray)]
+
+        height, width = gray.shape[:2]
+        small_width = max(1, int(width * self.scale))
+        small_height = max(1, int(height * self.scale))
+        small = cv2.resize(gray, (small_width, small_height), interpolation=cv2.INTER_AREA)
+
+        # Map boxes from the small pyramid level back to the full frame
+        sx = width / small_width
+        sy = height / small_height
+        return [dlib.rectangle(int(round(left * sx)), int(round(top * sy)),
+                               int(round(right * sx)), int(round(bottom * sy)))
+                for left, top, right, bottom in self.detect_boxes(small)]
+
+
+class DlibHogDetector(FaceDetector):
+    """dlib HOG + linear SVM frontal face detector"""
+
+    name = "dlib_hog"
+    # The HOG window is 80x80 pixels
+    min_scale = 0.5
+
+    def __init__(self, scale=1.0, upsample=0):
+        super().__init__(scale)
+        self.upsample = upsample
+        self.detector = dlib.get_frontal_face_detector()
+
+    def detect_boxes(self, gray):
+        return [(face.left(), face.top(), face.right(), face.bottom())
+                for face in self.detector(gray, self.upsample)]
+
+
+class HaarCascadeDetector(FaceDetector):
+    """OpenCV Haar cascade frontal face detector"""
+
+    name = "haar"
+
+    def __init__(self, scale=1.0, cascade_path=None, scale_factor=1.1, min_neighbors=5, min_size=30):
+        super().__init__(scale)
+        self.cascade_path = cascade_path or self.default_cascade_path()
+        self.cascade = cv2.CascadeClassifier(self.cascade_path)
+        if self.cascade.empty():
+            raise IOError(f"Could not load Haar cascade from {self.cascade_path}")
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        self.min_size = (min_size, min_size)
+
+    @staticmethod
+    def default_cascade_path():
+        """Locate the frontal face cascade shipped with OpenCV"""
+        name = "haarcascade_frontalface_default.xml"
+        candidates = []
+        if hasattr(cv2, "data"):
+            candidates.append(os.path.join(cv2.data.haarcascades, name))
+        candidates += [os.path.join("/usr/share/opencv4/haarcascades", name),
+                       os.path.join("/usr/share/opencv/haarcascades", name)]
+        for path in candidates:
+            if os.path.exists(path):
+                return path
+        return candidates[0]
+
+    def detect_boxes(self, gray):
+        faces = self.cascade.detectMultiScale(gray, scaleFactor=self.scale_factor,
+                                              minNeighbors=self.min_neighbors, minSize=self.min_size)
+        return [(int(x), int(y), int(x + w), int(y + h)) for (x, y, w, h) in faces]
+
+
+class DnnDetector(FaceDetector):
+    """OpenCV DNN res10 SSD face detector loaded from local Caffe model files"""
+
+    name = "dnn"
+    min_scale = 1.0
+
+    def __init__(self, model_path="res10_300x300_ssd_iter_140000.caffemodel",
+                 config_path="deploy.prototxt", confidence=0.5):
+        # The network resizes its input to 300x300, so prescaling would only lose detail
+        super().__init__(1.0)
+        for path in (model_path, config_path):
+            if not os.path.exists(path):
+                raise IOError(f"DNN face detector file not found: {path}")
+        self.net = cv2.dnn.readNetFromCaffe(config_path, model_path)
+        self.confidence = confidence
+
+    def detect_boxes(self, gray):
+        height, width = gray.shape[:2]
+        image = cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR) if gray.ndim == 2 else gray
+        blob = cv2.dnn.blobFromImage(cv2.resize(image, (300, 300)), 1.0, (300, 300), (104.0, 177.0, 123.0))
+        self.net.setInput(blob)
+        detections = self.net.forward()
+
+        boxes = []
+        for detection in detections[0, 0]:
+            if detection[2] < self.confidence:
+                continue
+            left = max(0, int(detection[3] * width))
+            top = max(0, int(detection[4] * height))
+            right = min(width - 1, int(detection[5] * width))
+            bottom = min(height - 1, int(detection[6] * height))
+            if right > left and bottom > top:
+                boxes.append((left, top, right, bottom))
+        return boxes
+
+
+DETECTOR_BACKENDS = {
+    DlibHogDetector.name: DlibHogDetector,
+    HaarCascadeDetector.name: HaarCascadeDetector,
+    DnnDetector.name: DnnDetector
+}
+
+
+def create_detector(config, backend=None, scale=None):
+    """Build the detector backend selected in config (or by the backend argument)"""
+    backend = backend or config['detector_backend']
+    scale = config['detection_scale'] if scale is None else scale
+
+    if backend == DlibHogDetector.name:
+        return DlibHogDetector(scale=scale, upsample=config['detection_upsample'])
+    if backend == HaarCascadeDetector.name:
+        return HaarCascadeDetector(scale=scale, cascade_path=config['haar_cascade_path'] or None)
+    if backend == DnnDetector.name:
+        return DnnDetector(model_path=config['dnn_model_path'], config_path=config['dnn_config_path'],
+                           confidence=config['dnn_confidence'])
+
+    raise ValueError(f"Unknown detector backend '{backend}' (choose from {', '.join(DETECTOR_BACKENDS)})")
@@ -7,43 +7,198 @@ Uses face tracking for cursor movement and eye blinks for mouse clicks
 import cv2
 import dlib
 import numpy as np
-import pyautogui
 import time
 import json
 import os
 import argparse
-from scipy.spatial import distance as dist
 from imutils import face_utils
 import threading
 import logging
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from capture import ThreadedCapture
+from face_tracking import FaceTracker
+from detectors import create_detector, DETECTOR_BACKENDS
+from settings import DEFAULT_CONFIG, load_config
+from frame_sources import open_source, is_landmark_input
+from metrics import PipelineMetrics, MetricsServer
+from cursor_output import create_cursor_output, CURSOR_BACKENDS
+from scheduler import FrameScheduler
+from filters import create_filter, FILTERS
+from frame_buffers import FrameBuffers
+from landmark_flow import LandmarkFlow
+from observation import FaceObservation
+from blinks import BlinkDetector
+from calibration import CalibrationProfiles, DriftCorrector
+from head_pose import HeadPoseEstimator, CURSOR_SOURCES
+from motion_gate import MotionGate
+from governor import CpuGovernor, operating_points
+from session_recorder import SessionRecorder, CLICK_LEFT, CLICK_RIGHT
+from parallel_pipeline import ParallelLandmarkPipeline, LandmarkAnalyzer
+from profiler import LoopProfiler, PROFILE_MODES
+
+# Most configured frame intervals one cursor step covers, so a stalled camera does not make it jump
+MAX_CURSOR_STEPS = 4.0
 
 class FaceNavigator:
-    def __init__(self, config_file="config.json"):
+    def __init__(self, config_file="config.json", detector_backend=None, source=None, metrics_port=None,
+                 cursor=None, cursor_backend=None, cursor_filter=None, workers=None, calibration_profile=None,
+                 recalibrate=False, cursor_source=None, record_session=False, profile=None,
+                 profile_frames=None, profile_seconds=None, input_spec=None, realtime=False, loop=False,
+                 reprobe_camera=False):
+        self.startup_time = time.monotonic()
+        self.startup_marks = {}
         self.config_file = config_file
         self.load_config()
+        if detector_backend:
+            self.config['detector_backend'] = detector_backend
+        if workers is not None:
+            self.config['pipeline_workers'] = workers
+        if cursor_source:
+            self.config['cursor_source'] = cursor_source
+        if profile_frames is not None:
+            self.config['profile_frames'] = profile_frames
+        if profile_seconds is not None:
+            self.config['profile_seconds'] = profile_seconds
+        # Detection and landmarks in worker processes (landmark sources need neither)
+        landmark_input = source.provides_landmarks if source is not None else is_landmark_input(input_spec)
+        parallel = self.config['pipeline_workers'] > 0 and not landmark_input
         
-        # Initialize face detection and landmark prediction
-        self.face_detector = dlib.get_frontal_face_detector()
+        # Setup logging
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+        self.logger = logging.getLogger(__name__)
         
-        # Download shape predictor if not exists
+        # Open the camera, build the detector and load the landmark model concurrently.
+        # The predictor may still be loading when the loop starts; faces are detected
+        # and tracked meanwhile, and landmarks start as soon as it is ready.
         self.shape_predictor_path = "shape_predictor_68_face_landmarks.dat"
-        if not os.path.exists(self.shape_predictor_path):
-            print("Downloading facial landmark predictor...")
-            self.download_shape_predictor()
+        self.landmark_predictor = None
+        self.predictor_future = None
+        startup = ThreadPoolExecutor(max_workers=3, thread_name_prefix="startup")
+        camera_future = None
+        if source is None:
+            camera_future = startup.submit(self._timed, 'camera_open', open_source, input_spec,
+                                           realtime=realtime, loop=loop, config=self.config,
+                                           reprobe_camera=reprobe_camera, logger=self.logger)
+        detector_future = None
+        if not parallel:
+            # Workers build their own detector
+            detector_future = startup.submit(self._timed, 'detector_ready', create_detector, self.config)
+        if not landmark_input and not parallel:
+            # Landmark replay does not need the predictor, and workers load their own
+            self.predictor_future = startup.submit(self._timed, 'predictor_ready', self.load_landmark_predictor)
+        startup.shutdown(wait=False)
+        
+        # Initialize face detection (on a downscaled frame); landmarks use full resolution
+        self.face_detector = detector_future.result() if detector_future is not None else None
+        
+        # Optionally track the face between periodic full detections
+        self.face_tracker = None
+        if self.config['face_tracking'] and not parallel:
+            self.face_tracker = FaceTracker(self.face_detector,
+                                            detection_interval=self.config['detection_interval'],
+                                            min_confidence=self.config['tracker_min_confidence'])
+        
+        # Initialize camera (or a recorded frame source)
+        self.camera = source if source is not None else camera_future.result()
+        
+        # Read frames on a background thread so processing always gets the newest one,
+        # also when the frames then go to the worker pool
+        self.capture = None
+        if self.config['threaded_capture'] and self.camera.realtime:
+            self.capture = ThreadedCapture(self.camera, stale_after=self.config['stale_frame_ms'] / 1000.0,
+                                           reuse_buffers=self.config['allocation_free'],
+                                           logger=self.logger).start()
+            self.camera = self.capture
+        if parallel:
+            self.ensure_shape_predictor()
+            analyzer = LandmarkAnalyzer(self.config, self.shape_predictor_path)
+            self.camera = ParallelLandmarkPipeline(self.camera, analyzer,
+                                                   workers=self.config['pipeline_workers']).start()
+            self.logger.info(f"Detection and landmarks running in {self.config['pipeline_workers']} worker processes")
+        
+        # Reused frame, grayscale and landmark buffers for the allocation-free path
+        self.allocation_free = self.config['allocation_free']
+        self.frame_buffers = FrameBuffers()
+        self.frame_buffer = None
         
-        self.landmark_predictor = dlib.shape_predictor(self.shape_predictor_path)
+        # Optionally run the shape predictor periodically and follow the points with optical flow
+        self.landmark_flow = None
+        if self.config['landmark_flow'] and not parallel:
+            self.landmark_flow = LandmarkFlow(self.predict_landmarks,
+                                              prediction_interval=self.config['landmark_prediction_interval'],
+                                              max_flow_error=self.config['flow_max_error'],
+                                              max_eye_flow_error=self.config['flow_max_eye_error'])
+        self.last_stats_log = time.time()
         
-        # Eye landmark indices
-        self.LEFT_EYE_POINTS = list(range(42, 48))
-        self.RIGHT_EYE_POINTS = list(range(36, 42))
+        # Pace the loop to the target frame rate, slowing down when nobody is in view
+        self.scheduler = FrameScheduler(target_fps=self.config['target_fps'],
+                                        idle_fps=self.config['idle_fps'],
+                                        idle_after=self.config['idle_after'])
+        self.face_present = False
         
-        # Initialize camera
-        self.camera = cv2.VideoCapture(0)
-        self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+        # Skip detection while nothing in view moves and no face was seen recently
+        self.motion_gate = None
+        if self.config['motion_gate'] and not parallel:
+            self.motion_gate = MotionGate(threshold=self.config['motion_threshold'],
+                                          min_area=self.config['motion_min_area'],
+                                          face_hold=self.config['motion_face_hold'],
+                                          recheck_min=self.config['motion_recheck_min'],
+                                          recheck_max=self.config['motion_recheck_max'])
         
-        # Screen dimensions
-        self.screen_width, self.screen_height = pyautogui.size()
+        # Trade detection and landmark quality, then frame rate, for a CPU or frame-time budget.
+        # Worker processes keep their configured detection and landmark settings, so with
+        # them only the frame rate can change
+        self.governor = None
+        if (self.config['cpu_budget'] > 0 or self.config['frame_budget_ms'] > 0) and self.camera.realtime:
+            # Intervals of disabled components and scales too small for the detector stay off the ladder
+            min_scale = self.face_detector.min_scale if self.face_detector is not None else 1.0
+            points = operating_points(self.config['target_fps'], self.config['detection_scale'],
+                                      self.config['detection_interval'],
+                                      self.config['landmark_prediction_interval'],
+                                      min_fps=self.config['governor_min_fps'], min_scale=min_scale,
+                                      fps_only=parallel, tracking=self.face_tracker is not None,
+                                      landmark_flow=self.landmark_flow is not None)
+            self.governor = CpuGovernor(points, cpu_budget=self.config['cpu_budget'],
+                                        frame_budget=self.config['frame_budget_ms'] / 1000.0)
+        
+        # Per-stage latency histograms, optionally served to Prometheus
+        self.metrics = PipelineMetrics()
+        if self.capture is not None:
+            self.metrics.add_gauge('frames_dropped', lambda: self.capture.frames_dropped,
+                                   "Captured frames replaced before processing")
+            self.metrics.add_gauge('frames_stale', lambda: self.capture.frames_stale,
+                                   "Frames older than stale_frame_ms when processed")
+        self.metrics.add_gauge('time_to_first_cursor_move_seconds',
+                               lambda: self.startup_marks.get('first_cursor_move', -1),
+                               "Seconds from startup to the first cursor move (-1 until it happens)")
+        self.metrics.add_gauge('scheduler_idle', lambda: int(self.scheduler.idle),
+                               "1 while the loop runs at the idle frame rate")
+        if self.governor is not None:
+            point = lambda: self.governor.point
+            self.metrics.add_gauge('governor_level', lambda: point().level,
+                                   "Operating point the CPU governor chose (0 is full quality)")
+            self.metrics.add_gauge('governor_target_fps', lambda: point().target_fps,
+                                   "Frame rate at the current operating point")
+            if not parallel:
+                self.metrics.add_gauge('governor_detection_scale', lambda: point().detection_scale,
+                                       "Detection scale at the current operating point")
+            if self.face_tracker is not None:
+                self.metrics.add_gauge('governor_detection_interval', lambda: point().detection_interval,
+                                       "Frames between full detections at the current operating point")
+            if self.landmark_flow is not None:
+                self.metrics.add_gauge('governor_landmark_interval', lambda: point().landmark_interval,
+                                       "Frames between full landmark predictions at the current operating point")
+            self.metrics.add_gauge('governor_cpu_share', lambda: self.governor.cpu_share,
+                                   "Share of one core used by the process in the last governor window")
+        self.metrics_server = None
+        metrics_port = self.config['metrics_port'] if metrics_port is None else metrics_port
+        if metrics_port:
+            self.metrics_server = MetricsServer(self.metrics, metrics_port).start()
+        
+        # Cursor output backend and screen dimensions
+        self.cursor = cursor if cursor is not None else create_cursor_output(self.config, cursor_backend)
+        self.screen_width, self.screen_height = self.cursor.size()
         
         # Face tracking variables
         self.face_center_baseline = None
@@ -51,46 +206,76 @@ class FaceNavigator:
         self.calibration_frames = 0
         self.calibration_required = 30  # frames
         
-        # Blink detection variables
-        self.eye_ar_threshold = self.config['eye_ar_threshold']
-        self.eye_ar_consecutive_frames = self.config['eye_ar_consecutive_frames']
-        self.left_eye_counter = 0
-        self.right_eye_counter = 0
-        self.last_blink_time = time.time()
-        self.blink_cooldown = self.config['blink_cooldown']
+        # Drive the cursor from the head pose's nose pointer instead of the landmark centre
+        self.head_pose = None
+        if self.config['cursor_source'] == 'head_pose':
+            self.head_pose = HeadPoseEstimator()
+        
+        # Start from the saved baseline for this user and camera, so the cursor responds from the first frame.
+        # The nose pointer rests somewhere else than the landmark centre, so it has its own baseline.
+        self.calibration_profiles = CalibrationProfiles(self.config['calibration_profiles_file'])
+        device = self.camera.device
+        if self.head_pose is not None:
+            device = f"{device or 'unknown'}/head_pose"
+        self.calibration_key = CalibrationProfiles.key(calibration_profile or self.config['calibration_profile'],
+                                                       device)
+        if not recalibrate:
+            baseline = self.calibration_profiles.load(self.calibration_key)
+            if baseline is not None:
+                self.face_center_baseline = baseline
+                self.calibrated = True
+                self.logger.info(f"Using saved calibration for {self.calibration_key}")
+        
+        # Follow slow shifts of the resting head position
+        self.drift_corrector = None
+        if self.config['drift_correction']:
+            self.drift_corrector = DriftCorrector(time_constant=self.config['drift_time_constant'],
+                                                  still_speed=self.config['drift_still_speed'],
+                                                  radius=self.config['calibration_region_size'])
+        
+        # Blink detection: per-eye state machines on frame timestamps
+        self.blink_detector = BlinkDetector.from_config(self.config)
+        if self.landmark_flow is not None:
+            # Propagation stops once an eye drops below the level at which its detector calls it open
+            self.landmark_flow.eye_guard_ear = self.blink_detector.open_levels()
         
         # Movement smoothing
         self.smoothing_factor = self.config['smoothing_factor']
-        self.last_cursor_pos = pyautogui.position()
+        self.last_cursor_pos = self.cursor.position()
+        self.last_move_timestamp = None
         
-        # Setup logging
-        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-        self.logger = logging.getLogger(__name__)
+        # Timestamp-based face centre filter (None keeps only the per-frame blend)
+        self.face_filter = create_filter(self.config, cursor_filter)
+        self.filter_lead = (self.config['kalman_predict_latency'] and
+                            (cursor_filter or self.config['cursor_filter']) == 'kalman')
+        self.frame_timestamp = 0.0
+        self.capture_time = time.monotonic()
+        
+        # Features of the most recent frame with a face
+        self.observation = None
         
-        # Disable pyautogui failsafe (optional)
-        pyautogui.FAILSAFE = False
+        # Optional binary log of every frame, written off the processing loop
+        self.recorder = None
+        self.frame_moved = False
+        self.frame_clicks = 0
+        if record_session or self.config['session_recording']:
+            self.recorder = SessionRecorder(self.config['session_directory'],
+                                            segment_frames=self.config['session_segment_frames']).start()
+            self.logger.info(f"Recording the session to {self.config['session_directory']}/")
+        
+        # Profile the loop for a while when asked to, then carry on normally
+        self.profiler = None
+        if profile:
+            self.profiler = LoopProfiler(self.metrics, mode=profile, frames=self.config['profile_frames'],
+                                         seconds=self.config['profile_seconds'],
+                                         memory_interval=self.config['profile_memory_interval'],
+                                         directory=self.config['profile_directory'], logger=self.logger)
     
     def load_config(self):
-        """Load configuration from JSON file"""
-        default_config = {
-            "sensitivity": 2.0,
-            "eye_ar_threshold": 0.25,
-            "eye_ar_consecutive_frames": 3,
-            "blink_cooldown": 0.5,
-            "smoothing_factor": 0.7,
-            "movement_threshold": 10,
-            "calibration_region_size": 50
-        }
-        
-        if os.path.exists(self.config_file):
-            with open(self.config_file, 'r') as f:
-                self.config = json.load(f)
-                # Add any missing keys from default config
-                for key, value in default_config.items():
-                    if key not in self.config:
-                        self.config[key] = value
-        else:
-            self.config = default_config
+        """Load configuration from JSON file, writing the defaults if it does not exist"""
+        exists = os.path.exists(self.config_file)
+        self.config = load_config(self.config_file)
+        if not exists:
             self.save_config()
     
     def save_config(self):
@@ -98,43 +283,92 @@ class FaceNavigator:
         with open(self.config_file, 'w') as f:
             json.dump(self.config, f, indent=4)
     
+    def _timed(self, mark, function, *args, **kwargs):
+        """Run function and record when it finished relative to startup"""
+        result = function(*args, **kwargs)
+        self.startup_marks[mark] = time.monotonic() - self.startup_time
+        return result
+    
+    def ensure_shape_predictor(self):
+        """Download the landmark model if it is missing"""
+        # An empty placeholder file (as created in the Docker image) counts as missing
+        if not os.path.exists(self.shape_predictor_path) or os.path.getsize(self.shape_predictor_path) == 0:
+            self.download_shape_predictor()
+    
+    def load_landmark_predictor(self):
+        """Download the landmark model if needed and load it"""
+        self.ensure_shape_predictor()
+        return dlib.shape_predictor(self.shape_predictor_path)
+    
     def download_shape_predictor(self):
         """Download the dlib facial landmark predictor"""
         import urllib.request
         import bz2
         
-        url = "http://dlib.net/files/shape_predictor_68_face_landmarks.dat.bz2"
-        compressed_file = "shape_predictor_68_face_landmarks.dat.bz2"
+        url = self.config['shape_predictor_url']
+        partial_file = self.shape_predictor_path + ".part"
+        chunk_size = 1 << 20
         
         try:
-            print("Downloading facial landmark predictor...")
-            urllib.request.urlretrieve(url, compressed_file)
+            self.logger.info("Downloading facial landmark predictor...")
+            
+            # Decompress while downloading, one chunk at a time, hashing the output
+            decompressor = bz2.BZ2Decompressor()
+            digest = hashlib.sha256()
+            with urllib.request.urlopen(url) as response, open(partial_file, 'wb') as f_out:
+                while True:
+                    chunk = response.read(chunk_size)
+                    if not chunk:
+                        break
+                    data = decompressor.decompress(chunk)
+                    digest.update(data)
+                    f_out.write(data)
             
-            print("Extracting...")
-            with bz2.BZ2File(compressed_file, 'rb') as f_in:
-                with open(self.shape_predictor_path, 'wb') as f_out:
-                    f_out.write(f_in.read())
+            if not decompressor.eof:
+                raise IOError("Download ended before the end of the bz2 stream")
             
-            os.remove(compressed_file)
-            print("Download complete!")
+            expected = self.config['shape_predictor_sha256']
+            if not expected and url == DEFAULT_CONFIG['shape_predictor_url']:
+                # Only a custom model may skip the check; the stock one is always verified
+                expected = DEFAULT_CONFIG['shape_predictor_sha256']
+            if expected and digest.hexdigest() != expected.lower():
+                raise IOError(f"Checksum mismatch: expected {expected}, got {digest.hexdigest()}")
+            if not expected:
+                self.logger.info(f"Landmark model sha256: {digest.hexdigest()}")
+            
+            os.replace(partial_file, self.shape_predictor_path)
+            self.logger.info("Download complete!")
             
         except Exception as e:
+            if os.path.exists(partial_file):
+                os.remove(partial_file)
             print(f"Error downloading shape predictor: {e}")
             print("Please download shape_predictor_68_face_landmarks.dat manually")
             raise
     
-    def calculate_eye_aspect_ratio(self, eye_landmarks):
-        """Calculate eye aspect ratio for blink detection"""
-        # Vertical eye landmarks
-        A = dist.euclidean(eye_landmarks[1], eye_landmarks[5])
-        B = dist.euclidean(eye_landmarks[2], eye_landmarks[4])
-        
-        # Horizontal eye landmark
-        C = dist.euclidean(eye_landmarks[0], eye_landmarks[3])
-        
-        # Eye aspect ratio
-        ear = (A + B) / (2.0 * C)
-        return ear
+    def poll_landmark_predictor(self):
+        """Pick up the landmark predictor once the background load has finished"""
+        if self.predictor_future is None or not self.predictor_future.done():
+            return False
+        self.landmark_predictor = self.predictor_future.result()
+        self.predictor_future = None
+        self.logger.info(f"Landmark predictor ready after {self.startup_marks['predictor_ready']:.2f}s")
+        return True
+    
+    def log_startup_times(self):
+        """Log how long each startup milestone took"""
+        names = [('camera_open', 'camera open'), ('detector_ready', 'detector'),
+                 ('predictor_ready', 'landmark predictor'), ('first_frame', 'first frame'),
+                 ('first_face', 'first face'), ('first_cursor_move', 'first cursor move')]
+        parts = [f"{label} {self.startup_marks[mark]:.2f}s" for mark, label in names if mark in self.startup_marks]
+        self.logger.info("Startup: " + ", ".join(parts))
+    
+    def mark_startup(self, mark):
+        """Record the first time a startup milestone is reached"""
+        if mark not in self.startup_marks:
+            self.startup_marks[mark] = time.monotonic() - self.startup_time
+            return True
+        return False
     
     def calibrate_face_center(self, face_center):
         """Calibrate baseline face position"""
@@ -151,146 +385,447 @@ class FaceNavigator:
             if self.calibration_frames >= self.calibration_required:
                 self.calibrated = True
                 self.logger.info("Face calibration complete!")
+                self.save_calibration()
+    
+    def save_calibration(self):
+        """Save the current baseline to this user's calibration profile"""
+        if self.face_center_baseline is None:
+            return
+        try:
+            self.calibration_profiles.save(self.calibration_key, self.face_center_baseline)
+        except OSError as e:
+            self.logger.warning(f"Could not save calibration profile: {e}")
     
     def move_cursor_with_face(self, face_center):
         """Move cursor based on face movement"""
         if not self.calibrated:
             return
         
+        # Filter the face centre on frame timestamps; the Kalman filter can lead by the pipeline latency
+        if self.face_filter is not None:
+            lead = time.monotonic() - self.capture_time if self.filter_lead else 0.0
+            face_center = self.face_filter.filter(face_center, self.frame_timestamp, lead)
+        
         # Calculate face movement relative to baseline
         movement = np.array(face_center) - self.face_center_baseline
         
         # Apply sensitivity and scaling
         cursor_movement = movement * self.config['sensitivity']
         
+        # Each frame moves the cursor by the offset times the frames elapsed at the configured
+        # rate, so idle, governed or slow cameras do not slow the cursor down
+        steps = 1.0
+        if self.last_move_timestamp is not None:
+            elapsed = self.frame_timestamp - self.last_move_timestamp
+            steps = min(max(elapsed * self.config['target_fps'], 0.0), MAX_CURSOR_STEPS)
+        self.last_move_timestamp = self.frame_timestamp
+        
         # Apply movement threshold to reduce jitter
         if np.linalg.norm(cursor_movement) < self.config['movement_threshold']:
             return
+        cursor_movement = cursor_movement * steps
         
-        # Get current cursor position
-        current_x, current_y = pyautogui.position()
+        # Get current cursor position (tracked by the output backend, not queried from X)
+        current_x, current_y = self.cursor.position()
         
         # Calculate new position
         new_x = current_x + cursor_movement[0]
         new_y = current_y - cursor_movement[1]  # Invert Y axis
         
-        # Apply smoothing
-        smooth_x = self.smoothing_factor * self.last_cursor_pos[0] + (1 - self.smoothing_factor) * new_x
-        smooth_y = self.smoothing_factor * self.last_cursor_pos[1] + (1 - self.smoothing_factor) * new_y
+        # Apply per-frame smoothing, unless a timestamp-based filter already smoothed the face centre
+        if self.face_filter is None:
+            smooth_x = self.smoothing_factor * self.last_cursor_pos[0] + (1 - self.smoothing_factor) * new_x
+            smooth_y = self.smoothing_factor * self.last_cursor_pos[1] + (1 - self.smoothing_factor) * new_y
+        else:
+            smooth_x, smooth_y = new_x, new_y
         
         # Clamp to screen boundaries
         smooth_x = max(0, min(self.screen_width - 1, smooth_x))
         smooth_y = max(0, min(self.screen_height - 1, smooth_y))
         
         # Move cursor
-        pyautogui.moveTo(smooth_x, smooth_y)
+        moved = self.cursor.move_to(smooth_x, smooth_y)
+        if moved:
+            self.metrics.record('glass_to_cursor', self.cursor.last_move_time - self.capture_time)
+        self.frame_moved = self.frame_moved or bool(moved)
+        if moved and self.mark_startup('first_cursor_move'):
+            self.log_startup_times()
         self.last_cursor_pos = (smooth_x, smooth_y)
     
-    def detect_blinks(self, landmarks):
+    def detect_blinks(self, observation):
         """Detect eye blinks and perform clicks"""
-        current_time = time.time()
+        # Blink durations come from frame timestamps, so they do not depend on the frame rate
+        blinks = self.blink_detector.update(observation.left_ear, observation.right_ear, observation.timestamp)
+        if self.landmark_flow is not None:
+            # The adaptive thresholds follow each eye's open-eye EAR
+            self.landmark_flow.eye_guard_ear = self.blink_detector.open_levels()
+        for eye, duration in blinks:
+            if eye == 'both':
+                # Both eyes closing together is usually a natural blink
+                button = self.config['blink_both_action']
+                if button == 'none':
+                    continue
+                self.logger.info(f"Blink of both eyes detected ({duration * 1000:.0f} ms) - "
+                                 f"{button.capitalize()} click")
+            else:
+                button = eye
+                self.logger.info(f"{eye.capitalize()} eye blink detected ({duration * 1000:.0f} ms) - "
+                                 f"{eye.capitalize()} click")
+            self.cursor.click(button)
+            self.frame_clicks |= CLICK_LEFT if button == 'left' else CLICK_RIGHT
+    
+    def predict_landmarks(self, gray, face):
+        """Run the full shape predictor and return the landmarks as a (68, 2) array"""
+        return face_utils.shape_to_np(self.landmark_predictor(gray, face))
+    
+    def locate_face(self, gray):
+        """Return the rectangle of the face to follow, or None"""
+        if self.face_tracker is not None:
+            return self.face_tracker.locate(gray)
         
-        # Skip if still in cooldown period
-        if current_time - self.last_blink_time < self.blink_cooldown:
-            return
+        faces = self.face_detector(gray)
+        if len(faces) > 0:
+            # Use the first detected face
+            return faces[0]
+        return None
+    
+    def log_pipeline_stats(self):
+        """Log stage latencies and capture/tracking counters"""
+        self.logger.info(self.metrics.summary_line())
+        if self.capture is not None:
+            stats = self.capture.stats()
+            self.logger.info(f"Capture: {stats['captured']} captured, {stats['read']} processed, "
+                             f"{stats['dropped']} dropped, {stats['stale']} stale, "
+                             f"last frame age {stats['last_age_ms']:.1f} ms")
+        if self.camera.realtime:
+            stats = self.scheduler.stats()
+            self.logger.info(f"Scheduler: {stats['fps']:.1f} FPS achieved in {stats['mode']} mode, "
+                             f"{stats['overruns']} frames over budget, "
+                             f"{stats['idle_transitions']} idle / {stats['active_transitions']} active transitions")
+        if isinstance(self.camera, ParallelLandmarkPipeline):
+            stats = self.camera.stats()
+            self.logger.info(f"Workers: {stats['dispatched']} frames dispatched, {stats['delivered']} delivered, "
+                             f"{stats['copied']} copied into the ring, at most {stats['max_reordered']} reordered")
+        if self.face_tracker is not None:
+            stats = self.face_tracker.stats()
+            self.logger.info(f"Tracking: {stats['detections']} full detections, "
+                             f"{stats['tracked']} tracked frames, {stats['lost']} times lost")
+        left, right = self.blink_detector.left.stats(), self.blink_detector.right.stats()
+        self.logger.info(f"Blinks: {left['blinks']} left / {right['blinks']} right, "
+                         f"{left['too_short'] + right['too_short']} too short, "
+                         f"{left['too_long'] + right['too_long']} too long, "
+                         f"EAR thresholds {left['threshold']:.3f} / {right['threshold']:.3f}")
+        if self.drift_corrector is not None:
+            stats = self.drift_corrector.stats()
+            self.logger.info(f"Calibration: baseline drift-corrected on {stats['corrected']} frames, "
+                             f"{stats['drift']:.1f} px in total")
+        if self.landmark_flow is not None:
+            stats = self.landmark_flow.stats()
+            self.logger.info(f"Landmarks: {stats['predictions']} predicted, {stats['propagated']} propagated by flow, "
+                             f"{stats['flow_failures']} flow failures, {stats['drift_resets']} drift resets, "
+                             f"{stats['eye_refreshes']} eye refreshes")
+        if self.motion_gate is not None:
+            stats = self.motion_gate.stats()
+            self.logger.info(f"Motion gate: detection skipped on {stats['gated']} of {stats['frames']} frames, "
+                             f"{stats['rechecks']} static rechecks, {stats['wakeups']} wake-ups "
+                             f"(median {stats['wake_ms']:.0f} ms from motion to face)")
+        if self.recorder is not None:
+            stats = self.recorder.stats()
+            self.logger.info(f"Recorder: {stats['written']} of {stats['frames']} frames written, "
+                             f"{stats['dropped']} dropped, {stats['segments']} segments")
+        if self.governor is not None:
+            stats = self.governor.stats()
+            self.logger.info(f"Governor: {self.governor.point}, CPU {stats['cpu_share'] * 100:.0f}%, "
+                             f"{stats['frame_ms']:.1f} ms/frame, {stats['step_downs']} steps down / "
+                             f"{stats['step_ups']} up")
+        if self.head_pose is not None:
+            stats = self.head_pose.stats()
+            self.logger.info(f"Head pose: {stats['estimates']} estimates, {stats['failures']} failed fits")
+    
+    def apply_operating_point(self, point):
+        """Set the frame rate, detection and landmark knobs chosen by the governor"""
+        self.scheduler.target_fps = point.target_fps
+        if self.face_detector is not None and self.face_detector.name != 'dnn':
+            # The DNN detector resizes to its own input size; prescaling would only lose detail
+            self.face_detector.scale = point.detection_scale
+        if self.face_tracker is not None:
+            self.face_tracker.detection_interval = point.detection_interval
+        if self.landmark_flow is not None:
+            self.landmark_flow.prediction_interval = point.landmark_interval
+    
+    def process_frame(self, frame, show_video=False):
+        """Find the face in a camera frame and act on its landmarks"""
+        metrics = self.metrics
+        t = time.perf_counter()
+        
+        # The allocation-free path mirrors the landmarks instead of flipping the whole
+        # frame; the preview still needs the flipped image
+        mirror_landmarks = self.allocation_free and not show_video
+        
+        # Flip frame horizontally for mirror effect
+        if not mirror_landmarks:
+            frame = cv2.flip(frame, 1)
+        t = metrics.lap('flip', t)
+        if frame.ndim == 2:
+            # Cameras negotiated into Y-plane capture already deliver grayscale
+            gray = frame
+            if show_video:
+                frame = cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
+        elif self.allocation_free:
+            gray = self.frame_buffers.to_gray(frame)
+        else:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        t = metrics.lap('grayscale', t)
+        
+        if self.head_pose is not None:
+            self.head_pose.set_frame_size((gray.shape[1], gray.shape[0]))
+        
+        # Nothing moved and no face lately: don't run the detector at all
+        if self.motion_gate is not None:
+            detect = self.motion_gate.should_detect(gray, self.frame_timestamp)
+            t = metrics.lap('motion_gate', t)
+            if not detect:
+                self.face_present = False
+                self.face_lost()
+                if show_video:
+                    cv2.putText(frame, "Waiting for motion", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7,
+                                (0, 255, 255), 2)
+                return frame
         
-        # Extract eye landmarks
-        left_eye = landmarks[self.LEFT_EYE_POINTS]
-        right_eye = landmarks[self.RIGHT_EYE_POINTS]
+        # Detect or track the face
+        face = self.locate_face(gray)
+        t = metrics.lap('detect', t)
+        self.face_present = face is not None
+        if face is not None:
+            self.mark_startup('first_face')
+            if self.motion_gate is not None:
+                self.motion_gate.face_found(self.frame_timestamp)
         
-        # Calculate eye aspect ratios
-        left_ear = self.calculate_eye_aspect_ratio(left_eye)
-        right_ear = self.calculate_eye_aspect_ratio(right_eye)
+        # Keep detecting and tracking while the landmark model is still loading
+        if self.landmark_predictor is None and not self.poll_landmark_predictor():
+            if show_video and face is not None:
+                cv2.rectangle(frame, (face.left(), face.top()), 
+                            (face.right(), face.bottom()), (255, 0, 0), 2)
+                cv2.putText(frame, "Loading landmark model...", 
+                          (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+            return frame
         
-        # Check for left eye blink
-        if left_ear < self.eye_ar_threshold:
-            self.left_eye_counter += 1
+        if face is not None:
+            if self.landmark_flow is not None:
+                # Predicted or flow-propagated landmarks, in the coordinates of gray
+                landmarks = self.landmark_flow.update(gray, face, mirrored=mirror_landmarks)
+                t = metrics.lap('landmarks', t)
+                if mirror_landmarks:
+                    landmarks = self.frame_buffers.mirror(landmarks, gray.shape[1])
+            else:
+                # Get facial landmarks
+                landmarks = self.landmark_predictor(gray, face)
+                t = metrics.lap('landmarks', t)
+                if self.allocation_free:
+                    mirror_width = gray.shape[1] if mirror_landmarks else None
+                    landmarks = self.frame_buffers.landmarks_from_shape(landmarks, mirror_width)
+                else:
+                    landmarks = face_utils.shape_to_np(landmarks)
+            metrics.lap('shape_to_np', t)
+            
+            rect = face
+            if mirror_landmarks:
+                # Same coordinates as the mirrored landmarks, as the worker pipeline reports it
+                width = gray.shape[1]
+                rect = (width - 1 - face.right(), face.top(), width - 1 - face.left(), face.bottom())
+            observation = self.process_landmarks(landmarks, rect)
+            
+            if show_video:
+                if not self.calibrated:
+                    cv2.putText(frame, f"Calibrating... {self.calibration_frames}/{self.calibration_required}", 
+                              (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+                
+                # Draw face landmarks
+                for (x, y) in landmarks:
+                    cv2.circle(frame, (x, y), 2, (0, 255, 0), -1)
+                
+                # Draw face rectangle
+                cv2.rectangle(frame, (face.left(), face.top()), 
+                            (face.right(), face.bottom()), (255, 0, 0), 2)
+                
+                # Draw face center
+                cv2.circle(frame, tuple(observation.centre.astype(int)), 5, (0, 0, 255), -1)
         else:
-            if self.left_eye_counter >= self.eye_ar_consecutive_frames:
-                self.logger.info("Left eye blink detected - Left click")
-                pyautogui.click(button='left')
-                self.last_blink_time = current_time
-            self.left_eye_counter = 0
-        
-        # Check for right eye blink
-        if right_ear < self.eye_ar_threshold:
-            self.right_eye_counter += 1
+            self.face_lost()
+        
+        return frame
+    
+    def face_lost(self):
+        """Drop per-face state that must not carry over to the next face"""
+        if self.landmark_flow is not None:
+            # Start again from a full prediction when the face comes back
+            self.landmark_flow.reset()
+        if self.face_tracker is not None:
+            self.face_tracker.reset()
+        if self.face_filter is not None:
+            # No velocity to extrapolate from a face that is gone
+            self.face_filter.reset()
+        if self.head_pose is not None:
+            self.head_pose.reset()
+    
+    def record_frame(self):
+        """Stage this frame's landmarks, cursor position and clicks with the session recorder"""
+        observation = self.observation
+        if observation is None or not self.face_present or observation.timestamp != self.frame_timestamp:
+            self.recorder.record(self.frame_timestamp, cursor=self.last_cursor_pos, moved=self.frame_moved,
+                                 clicks=self.frame_clicks)
+            return
+        rect = observation.rect
+        if rect is not None and hasattr(rect, 'left'):
+            rect = (rect.left(), rect.top(), rect.right(), rect.bottom())
+        self.recorder.record(self.frame_timestamp, observation.landmarks, rect,
+                             (observation.left_ear, observation.right_ear), self.last_cursor_pos,
+                             self.frame_moved, self.frame_clicks)
+    
+    def process_landmarks(self, landmarks, rect=None):
+        """Calibrate, move the cursor and detect blinks from one frame's landmarks"""
+        # Centre and eye aspect ratios are computed once here and shared by every stage
+        observation = FaceObservation(landmarks, self.frame_timestamp, rect)
+        self.observation = observation
+        
+        # The point that drives the cursor: the landmark centre, or the nose pointer when
+        # the head pose fits (the centre stands in for a frame where it does not)
+        point = observation.centre
+        if self.head_pose is not None:
+            t = time.perf_counter()
+            observation.head_pose = self.head_pose.estimate(landmarks)
+            self.metrics.lap('head_pose', t)
+            if observation.head_pose is not None:
+                point = observation.head_pose.pointer
+        
+        # Calibrate or move cursor
+        if not self.calibrated:
+            self.calibrate_face_center(point)
         else:
-            if self.right_eye_counter >= self.eye_ar_consecutive_frames:
-                self.logger.info("Right eye blink detected - Right click")
-                pyautogui.click(button='right')
-                self.last_blink_time = current_time
-            self.right_eye_counter = 0
+            t = time.perf_counter()
+            self.move_cursor_with_face(point)
+            if self.drift_corrector is not None:
+                self.drift_corrector.update(self.face_center_baseline, point, observation.timestamp)
+            t = self.metrics.lap('cursor', t)
+            self.detect_blinks(observation)
+            self.metrics.lap('blinks', t)
+        
+        return observation
     
-    def run(self, show_video=False):
+    def run(self, show_video=False, max_frames=None):
         """Main application loop"""
         self.logger.info("Starting Face Navigator...")
-        self.logger.info("Look straight ahead and keep your face steady for calibration...")
+        if not self.calibrated:
+            self.logger.info("Look straight ahead and keep your face steady for calibration...")
+        
+        frames_processed = 0
+        start_time = time.time()
+        if self.profiler is not None:
+            self.profiler.start()
+            self.logger.info(f"Profiling ({self.profiler.mode}) - the report goes to {self.profiler.directory}/")
         
         try:
             while True:
-                ret, frame = self.camera.read()
+                frame_start = time.perf_counter()
+                self.frame_moved = False
+                self.frame_clicks = 0
+                ret, frame = self.camera.read(self.frame_buffer)
+                self.metrics.lap('capture', frame_start)
+                self.mark_startup('first_frame')
+                self.frame_timestamp = self.camera.frame_timestamp
+                self.capture_time = self.camera.capture_timestamp
                 if not ret:
-                    self.logger.error("Failed to capture frame")
+                    if self.camera.live:
+                        self.logger.error("Failed to capture frame")
+                    else:
+                        self.logger.info("End of input reached")
                     break
                 
-                # Flip frame horizontally for mirror effect
-                frame = cv2.flip(frame, 1)
-                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                # Driver and capture-thread delay before processing starts
+                self.metrics.record('capture_age', time.monotonic() - self.capture_time)
                 
-                # Detect faces
-                faces = self.face_detector(gray)
+                if self.allocation_free and not self.camera.provides_landmarks:
+                    # Decode the next frame into this one
+                    self.frame_buffer = frame
                 
-                if len(faces) > 0:
-                    # Use the first detected face
-                    face = faces[0]
-                    
-                    # Get facial landmarks
-                    landmarks = self.landmark_predictor(gray, face)
-                    landmarks = face_utils.shape_to_np(landmarks)
-                    
-                    # Calculate face center
-                    face_center = np.mean(landmarks, axis=0)
-                    
-                    # Calibrate or move cursor
-                    if not self.calibrated:
-                        self.calibrate_face_center(face_center)
-                        if show_video:
-                            cv2.putText(frame, f"Calibrating... {self.calibration_frames}/{self.calibration_required}", 
-                                      (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+                if self.camera.provides_landmarks:
+                    # Recorded landmarks skip detection and prediction entirely
+                    landmarks, rect = frame
+                    self.face_present = landmarks is not None
+                    if landmarks is not None:
+                        self.process_landmarks(landmarks, rect)
                     else:
-                        self.move_cursor_with_face(face_center)
-                        self.detect_blinks(landmarks)
+                        self.face_lost()
+                else:
+                    frame = self.process_frame(frame, show_video)
                     
                     if show_video:
-                        # Draw face landmarks
-                        for (x, y) in landmarks:
-                            cv2.circle(frame, (x, y), 2, (0, 255, 0), -1)
-                        
-                        # Draw face rectangle
-                        cv2.rectangle(frame, (face.left(), face.top()), 
-                                    (face.right(), face.bottom()), (255, 0, 0), 2)
-                        
-                        # Draw face center
-                        cv2.circle(frame, tuple(face_center.astype(int)), 5, (0, 0, 255), -1)
+                        cv2.imshow('Face Navigator', frame)
+                        if cv2.waitKey(1) & 0xFF == ord('q'):
+                            break
                 
-                if show_video:
-                    cv2.imshow('Face Navigator', frame)
-                    if cv2.waitKey(1) & 0xFF == ord('q'):
-                        break
+                if self.recorder is not None:
+                    self.record_frame()
                 
-                # Small delay to prevent excessive CPU usage
-                time.sleep(0.01)
+                # Periodically report how far processing lags behind capture
+                if time.time() - self.last_stats_log >= self.config['stats_log_interval']:
+                    self.log_pipeline_stats()
+                    self.last_stats_log = time.time()
+                
+                # Sleep for the rest of the frame budget (recorded input runs flat out)
+                if self.camera.realtime:
+                    t = time.perf_counter()
+                    if self.governor is not None and self.predictor_future is None:
+                        # Not while the landmark model loads: that CPU is a one-off
+                        point = self.governor.update(t - frame_start)
+                        if point is not None:
+                            self.apply_operating_point(point)
+                            stats = self.governor.stats()
+                            self.logger.info(f"Governor: CPU {stats['cpu_share'] * 100:.0f}%, "
+                                             f"{stats['frame_ms']:.1f} ms/frame - now at {point}")
+                    was_idle = self.scheduler.idle
+                    self.scheduler.update(self.face_present)
+                    if self.scheduler.idle != was_idle:
+                        if self.scheduler.idle:
+                            self.logger.info(f"No face for {self.scheduler.idle_after:.0f}s - "
+                                             f"idling at {self.scheduler.idle_fps:g} FPS")
+                        else:
+                            self.logger.info(f"Face detected - resuming {self.scheduler.target_fps:g} FPS")
+                    self.scheduler.wait()
+                    self.metrics.lap('sleep', t)
+                
+                self.metrics.frame_done(frame_start)
+                if self.profiler is not None and self.profiler.frame_done():
+                    self.profiler.stop()
+                
+                frames_processed += 1
+                if max_frames and frames_processed >= max_frames:
+                    break
                 
         except KeyboardInterrupt:
             self.logger.info("Stopping Face Navigator...")
         except Exception as e:
             self.logger.error(f"Error in main loop: {e}")
         finally:
+            elapsed = time.time() - start_time
+            if elapsed > 0:
+                self.logger.info(f"Processed {frames_processed} frames in {elapsed:.1f}s "
+                                 f"({frames_processed / elapsed:.1f} FPS)")
             self.cleanup()
     
     def cleanup(self):
         """Clean up resources"""
+        if self.profiler is not None:
+            # The input may end before the profiling window does
+            self.profiler.stop()
+        if self.recorder is not None:
+            self.recorder.close()
+        self.log_pipeline_stats()
+        if self.calibrated:
+            self.save_calibration()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        self.cursor.close()
         self.camera.release()
         cv2.destroyAllWindows()
         self.logger.info("Face Navigator stopped")
@@ -301,12 +836,56 @@ def main():
                        help='Show video feed window (useful for debugging)')
     parser.add_argument('--config', default='config.json',
                        help='Configuration file path')
+    parser.add_argument('--detector', choices=sorted(DETECTOR_BACKENDS),
+                       help='Face detector backend (overrides detector_backend in config)')
+    parser.add_argument('--input', default=None,
+                       help='Camera index, video file, image directory, .npz landmark trace, '
+                            '.npy session recording or "synthetic" (default: camera 0)')
+    parser.add_argument('--realtime', action='store_true',
+                       help='Replay recorded input at its recorded rate instead of as fast as possible')
+    parser.add_argument('--loop', action='store_true',
+                       help='Restart recorded input when it ends (for soak testing)')
+    parser.add_argument('--max-frames', type=int, default=None,
+                       help='Stop after processing this many frames')
+    parser.add_argument('--metrics-port', type=int, default=None,
+                       help='Serve Prometheus metrics on this localhost port (0 disables)')
+    parser.add_argument('--cursor', choices=CURSOR_BACKENDS, default=None,
+                       help='Cursor output backend (overrides cursor_backend in config)')
+    parser.add_argument('--filter', choices=FILTERS, default=None,
+                       help='Face centre filter (overrides cursor_filter in config)')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Worker processes for detection and landmarks (overrides pipeline_workers in config)')
+    parser.add_argument('--calibration-profile', default=None,
+                       help='Calibration profile name (overrides calibration_profile in config)')
+    parser.add_argument('--recalibrate', action='store_true',
+                       help='Ignore the saved calibration and calibrate again')
+    parser.add_argument('--reprobe-camera', action='store_true',
+                       help='Probe the camera modes again instead of using the cached choice')
+    parser.add_argument('--record', action='store_true',
+                       help='Record every frame to session_directory (overrides session_recording in config)')
+    parser.add_argument('--cursor-source', choices=CURSOR_SOURCES, default=None,
+                       help='What drives the cursor (overrides cursor_source in config)')
+    parser.add_argument('--profile', choices=PROFILE_MODES, default=None,
+                       help='Profile the loop with a stack sampler or cProfile and write a report to '
+                            'profile_directory')
+    parser.add_argument('--profile-frames', type=int, default=None,
+                       help='Frames to profile (overrides profile_frames in config; 0 = no frame limit)')
+    parser.add_argument('--profile-seconds', type=float, default=None,
+                       help='Seconds to profile (overrides profile_seconds in config; 0 = no time limit)')
     
     args = parser.parse_args()
     
     try:
-        navigator = FaceNavigator(config_file=args.config)
-        navigator.run(show_video=args.show_video)
+        # The input is opened (and a camera probed) on the startup pool while the models load
+        navigator = FaceNavigator(config_file=args.config, detector_backend=args.detector, input_spec=args.input,
+                                  realtime=args.realtime, loop=args.loop, reprobe_camera=args.reprobe_camera,
+                                  metrics_port=args.metrics_port, cursor_backend=args.cursor,
+                                  cursor_filter=args.filter, workers=args.workers,
+                                  calibration_profile=args.calibration_profile, recalibrate=args.recalibrate,
+                                  cursor_source=args.cursor_source, record_session=args.record,
+                                  profile=args.profile, profile_frames=args.profile_frames,
+                                  profile_seconds=args.profile_seconds)
+        navigator.run(show_video=args.show_video, max_frames=args.max_frames)
     except Exception as e:
         print(f"Error starting Face Navigator: {e}")
         return 1
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Detect-then-track face localisation for Face Navigator
+Runs the full face detector only periodically and follows the face
+with dlib's correlation tracker in between
+"""
+
+import dlib
+
+
+class FaceTracker:
+    """Locate the face with periodic full detection and cheap tracking in between"""
+
+    def __init__(self, detect, detection_interval=10, min_confidence=7.0):
+        # detect(gray) must return a sequence of dlib rectangles
+        self.detect = detect
+        self.detection_interval = detection_interval
+        self.min_confidence = min_confidence
+
+        self.tracker = None
+        self.frames_since_detection = 0
+        self.confidence = 0.0
+
+        # Counters
+        self.detections = 0
+        self.tracked_frames = 0
+        self.tracking_lost = 0
+
+    def locate(self, gray):
+        """Return the face rectangle in gray, or None if no face is found"""
+        if self.tracker is None or self.frames_since_detection >= self.detection_interval:
+            return self._redetect(gray)
+
+        # update() returns the peak-to-sidelobe ratio of the correlation response
+        self.confidence = self.tracker.update(gray)
+        if self.confidence < self.min_confidence:
+            self.tracking_lost += 1
+            return self._redetect(gray)
+
+        self.frames_since_detection += 1
+        self.tracked_frames += 1
+
+        position = self.tracker.get_position()
+        return dlib.rectangle(int(position.left()), int(position.top()),
+                              int(position.right()), int(position.bottom()))
+
+    def _redetect(self, gray):
+        """Run full detection and restart the tracker on the first face"""
+        self.detections += 1
+        self.frames_since_detection = 0
+
+        faces = self.detect(gray)
+        if len(faces) == 0:
+            self.tracker = None
+            return None
+
+        face = faces[0]
+        self.tracker = dlib.correlation_tracker()
+        self.tracker.start_track(gray, face)
+        self.confidence = float("inf")
+        return face
+
+    def reset(self):
+        """Forget the tracked face so the next frame runs full detection"""
+        self.tracker = None
+
+    def stats(self):
+        """Return detection/tracking counters"""
+        return {
+            "detections": self.detections,
+            "tracked": self.tracked_frames,
+            "lost": self.tracking_lost,
+            "confidence": self.confidence
+        }
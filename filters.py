@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Cursor signal filters for Face Navigator
+The One Euro and Kalman filters work from real timestamps, so their lag
+does not change with the frame rate. The "exponential" choice keeps the
+original per-frame smoothing_factor blend, which the navigator applies in
+cursor space.
+"""
+
+import math
+
+import numpy as np
+
+
+def _smoothing_alpha(cutoff, dt):
+    """Blend weight of a first-order low-pass filter with the given cutoff (Hz)"""
+    tau = 1.0 / (2.0 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter:
+    """One Euro filter: low jitter when still, low lag when moving fast"""
+
+    def __init__(self, min_cutoff=1.0, beta=0.05, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self.value = None
+        self.derivative = None
+        self.timestamp = None
+
+    def filter(self, value, timestamp, lead=0.0):
+        value = np.asarray(value, dtype=np.float64)
+        if self.value is None:
+            self.value = value.copy()
+            self.derivative = np.zeros_like(value)
+            self.timestamp = timestamp
+            return self.value
+
+        dt = timestamp - self.timestamp
+        if dt <= 0:
+            return self.value
+        self.timestamp = timestamp
+
+        # Smoothed speed drives the cutoff: the faster the motion, the less smoothing
+        alpha_d = _smoothing_alpha(self.d_cutoff, dt)
+        self.derivative = alpha_d * (value - self.value) / dt + (1 - alpha_d) * self.derivative
+
+        cutoff = self.min_cutoff + self.beta * np.abs(self.derivative)
+        tau = 1.0 / (2.0 * math.pi * cutoff)
+        alpha = 1.0 / (1.0 + tau / dt)
+        self.value = alpha * value + (1 - alpha) * self.value
+        return self.value
+
+
+class KalmanFilter2D:
+    """Constant-velocity Kalman filter on independent x/y axes
+
+    process_noise is the white-acceleration spectral density (px^2/s^3),
+    measurement_noise the landmark noise variance (px^2). filter() can
+    extrapolate the estimate by a lead time to make up for pipeline latency.
+    """
+
+    def __init__(self, process_noise=2000.0, measurement_noise=4.0):
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.reset()
+
+    def reset(self):
+        self.position = None
+        self.velocity = None
+        # Per-axis covariance terms [[p_pp, p_pv], [p_pv, p_vv]]
+        self.p_pp = None
+        self.p_pv = None
+        self.p_vv = None
+        self.timestamp = None
+
+    def filter(self, value, timestamp, lead=0.0):
+        value = np.asarray(value, dtype=np.float64)
+        if self.position is None:
+            self.position = value.copy()
+            self.velocity = np.zeros_like(value)
+            self.p_pp = np.full_like(value, self.measurement_noise)
+            self.p_pv = np.zeros_like(value)
+            self.p_vv = np.full_like(value, 1e4)
+            self.timestamp = timestamp
+            return self.position.copy()
+
+        dt = max(timestamp - self.timestamp, 1e-6)
+        self.timestamp = timestamp
+
+        # Predict
+        q = self.process_noise
+        self.position = self.position + self.velocity * dt
+        p_pp = self.p_pp + 2 * dt * self.p_pv + dt * dt * self.p_vv + q * dt ** 3 / 3
+        p_pv = self.p_pv + dt * self.p_vv + q * dt ** 2 / 2
+        p_vv = self.p_vv + q * dt
+
+        # Update with the measured position
+        innovation = value - self.position
+        s = p_pp + self.measurement_noise
+        k_p = p_pp / s
+        k_v = p_pv / s
+        self.position = self.position + k_p * innovation
+        self.velocity = self.velocity + k_v * innovation
+        self.p_pp = (1 - k_p) * p_pp
+        self.p_pv = (1 - k_p) * p_pv
+        self.p_vv = p_vv - k_v * p_pv
+
+        if lead > 0:
+            return self.position + self.velocity * lead
+        return self.position.copy()
+
+
+FILTERS = ("exponential", "one_euro", "kalman")
+
+
+def create_filter(config, name=None):
+    """Build the face-centre filter selected in config; None keeps the cursor-space blend"""
+    name = name or config['cursor_filter']
+    if name == "exponential":
+        return None
+    if name == "one_euro":
+        return OneEuroFilter(min_cutoff=config['one_euro_min_cutoff'], beta=config['one_euro_beta'])
+    if name == "kalman":
+        return KalmanFilter2D(process_noise=config['kalman_process_noise'],
+                              measurement_noise=config['kalman_measurement_noise'])
+    raise ValueError(f"Unknown cursor filter '{name}' (choose from {', '.join(FILTERS)})")
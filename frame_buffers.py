@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Preallocated buffers for Face Navigator's allocation-free frame path
+Instead of flipping every frame for the mirror effect, landmarks found on
+the unflipped frame are mirrored (coordinates and point labels) into a
+fixed (68, 2) array
+"""
+
+import cv2
+import numpy as np
+
+NUM_LANDMARKS = 68
+
+
+def _mirror_index():
+    """Index map from each of the 68 iBUG landmarks to its left/right counterpart"""
+    pairs = [(i, 16 - i) for i in range(8)]                                # jaw
+    pairs += [(17, 26), (18, 25), (19, 24), (20, 23), (21, 22)]            # eyebrows
+    pairs += [(31, 35), (32, 34)]                                          # nose
+    pairs += [(36, 45), (37, 44), (38, 43), (39, 42), (40, 47), (41, 46)]  # eyes
+    pairs += [(48, 54), (49, 53), (50, 52), (55, 59), (56, 58)]            # outer lips
+    pairs += [(60, 64), (61, 63), (65, 67)]                                # inner lips
+
+    index = np.arange(NUM_LANDMARKS)
+    for a, b in pairs:
+        index[a], index[b] = b, a
+    return index
+
+
+MIRROR_INDEX = _mirror_index()
+
+
+class FrameBuffers:
+    """Reusable destination buffers for grayscale conversion and landmarks"""
+
+    def __init__(self):
+        self.gray = None
+        self._shape = np.zeros((NUM_LANDMARKS, 2), dtype=np.int32)
+        self.landmarks = np.zeros((NUM_LANDMARKS, 2), dtype=np.int32)
+
+    def to_gray(self, frame):
+        """Convert a BGR frame to grayscale in the preallocated buffer"""
+        if frame.ndim == 2:
+            return frame
+        if self.gray is None or self.gray.shape != frame.shape[:2]:
+            self.gray = np.empty(frame.shape[:2], dtype=np.uint8)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self.gray)
+        return self.gray
+
+    def landmarks_from_shape(self, shape, mirror_width=None):
+        """Copy a dlib full_object_detection into the fixed landmark array
+
+        With mirror_width set, the points are mirrored horizontally and
+        relabelled, matching what the predictor returns on a flipped frame.
+        """
+        points = self._shape if mirror_width is not None else self.landmarks
+        for i in range(NUM_LANDMARKS):
+            part = shape.part(i)
+            points[i, 0] = part.x
+            points[i, 1] = part.y
+
+        if mirror_width is not None:
+            return self.mirror(points, mirror_width)
+        return self.landmarks
+
+    def mirror(self, points, width):
+        """Mirror (68, 2) landmarks of a frame of the given width into the landmark array"""
+        np.take(points, MIRROR_INDEX, axis=0, out=self.landmarks)
+        x = self.landmarks[:, 0]
+        np.subtract(width - 1, x, out=x)
+        return self.landmarks
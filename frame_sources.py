@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Frame sources for Face Navigator
+Feed the processing loop from a live camera, a video file, a directory of
+images or a pre-recorded landmark stream
+"""
+
+import os
+import time
+
+import cv2
+import numpy as np
+
+from camera_modes import CameraMode, configure_capture, device_key, negotiate_camera_mode, raw_to_gray
+from session_recorder import load_session
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+
+class FrameSource:
+    """Common interface for frame inputs: read() returns (ret, frame) like cv2.VideoCapture
+
+    read() takes an optional image buffer that decoding sources fill in
+    place, so the allocation-free path can reuse one frame buffer.
+    """
+
+    # Live sources never run out and are always paced by the device
+    live = False
+    # Landmark sources return (landmarks, face_rectangle) instead of an image
+    provides_landmarks = False
+    # Identifies the camera or recording, e.g. to key calibration profiles
+    device = None
+
+    def __init__(self, realtime=False, loop=False):
+        self.realtime = realtime
+        self.loop = loop
+        self._start = None
+
+        # Time of the frame last returned by read(): time.monotonic() for real-time
+        # sources, the recorded media time otherwise
+        self.frame_timestamp = 0.0
+        self._media_offset = 0.0
+
+        # time.monotonic() at which that frame was captured: the driver's timestamp when the
+        # camera provides one, otherwise when it was read; the start of glass-to-cursor latency
+        self.capture_timestamp = 0.0
+
+    def read(self, image=None):
+        raise NotImplementedError
+
+    def release(self):
+        pass
+
+    def _pace(self, offset):
+        """Stamp the frame, and when replaying in real time sleep until offset seconds after the first one"""
+        if not self.realtime:
+            self.frame_timestamp = self._media_offset + offset
+            self.capture_timestamp = time.monotonic()
+            return
+        if self._start is None:
+            self._start = time.monotonic() - offset
+        delay = self._start + offset - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        self.frame_timestamp = self.capture_timestamp = time.monotonic()
+
+    def _restart(self, duration):
+        """Start the recording over for looped playback, keeping media time increasing"""
+        self._start = None
+        self._media_offset += duration
+
+
+class CameraSource(FrameSource):
+    """Live webcam input
+
+    With a negotiated CameraMode that delivers raw frames, read() returns
+    the grayscale Y plane instead of a BGR image. With reuse_buffers raw
+    frames are read into one buffer, and MJPG is decoded by the backend
+    into the caller's image, since cv2.imdecode cannot decode in place.
+    """
+
+    live = True
+
+    def __init__(self, index=0, width=640, height=480, mode=None, reuse_buffers=False):
+        super().__init__(realtime=True)
+        self.device = device_key(index, width, height)
+        self.camera = cv2.VideoCapture(index)
+        self.mode = mode or CameraMode(width=width, height=height)
+        self.grayscale = configure_capture(self.camera, self.mode) and self.mode.grayscale
+        if self.grayscale and reuse_buffers and self.mode.fourcc == 'MJPG':
+            self.grayscale = False
+        if self.mode.grayscale and not self.grayscale:
+            self.camera.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+        self._raw = None
+        # Set once the driver has delivered a plausible buffer timestamp
+        self.driver_timestamps = False
+
+    def read(self, image=None):
+        if not self.grayscale:
+            ret, frame = self.camera.read(image)
+            self._stamp()
+            return ret, frame
+
+        ret, raw = self.camera.read(self._raw)
+        self._stamp()
+        if not ret:
+            return False, None
+        self._raw = raw
+        frame = raw_to_gray(raw, self.mode.fourcc, self.mode.width, self.mode.height, image)
+        if frame is None:
+            # The cached mode no longer matches what the driver delivers; go back to BGR
+            self.grayscale = False
+            self.camera.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+            return self.read(image)
+        return True, frame
+
+    def _stamp(self):
+        self.frame_timestamp = time.monotonic()
+        # V4L2 stamps buffers with CLOCK_MONOTONIC, the clock behind time.monotonic(); other
+        # backends report a position or nothing, which fails the plausibility check
+        driver = self.camera.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+        if 0.0 <= self.frame_timestamp - driver < 1.0:
+            self.capture_timestamp = driver
+            self.driver_timestamps = True
+        else:
+            self.capture_timestamp = self.frame_timestamp
+
+    def release(self):
+        self.camera.release()
+
+
+class VideoFileSource(FrameSource):
+    """Frames decoded from a video file"""
+
+    def __init__(self, path, realtime=False, loop=False):
+        super().__init__(realtime, loop)
+        self.path = path
+        self.device = f"file:{os.path.basename(path)}"
+        self.video = cv2.VideoCapture(path)
+        if not self.video.isOpened():
+            raise IOError(f"Could not open video file {path}")
+        self.fps = self.video.get(cv2.CAP_PROP_FPS) or 30.0
+        self.index = 0
+
+    def read(self, image=None):
+        ret, frame = self.video.read(image)
+        if not ret and self.loop and self.index > 0:
+            self.video.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self._restart(self.index / self.fps)
+            self.index = 0
+            ret, frame = self.video.read(image)
+        if not ret:
+            return False, None
+
+        self._pace(self.index / self.fps)
+        self.index += 1
+        return True, frame
+
+    def release(self):
+        self.video.release()
+
+
+class ImageDirectorySource(FrameSource):
+    """Frames loaded from the images in a directory, in file name order"""
+
+    def __init__(self, directory, fps=30.0, realtime=False, loop=False):
+        super().__init__(realtime, loop)
+        self.device = f"file:{os.path.basename(os.path.normpath(directory))}"
+        self.paths = [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+                      if name.lower().endswith(IMAGE_EXTENSIONS)]
+        if not self.paths:
+            raise IOError(f"No images found in {directory}")
+        self.fps = fps
+        self.index = 0
+
+    def read(self, image=None):
+        if self.index >= len(self.paths):
+            if not self.loop:
+                return False, None
+            self._restart(self.index / self.fps)
+            self.index = 0
+
+        frame = cv2.imread(self.paths[self.index])
+        if frame is None:
+            return False, None
+
+        self._pace(self.index / self.fps)
+        self.index += 1
+        return True, frame
+
+
+class LandmarkReplaySource(FrameSource):
+    """Pre-recorded landmarks that bypass detection entirely
+
+    The .npz file holds 'landmarks' (N, 68, 2) and 'timestamps' (N,), and
+    optionally 'rects' (N, 4) as left, top, right, bottom and a boolean
+    'found' mask for frames where a face was present. Session recordings
+    (.npy segments written by session_recorder) carry the same fields.
+    """
+
+    provides_landmarks = True
+
+    def __init__(self, path, realtime=False, loop=False):
+        super().__init__(realtime, loop)
+        self.device = f"file:{os.path.basename(path)}"
+        if path.endswith('.npy'):
+            records = load_session(path)
+            self.landmarks = records['landmarks'].astype(np.int32)
+            self.timestamps = records['timestamp'].astype(np.float64)
+            self.rects = records['rect']
+            self.found = records['found'].astype(bool)
+        else:
+            data = np.load(path)
+            self.landmarks = data['landmarks'].astype(np.int32)
+            self.timestamps = data['timestamps'].astype(np.float64)
+            self.rects = data['rects'] if 'rects' in data else None
+            found = data['found'] if 'found' in data else np.ones(len(self.landmarks))
+            self.found = found.astype(bool)
+        self.index = 0
+
+        self._rectangle = None
+        if self.rects is not None:
+            import dlib
+            self._rectangle = dlib.rectangle
+
+    def read(self, image=None):
+        """Return (ret, (landmarks, rect)); both are None for frames without a face"""
+        if self.index >= len(self.landmarks):
+            if not self.loop:
+                return False, None
+            frame_interval = np.median(np.diff(self.timestamps)) if len(self.timestamps) > 1 else 0.0
+            self._restart(self.timestamps[-1] - self.timestamps[0] + frame_interval)
+            self.index = 0
+
+        i = self.index
+        self._pace(self.timestamps[i] - self.timestamps[0])
+        self.index += 1
+
+        if not self.found[i]:
+            return True, (None, None)
+
+        rect = None
+        if self._rectangle is not None:
+            rect = self._rectangle(*(int(v) for v in self.rects[i]))
+        return True, (self.landmarks[i], rect)
+
+
+def template_landmarks(centre=(320.0, 240.0), width=160.0):
+    """Return a frontal 68-point face (float, (68, 2)) with open eyes (aspect ratio 0.3)"""
+    s = width / 160.0
+    points = np.zeros((68, 2))
+    # Jaw, from the right of the image around the chin to the left
+    angles = np.linspace(np.pi, 0.0, 17)
+    points[0:17] = np.column_stack((80 * np.cos(angles), 10 + 90 * np.sin(angles)))
+    # Brows
+    brow = np.column_stack((np.linspace(-25, 25, 5), -8 + 0.012 * np.linspace(-25, 25, 5) ** 2))
+    points[17:22] = brow + [-40, -40]
+    points[22:27] = brow + [40, -40]
+    # Nose bridge and nostrils
+    points[27:31] = np.column_stack((np.zeros(4), np.linspace(-30, 0, 4)))
+    points[31:36] = np.column_stack((np.linspace(-16, 16, 5), [8, 10, 11, 10, 8]))
+    # Eyes: corners 40 apart, lids 6 from the middle
+    eye = np.array([[-20, 0], [-7, -6], [7, -6], [20, 0], [7, 6], [-7, 6]])
+    points[36:42] = eye + [-40, -20]
+    points[42:48] = eye + [40, -20]
+    # Mouth, outer then inner contour
+    outer = np.linspace(np.pi, -np.pi, 12, endpoint=False)
+    points[48:60] = np.column_stack((30 * np.cos(outer), 45 - 12 * np.sin(outer)))
+    inner = np.linspace(np.pi, -np.pi, 8, endpoint=False)
+    points[60:68] = np.column_stack((20 * np.cos(inner), 45 - 4 * np.sin(inner)))
+    return points * s + centre
+
+
+class SyntheticFaceSource(FrameSource):
+    """A template face that holds still and jumps along a known path, for tests without a camera
+
+    Yields (landmarks, None) like LandmarkReplaySource, at fps. After
+    lead_in seconds at rest the face moves step pixels right and back,
+    down and back, left and back, up and back, holding each position for
+    hold seconds. onsets lists (capture_timestamp, away) for the first frame
+    at each new position, away being True when the face left its rest
+    position, so the cursor's response to each movement can be timed.
+    """
+
+    provides_landmarks = True
+    DIRECTIONS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+
+    def __init__(self, duration=20.0, fps=30.0, hold=1.0, step=20.0, noise=0.3, lead_in=2.0, realtime=True,
+                 loop=False, seed=0):
+        super().__init__(realtime, loop)
+        self.device = "synthetic"
+        self.fps = fps
+        self.frames = int(duration * fps)
+        self.hold = hold
+        self.step = step
+        self.noise = noise
+        self.lead_in = lead_in
+        self.index = 0
+        self.onsets = []
+        self._template = template_landmarks()
+        self._rng = np.random.default_rng(seed)
+        self._offset = None
+
+    def offset(self, t):
+        """Offset of the face from its rest position t seconds into the path"""
+        if t < self.lead_in:
+            return (0.0, 0.0)
+        k = int((t - self.lead_in) // self.hold)
+        if k % 2:
+            return (0.0, 0.0)
+        dx, dy = self.DIRECTIONS[(k // 2) % len(self.DIRECTIONS)]
+        return (dx * self.step, dy * self.step)
+
+    def read(self, image=None):
+        if self.index >= self.frames:
+            if not self.loop:
+                return False, None
+            self._restart(self.index / self.fps)
+            self.index = 0
+
+        t = self.index / self.fps
+        self._pace(t)
+        self.index += 1
+        offset = self.offset(t)
+        if self._offset is not None and offset != self._offset:
+            self.onsets.append((self.capture_timestamp, offset != (0.0, 0.0)))
+        self._offset = offset
+
+        landmarks = self._template + offset + self._rng.normal(0.0, self.noise, self._template.shape)
+        return True, (np.round(landmarks).astype(np.int32), None)
+
+
+def is_landmark_input(spec):
+    """Whether open_source(spec) returns a source that provides landmarks rather than images"""
+    return spec == 'synthetic' or (spec is not None and str(spec).endswith(('.npz', '.npy'))
+                                   and not os.path.isdir(spec))
+
+
+def open_source(spec=None, realtime=False, loop=False, width=640, height=480, config=None,
+                reprobe_camera=False, logger=None):
+    """Open a frame source from a camera index, video file, image directory, landmark trace or recording
+
+    Landmark traces are .npz files and session recordings .npy segments;
+    'synthetic' is a template face moving along a known path.
+
+    Cameras are opened in the mode negotiated by camera_modes when config
+    enables camera_probe.
+    """
+    if spec is None or str(spec).isdigit():
+        index = int(spec or 0)
+        mode = None
+        if config is not None and config['camera_probe']:
+            mode = negotiate_camera_mode(index, width, height, grayscale=config['camera_grayscale'],
+                                         cache_path=config['camera_mode_cache'],
+                                         reprobe=reprobe_camera, logger=logger)
+        return CameraSource(index, width, height, mode,
+                            reuse_buffers=config is not None and config['allocation_free'])
+    if spec == 'synthetic':
+        return SyntheticFaceSource(realtime=realtime, loop=loop)
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec, realtime=realtime, loop=loop)
+    if spec.endswith('.npz') or spec.endswith('.npy'):
+        return LandmarkReplaySource(spec, realtime=realtime, loop=loop)
+    return VideoFileSource(spec, realtime=realtime, loop=loop)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+CPU budget governor for Face Navigator
+Measures the process's CPU share and per-frame processing time, and moves
+along a ladder of operating points (detection interval, landmark refresh,
+detection scale, frame rate) to stay within the configured budget. Rungs
+that cost cursor latency, lower frame rates, come last.
+"""
+
+import time
+
+
+class OperatingPoint:
+    """One setting of the quality knobs the governor can turn
+
+    An interval is None when the component it paces (face tracking or
+    landmark flow) is off.
+    """
+
+    __slots__ = ('level', 'target_fps', 'detection_scale', 'detection_interval', 'landmark_interval')
+
+    def __init__(self, level, target_fps, detection_scale, detection_interval, landmark_interval):
+        self.level = level
+        self.target_fps = target_fps
+        self.detection_scale = detection_scale
+        self.detection_interval = detection_interval
+        self.landmark_interval = landmark_interval
+
+    def knobs(self):
+        return (self.target_fps, self.detection_scale, self.detection_interval, self.landmark_interval)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __str__(self):
+        text = f"level {self.level}: {self.target_fps:g} FPS, detection scale {self.detection_scale:.2f}"
+        if self.detection_interval is not None:
+            text += f", detect every {self.detection_interval} frames"
+        if self.landmark_interval is not None:
+            text += f", landmarks every {self.landmark_interval} frames"
+        return text
+
+
+# (FPS, detection scale, detection interval, landmark interval) factors, cheapest last.
+# Detection and landmark intervals are covered by tracking and optical flow and cost
+# little latency, so they go first; the frame rate goes last.
+LADDER = (
+    (1.0, 1.0, 1, 1),
+    (1.0, 1.0, 2, 1),
+    (1.0, 1.0, 2, 2),
+    (1.0, 0.75, 2, 2),
+    (1.0, 0.75, 3, 3),
+    (1.0, 0.5, 4, 3),
+    (0.75, 0.5, 4, 4),
+    (0.5, 0.5, 4, 4),
+    (0.33, 0.5, 6, 4),
+)
+
+
+def operating_points(target_fps, detection_scale, detection_interval, landmark_interval, min_fps=10.0,
+                     min_scale=0.5, fps_only=False, tracking=True, landmark_flow=True):
+    """Return the ladder of operating points for the configured settings, best quality first
+
+    min_scale is the smallest detection scale the detector backend still
+    finds faces at. Without tracking or landmark_flow the matching interval
+    is None and its rungs drop out. With fps_only the other knobs stay at
+    their configured values, for pipelines whose detection and landmarks
+    the governor cannot reach.
+    """
+    points = []
+    for fps_factor, scale_factor, detection_factor, landmark_factor in LADDER:
+        if fps_only:
+            scale_factor = detection_factor = landmark_factor = 1
+        knobs = (max(round(target_fps * fps_factor), min(min_fps, target_fps)),
+                 max(detection_scale * scale_factor, min(min_scale, detection_scale)),
+                 detection_interval * detection_factor if tracking else None,
+                 landmark_interval * landmark_factor if landmark_flow else None)
+        if points and points[-1].knobs() == knobs:
+            continue
+        points.append(OperatingPoint(len(points), *knobs))
+    return points
+
+
+class CpuGovernor:
+    """Step down the ladder when over budget, and back up once comfortably under it
+
+    cpu_budget is a share of one core (0.25 = 25%) measured with the process
+    CPU clock, so capture threads count too; frame_budget is the processing
+    time allowed per frame in seconds. Either can be 0 to disable it. Every
+    interval seconds the governor steps down one rung if a budget was
+    exceeded, or up one rung after settle consecutive intervals below
+    (1 - headroom) of every budget.
+    """
+
+    def __init__(self, points, cpu_budget=0.0, frame_budget=0.0, interval=1.0, headroom=0.2, settle=3):
+        self.points = points
+        self.cpu_budget = cpu_budget
+        self.frame_budget = frame_budget
+        self.interval = interval
+        self.headroom = headroom
+        self.settle = settle
+
+        self.level = 0
+        self.under_budget = 0
+        self._window_start = None
+        self._window_cpu = 0.0
+        self._busy = 0.0
+        self._frames = 0
+
+        # Last measured window
+        self.cpu_share = 0.0
+        self.frame_time = 0.0
+
+        # Counters
+        self.step_downs = 0
+        self.step_ups = 0
+
+    @property
+    def point(self):
+        return self.points[self.level]
+
+    def update(self, busy):
+        """Add one frame's processing time (s); returns the new OperatingPoint when it changes"""
+        now = time.monotonic()
+        if self._window_start is None:
+            self._start_window(now)
+            return None
+        self._busy += busy
+        self._frames += 1
+        elapsed = now - self._window_start
+        if elapsed < self.interval or elapsed <= 0:
+            return None
+
+        self.cpu_share = (time.process_time() - self._window_cpu) / elapsed
+        self.frame_time = self._busy / self._frames
+        self._start_window(now)
+
+        over = self._ratio() > 1.0
+        if over and self.level < len(self.points) - 1:
+            self.level += 1
+            self.step_downs += 1
+            self.under_budget = 0
+            return self.point
+        if not over and self._ratio() < 1.0 - self.headroom and self.level > 0:
+            self.under_budget += 1
+            if self.under_budget >= self.settle:
+                self.level -= 1
+                self.step_ups += 1
+                self.under_budget = 0
+                return self.point
+        else:
+            self.under_budget = 0
+        return None
+
+    def _ratio(self):
+        """Largest measured-to-budget ratio over the enabled budgets"""
+        ratio = 0.0
+        if self.cpu_budget > 0:
+            ratio = max(ratio, self.cpu_share / self.cpu_budget)
+        if self.frame_budget > 0:
+            ratio = max(ratio, self.frame_time / self.frame_budget)
+        return ratio
+
+    def _start_window(self, now):
+        self._window_start = now
+        self._window_cpu = time.process_time()
+        self._busy = 0.0
+        self._frames = 0
+
+    def stats(self):
+        return {
+            "level": self.level,
+            "levels": len(self.points),
+            "cpu_share": self.cpu_share,
+            "frame_ms": self.frame_time * 1000,
+            "step_downs": self.step_downs,
+            "step_ups": self.step_ups
+        }
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Head-pose estimation for Face Navigator
+Fits a generic 3D face model to a few rigid landmarks (eye corners and
+nose) with cv2.solvePnP, so expressions and blinks do not move the result.
+The pose drives the cursor through a "nose pointer": a point projected
+from in front of the nose into the image, in the same pixel coordinates
+as the landmark centre it replaces.
+"""
+
+import math
+
+import cv2
+import numpy as np
+
+# Rigid landmarks: nasion, nose tip, nose base, nostrils and the eye corners
+POSE_POINTS = np.array([27, 30, 33, 31, 35, 36, 39, 42, 45])
+
+# Generic face model in mm, camera axes (x right, y down, z away from the camera),
+# with the nose tip at the origin; point 36 is the eye on the left of the image
+MODEL_POINTS = np.array([
+    (0.0, -30.0, 18.0),     # 27 nasion
+    (0.0, 0.0, 0.0),        # 30 nose tip
+    (0.0, 10.0, 12.0),      # 33 nose base
+    (-10.0, 7.0, 13.0),     # 31 left nostril
+    (10.0, 7.0, 13.0),      # 35 right nostril
+    (-43.0, -33.0, 26.0),   # 36 outer corner, left eye
+    (-13.0, -31.0, 22.0),   # 39 inner corner, left eye
+    (13.0, -31.0, 22.0),    # 42 inner corner, right eye
+    (43.0, -33.0, 26.0),    # 45 outer corner, right eye
+])
+
+# What can drive the cursor: the mean of all landmarks, or the nose pointer
+CURSOR_SOURCES = ('centre', 'head_pose')
+
+# How far in front of the nose tip (mm) the pointer is projected from
+POINTER_DISTANCE = 100.0
+
+
+class HeadPose:
+    """Yaw, pitch and roll in degrees, and the projected nose pointer in pixels"""
+
+    __slots__ = ('yaw', 'pitch', 'roll', 'pointer')
+
+    def __init__(self, yaw, pitch, roll, pointer):
+        self.yaw = yaw
+        self.pitch = pitch
+        self.roll = roll
+        self.pointer = pointer
+
+
+class HeadPoseEstimator:
+    """solvePnP head pose with a cached camera matrix, warm-started from the previous frame"""
+
+    def __init__(self, frame_size=(640, 480), max_iterations=10, epsilon=1e-4):
+        # Frame-to-frame motion usually converges in one step; a jump takes a few more
+        self.refine_criteria = (cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, max_iterations, epsilon)
+        self.camera_matrix = None
+        self.frame_size = None
+        self.set_frame_size(frame_size)
+        self.image_points = np.zeros((len(POSE_POINTS), 2), dtype=np.float64)
+        self.rvec = None
+        self.tvec = None
+        self.pointer = np.zeros(2)
+
+        # Counters
+        self.estimates = 0
+        self.failures = 0
+
+    def set_frame_size(self, frame_size):
+        """Build the pinhole camera matrix for a frame size (focal length ~ frame width)"""
+        frame_size = (int(frame_size[0]), int(frame_size[1]))
+        if frame_size == self.frame_size:
+            return
+        width, height = frame_size
+        self.frame_size = frame_size
+        self.camera_matrix = np.array([[width, 0.0, width / 2.0],
+                                       [0.0, width, height / 2.0],
+                                       [0.0, 0.0, 1.0]])
+        self.reset()
+
+    def estimate(self, landmarks):
+        """Return the HeadPose for a (68, 2) landmark array, or None if the fit fails"""
+        self.image_points[:] = landmarks[POSE_POINTS]
+
+        if self.rvec is None:
+            # SQPNP finds the global optimum without a guess
+            ok, rvec, tvec = cv2.solvePnP(MODEL_POINTS, self.image_points, self.camera_matrix, None,
+                                          flags=cv2.SOLVEPNP_SQPNP)
+        else:
+            # Warm start: Gauss-Newton steps from the previous pose, as cheap as a cold solve
+            # for small motion and always on the same branch of the fit as the last frame
+            rvec, tvec = cv2.solvePnPRefineVVS(MODEL_POINTS, self.image_points, self.camera_matrix, None,
+                                               self.rvec, self.tvec, self.refine_criteria)
+            ok = np.isfinite(tvec).all()
+        if not ok or tvec[2, 0] <= 0:
+            self.failures += 1
+            self.reset()
+            return None
+        self.rvec, self.tvec = rvec, tvec
+        self.estimates += 1
+
+        rotation, _ = cv2.Rodrigues(rvec)
+        pitch = math.degrees(math.atan2(rotation[2, 1], rotation[2, 2]))
+        yaw = math.degrees(math.atan2(-rotation[2, 0], math.hypot(rotation[2, 1], rotation[2, 2])))
+        roll = math.degrees(math.atan2(rotation[1, 0], rotation[0, 0]))
+
+        # Project the point POINTER_DISTANCE in front of the nose tip (-z is towards the camera)
+        x, y, z = rotation[:, 2] * -POINTER_DISTANCE + tvec[:, 0]
+        focal = self.camera_matrix[0, 0]
+        self.pointer[0] = focal * x / z + self.camera_matrix[0, 2]
+        self.pointer[1] = focal * y / z + self.camera_matrix[1, 2]
+        return HeadPose(yaw, pitch, roll, self.pointer.copy())
+
+    def reset(self):
+        """Drop the warm start, e.g. after the face was lost"""
+        self.rvec = None
+        self.tvec = None
+
+    def stats(self):
+        return {
+            "estimates": self.estimates,
+            "failures": self.failures
+        }
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Optical-flow landmark propagation for Face Navigator
+Runs the full 68-point shape predictor only periodically and carries the
+points forward with pyramidal Lucas-Kanade flow in between, on a small
+region around the face. Drift and anything that looks like eyelid motion
+force a full prediction, so blink detection still sees predicted eyes.
+"""
+
+import cv2
+import numpy as np
+
+from observation import eye_aspect_ratios
+
+EYE_POINTS = slice(36, 48)
+
+
+class LandmarkFlow:
+    """Landmarks from periodic full prediction and Lucas-Kanade propagation in between
+
+    A full prediction runs when:
+    - prediction_interval frames have been propagated
+    - a point is lost, or the median forward-backward flow error exceeds
+      max_flow_error pixels (max_eye_flow_error for the eye points)
+    - the propagated points drift away from the located face rectangle
+    - either eye's aspect ratio drops below its eye_guard_ear level, so a
+      blink in progress is followed by the predictor frame by frame
+
+    eye_guard_ear is a (left, right) pair or one level for both eyes; the
+    navigator keeps it at the blink detectors' open-eye levels. Those are
+    for mirrored landmarks when update() is told the caller mirrors them,
+    which swaps which eye is left.
+    """
+
+    def __init__(self, predict, prediction_interval=4, max_flow_error=1.0, max_eye_flow_error=0.5,
+                 eye_guard_ear=0.27, window=15, pyramid_levels=2):
+        # predict(gray, face) must return a (68, 2) array of landmark coordinates in gray
+        self.predict = predict
+        self.prediction_interval = prediction_interval
+        self.max_flow_error = max_flow_error
+        self.max_eye_flow_error = max_eye_flow_error
+        self.eye_guard_ear = eye_guard_ear if isinstance(eye_guard_ear, tuple) else (eye_guard_ear, eye_guard_ear)
+        self.flow_params = dict(winSize=(window, window), maxLevel=pyramid_levels,
+                                criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03))
+        self.margin = window + 4
+
+        self.points = None
+        self.landmarks = np.zeros((68, 2), dtype=np.int32)
+        self._rounded = np.zeros((68, 2), dtype=np.float32)
+        self._roi = None
+        # Previous frame, of which only the region around the points is kept up to date
+        self._previous = None
+        self.frames_since_prediction = 0
+
+        # Counters
+        self.predictions = 0
+        self.propagated_frames = 0
+        self.flow_failures = 0
+        self.drift_resets = 0
+        self.eye_refreshes = 0
+
+    def update(self, gray, face, mirrored=False):
+        """Return the (68, 2) int32 landmarks of face in gray
+
+        mirrored says the caller mirrors the landmarks before blink detection.
+        """
+        if self.points is None or self.frames_since_prediction >= self.prediction_interval:
+            return self._predict(gray, face)
+        if not self._propagate(gray, face, mirrored):
+            return self._predict(gray, face)
+
+        self.frames_since_prediction += 1
+        self.propagated_frames += 1
+        return self._finish(gray)
+
+    def _predict(self, gray, face):
+        self.points = np.asarray(self.predict(gray, face), dtype=np.float32).reshape(68, 2)
+        self.frames_since_prediction = 0
+        self.predictions += 1
+        return self._finish(gray)
+
+    def _finish(self, gray):
+        """Round the points into the output array and keep the region around them for the next frame"""
+        np.rint(self.points, out=self._rounded)
+        self.landmarks[:] = self._rounded
+
+        height, width = gray.shape[:2]
+        left, top = np.floor(self.points.min(axis=0)).astype(int) - self.margin
+        right, bottom = np.ceil(self.points.max(axis=0)).astype(int) + self.margin
+        self._roi = (max(left, 0), max(top, 0), min(right, width), min(bottom, height))
+        x0, y0, x1, y1 = self._roi
+        if self._previous is None or self._previous.shape != gray.shape:
+            self._previous = np.empty_like(gray)
+        np.copyto(self._previous[y0:y1, x0:x1], gray[y0:y1, x0:x1])
+        return self.landmarks
+
+    def _propagate(self, gray, face, mirrored):
+        """Move the points by optical flow; returns False if they can no longer be trusted"""
+        if gray.shape != self._previous.shape:
+            return False
+        x0, y0, x1, y1 = self._roi
+        previous = self._previous[y0:y1, x0:x1]
+        current = gray[y0:y1, x0:x1]
+
+        offset = np.array([x0, y0], dtype=np.float32)
+        start = (self.points - offset).reshape(-1, 1, 2)
+        moved, status, _ = cv2.calcOpticalFlowPyrLK(previous, current, start, None, **self.flow_params)
+        back, back_status, _ = cv2.calcOpticalFlowPyrLK(current, previous, moved, None, **self.flow_params)
+        if not (status.all() and back_status.all()):
+            self.flow_failures += 1
+            return False
+
+        # Forward-backward error: a point that does not flow back to where it started has drifted
+        error = np.linalg.norm((back - start).reshape(-1, 2), axis=1)
+        if np.median(error) > self.max_flow_error:
+            self.flow_failures += 1
+            return False
+        if error[EYE_POINTS].max() > self.max_eye_flow_error:
+            self.eye_refreshes += 1
+            return False
+
+        points = moved.reshape(-1, 2) + offset
+
+        # The points must stay on the face the detector/tracker found
+        centre = points.mean(axis=0)
+        if not (face.left() <= centre[0] <= face.right() and face.top() <= centre[1] <= face.bottom()):
+            self.drift_resets += 1
+            return False
+
+        # Eyelids closing is not rigid motion: let the predictor follow possible blinks
+        left_ear, right_ear = eye_aspect_ratios(points)
+        if mirrored:
+            left_ear, right_ear = right_ear, left_ear
+        if left_ear < self.eye_guard_ear[0] or right_ear < self.eye_guard_ear[1]:
+            self.eye_refreshes += 1
+            return False
+
+        self.points = points
+        return True
+
+    def reset(self):
+        """Forget the points so the next frame runs a full prediction"""
+        self.points = None
+
+    def stats(self):
+        """Return prediction/propagation counters"""
+        return {
+            "predictions": self.predictions,
+            "propagated": self.propagated_frames,
+            "flow_failures": self.flow_failures,
+            "drift_resets": self.drift_resets,
+            "eye_refreshes": self.eye_refreshes
+        }
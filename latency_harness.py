@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Glass-to-cursor latency harness for Face Navigator
+Runs the full processing loop on a camera, a recording replayed in real
+time or a synthetic moving face, and reports the time from frame capture
+(the driver's buffer timestamp when the camera provides one) to the cursor
+move reaching the output backend. With the synthetic face, whose movements
+are known, it also times how long the cursor takes to start and to stop
+after the head moves, so regressions can be caught without a camera.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from cursor_output import create_cursor_output, CURSOR_BACKENDS
+from filters import FILTERS
+from frame_sources import SyntheticFaceSource, open_source
+from settings import load_config
+
+
+def response_latencies(onsets, moves):
+    """Cursor start and stop latencies (s) for each movement of a SyntheticFaceSource
+
+    onsets are the source's (capture time, away) pairs and moves the cursor
+    backend's move_log. A start is timed from the first frame away from the
+    rest position to the first cursor move after it (inf if the cursor never
+    moved); a stop from the first frame back at rest to the last move before
+    the next movement (0 if the cursor stopped at once).
+    """
+    move_times = np.array([t for t, _, _ in moves])
+    starts, stops = [], []
+    for i, (onset, away) in enumerate(onsets):
+        end = onsets[i + 1][0] if i + 1 < len(onsets) else np.inf
+        window = move_times[(move_times >= onset) & (move_times < end)]
+        if away:
+            starts.append(window[0] - onset if len(window) else np.inf)
+        else:
+            stops.append(window[-1] - onset if len(window) else 0.0)
+    return starts, stops
+
+
+def distribution(values):
+    """p50/p95/max line for latencies in seconds"""
+    values = np.asarray(values)
+    if not len(values):
+        return "none"
+    finite = values[np.isfinite(values)]
+    missed = len(values) - len(finite)
+    if not len(finite):
+        return f"{missed} of {len(values)} never"
+    line = (f"p50 {np.percentile(finite, 50) * 1000:.1f} ms, p95 {np.percentile(finite, 95) * 1000:.1f} ms, "
+            f"max {finite.max() * 1000:.1f} ms over {len(finite)}")
+    return line + (f" ({missed} never)" if missed else "")
+
+
+def run_harness(source, config, cursor_backend='null', cursor_filter=None, max_frames=None):
+    """Run the loop on source with a throwaway calibration; returns (navigator, cursor move log)"""
+    from face_navigator import FaceNavigator
+    with tempfile.TemporaryDirectory() as tmp:
+        # Calibrate from scratch into a temporary profile store, and record nothing
+        config = dict(config, calibration_profiles_file=os.path.join(tmp, "calibration_profiles.json"),
+                      session_recording=False, metrics_port=0)
+        config_file = os.path.join(tmp, "config.json")
+        with open(config_file, 'w') as f:
+            json.dump(config, f)
+
+        cursor = create_cursor_output(config, cursor_backend)
+        cursor.move_log = []
+        navigator = FaceNavigator(config_file=config_file, source=source, cursor=cursor,
+                                  cursor_filter=cursor_filter, recalibrate=True)
+        navigator.run(max_frames=max_frames)
+    return navigator, cursor.move_log
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure glass-to-cursor latency')
+    parser.add_argument('--input', default='synthetic',
+                        help='"synthetic" (default), a camera index, or a recording to replay in real time')
+    parser.add_argument('--duration', type=float, default=20.0, help='Seconds to run')
+    parser.add_argument('--fps', type=float, default=30.0, help='Frame rate of the synthetic face')
+    parser.add_argument('--cursor', choices=CURSOR_BACKENDS, default='null',
+                        help='Cursor output backend to include in the measurement')
+    parser.add_argument('--filter', choices=FILTERS, default=None, help='Face centre filter')
+    parser.add_argument('--config', default='config.json', help='Configuration file path')
+    parser.add_argument('--max-p95-ms', type=float, default=None,
+                        help='Fail if the p95 glass-to-cursor latency exceeds this')
+    parser.add_argument('--max-response-ms', type=float, default=None,
+                        help='Fail if the p95 cursor start latency of the synthetic face exceeds this')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    config = load_config(args.config)
+    if args.input == 'synthetic':
+        source = SyntheticFaceSource(duration=args.duration, fps=args.fps)
+        max_frames = None
+    else:
+        source = open_source(args.input, realtime=True, config=config)
+        max_frames = int(args.duration * config['target_fps'])
+    navigator, moves = run_harness(source, config, args.cursor, args.filter, max_frames)
+
+    histograms = navigator.metrics.histograms
+    glass = histograms['glass_to_cursor']
+    if getattr(source, 'driver_timestamps', False):
+        origin = "driver buffer timestamps"
+    elif source.live:
+        origin = "read time (no driver timestamps)"
+    else:
+        origin = "source pacing time"
+    print(f"Glass-to-cursor latency over {glass.count} cursor moves "
+          f"({args.cursor} backend, capture from {origin}):")
+    if not glass.count:
+        print("  no cursor moves - was a face in view?")
+        return 1
+    print(f"  p50 {glass.percentile(50) * 1000:.1f} ms, p95 {glass.percentile(95) * 1000:.1f} ms, "
+          f"p99 {glass.percentile(99) * 1000:.1f} ms, max {glass.maximum * 1000:.1f} ms")
+    age = histograms['capture_age']
+    print(f"  capture to processing: p50 {age.percentile(50) * 1000:.1f} ms, "
+          f"p95 {age.percentile(95) * 1000:.1f} ms")
+    stages = [f"{stage} {histogram.mean() * 1000:.2f}" for stage, histogram in histograms.items()
+              if histogram.count and stage not in ('sleep', 'frame', 'capture_age', 'glass_to_cursor')]
+    print("  stage means (ms): " + ", ".join(stages))
+
+    failed = False
+    if args.max_p95_ms is not None and glass.percentile(95) * 1000 > args.max_p95_ms:
+        print(f"FAIL: p95 glass-to-cursor latency above {args.max_p95_ms:g} ms")
+        failed = True
+
+    if isinstance(source, SyntheticFaceSource):
+        starts, stops = response_latencies(source.onsets, moves)
+        print(f"Cursor response to {len(starts)} head movements:")
+        print(f"  start: {distribution(starts)}")
+        print(f"  stop:  {distribution(stops)}")
+        starts = np.asarray(starts)
+        if args.max_response_ms is not None and (
+                not len(starts) or np.percentile(starts, 95) * 1000 > args.max_response_ms):
+            print(f"FAIL: p95 cursor start latency above {args.max_response_ms:g} ms")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Per-stage latency metrics for Face Navigator
+Fixed-memory histograms per pipeline stage, a log summary line and a
+Prometheus text endpoint on localhost
+"""
+
+import bisect
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Pipeline stages in the order they run within a frame, then the time from capture (the
+# driver's frame timestamp where there is one) to the loop reading the frame and to the cursor move
+STAGES = ('capture', 'flip', 'grayscale', 'motion_gate', 'detect', 'landmarks', 'shape_to_np',
+          'head_pose', 'cursor', 'blinks', 'sleep', 'frame', 'capture_age', 'glass_to_cursor')
+
+# Log-spaced bucket upper bounds from 1 us to ~17 s (25% apart)
+BUCKET_BOUNDS = tuple(1e-6 * 1.25 ** i for i in range(75))
+
+
+class LatencyHistogram:
+    """Fixed-size latency histogram with approximate percentiles"""
+
+    __slots__ = ('counts', 'count', 'total', 'maximum')
+
+    def __init__(self):
+        # One extra bucket catches anything above the last bound
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def record(self, seconds):
+        """Add one observation"""
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+
+    def percentile(self, q):
+        """Return the upper bound of the bucket holding the q-th percentile (q in 0-100), at most the maximum"""
+        if self.count == 0:
+            return 0.0
+        rank = q / 100.0 * self.count
+        cumulative = 0
+        for i, n in enumerate(self.counts):
+            cumulative += n
+            if cumulative >= rank and n:
+                return min(BUCKET_BOUNDS[i], self.maximum) if i < len(BUCKET_BOUNDS) else self.maximum
+        return self.maximum
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+
+class PipelineMetrics:
+    """Latency histograms for every pipeline stage plus frame rate and gauges"""
+
+    def __init__(self, stages=STAGES):
+        self.histograms = {stage: LatencyHistogram() for stage in stages}
+        self.gauges = {}
+        self.frames = 0
+        self.start_time = time.monotonic()
+
+        # Frame count at the previous summary, for the windowed FPS
+        self._window_start = self.start_time
+        self._window_frames = 0
+
+    def record(self, stage, seconds):
+        """Record the duration of one stage"""
+        self.histograms[stage].record(seconds)
+
+    def lap(self, stage, start):
+        """Record the time since start for a stage and return the current time"""
+        now = time.perf_counter()
+        self.histograms[stage].record(now - start)
+        return now
+
+    def frame_done(self, start):
+        """Record the total time of one frame"""
+        self.histograms['frame'].record(time.perf_counter() - start)
+        self.frames += 1
+
+    def add_gauge(self, name, read, help_text=""):
+        """Expose read() as a gauge in the metrics endpoint"""
+        self.gauges[name] = (read, help_text)
+
+    def fps(self):
+        """Average frames per second since startup"""
+        elapsed = time.monotonic() - self.start_time
+        return self.frames / elapsed if elapsed > 0 else 0.0
+
+    def summary_line(self):
+        """One-line p50/p95 summary of every stage, plus FPS since the previous summary"""
+        now = time.monotonic()
+        elapsed = now - self._window_start
+        fps = (self.frames - self._window_frames) / elapsed if elapsed > 0 else 0.0
+        self._window_start = now
+        self._window_frames = self.frames
+
+        parts = [f"FPS {fps:.1f}"]
+        for stage, histogram in self.histograms.items():
+            if histogram.count:
+                parts.append(f"{stage} {histogram.percentile(50) * 1000:.2f}/"
+                             f"{histogram.percentile(95) * 1000:.2f} ms")
+        return "Latency p50/p95: " + " | ".join(parts)
+
+    def prometheus_text(self):
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = [
+            "# HELP face_navigator_stage_latency_seconds Latency of each pipeline stage",
+            "# TYPE face_navigator_stage_latency_seconds summary"
+        ]
+        for stage, histogram in self.histograms.items():
+            for q in (50, 95, 99):
+                lines.append(f'face_navigator_stage_latency_seconds{{stage="{stage}",quantile="{q / 100}"}} '
+                             f'{histogram.percentile(q):.9f}')
+            lines.append(f'face_navigator_stage_latency_seconds_sum{{stage="{stage}"}} {histogram.total:.9f}')
+            lines.append(f'face_navigator_stage_latency_seconds_count{{stage="{stage}"}} {histogram.count}')
+
+        lines += [
+            "# HELP face_navigator_fps Average processed frames per second since startup",
+            "# TYPE face_navigator_fps gauge",
+            f"face_navigator_fps {self.fps():.3f}",
+            "# HELP face_navigator_frames_total Processed frames",
+            "# TYPE face_navigator_frames_total counter",
+            f"face_navigator_frames_total {self.frames}"
+        ]
+
+        for name, (read, help_text) in self.gauges.items():
+            lines.append(f"# HELP face_navigator_{name} {help_text or name}")
+            lines.append(f"# TYPE face_navigator_{name} gauge")
+            lines.append(f"face_navigator_{name} {read()}")
+
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Serve PipelineMetrics as Prometheus text on http://127.0.0.1:<port>/metrics"""
+
+    def __init__(self, metrics, port, host="127.0.0.1"):
+        self.metrics = metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(handler):
+                if handler.path not in ('/', '/metrics'):
+                    handler.send_error(404)
+                    return
+                body = metrics.prometheus_text().encode('utf-8')
+                handler.send_response(200)
+                handler.send_header('Content-Type', 'text/plain; version=0.0.4')
+                handler.send_header('Content-Length', str(len(body)))
+                handler.end_headers()
+                handler.wfile.write(body)
+
+            def log_message(handler, format, *args):
+                # Keep scrapes out of the application log
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, name="metrics-server", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
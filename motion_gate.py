@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Motion gating for Face Navigator
+Compares small downscaled copies of consecutive frames so face detection
+only runs when something in view moves or a face was seen recently. While
+the scene stays static, detection is retried on a back-off schedule so a
+user who sits down very still is still found.
+"""
+
+from collections import deque
+
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """Decide per frame whether face detection needs to run
+
+    A frame is compared with the previous one at size (width, height): it
+    counts as motion when more than min_area of the pixels changed by more
+    than threshold gray levels. Detection runs on motion, for face_hold
+    seconds after a face was last found, and otherwise once every recheck
+    interval, which doubles from recheck_min up to recheck_max seconds
+    while nothing changes. Costs a resize and a difference of a few
+    thousand pixels per frame.
+    """
+
+    def __init__(self, size=(80, 60), threshold=12, min_area=0.01, face_hold=2.0, recheck_min=0.5,
+                 recheck_max=4.0):
+        self.size = tuple(size)
+        self.threshold = threshold
+        self.min_area = min_area
+        self.face_hold = face_hold
+        self.recheck_min = recheck_min
+        self.recheck_max = recheck_max
+
+        # Two small frames, swapped each update, the difference between them, and an
+        # intermediate at twice the size: a bilinear shrink to it and an exact 2x2 area
+        # average from it is several times cheaper than INTER_AREA in one step
+        self.intermediate = np.zeros((self.size[1] * 2, self.size[0] * 2), dtype=np.uint8)
+        self.small = np.zeros(self.size[::-1], dtype=np.uint8)
+        self.previous = np.zeros(self.size[::-1], dtype=np.uint8)
+        self.difference = np.zeros(self.size[::-1], dtype=np.uint8)
+        self.have_previous = False
+
+        self.last_face_time = None
+        self.recheck_interval = recheck_min
+        self.next_recheck = None
+        self.asleep = False
+        self.wake_time = None
+
+        # Counters
+        self.frames = 0
+        self.gated_frames = 0
+        self.motion_frames = 0
+        self.rechecks = 0
+        self.wake_latencies = deque(maxlen=100)
+
+    def motion(self, gray):
+        """Return True if gray differs from the previous frame passed in"""
+        cv2.resize(gray, self.intermediate.shape[::-1], dst=self.intermediate, interpolation=cv2.INTER_LINEAR)
+        cv2.resize(self.intermediate, self.size, dst=self.small, interpolation=cv2.INTER_AREA)
+        moved = True
+        if self.have_previous:
+            cv2.absdiff(self.small, self.previous, dst=self.difference)
+            changed = cv2.countNonZero(cv2.threshold(self.difference, self.threshold, 255, cv2.THRESH_BINARY,
+                                                     dst=self.difference)[1])
+            moved = changed > self.min_area * self.difference.size
+        self.small, self.previous = self.previous, self.small
+        self.have_previous = True
+        return moved
+
+    def should_detect(self, gray, timestamp):
+        """Return True if face detection should run on this frame"""
+        self.frames += 1
+        moved = self.motion(gray)
+        if moved:
+            self.motion_frames += 1
+
+        if self.last_face_time is not None and timestamp - self.last_face_time < self.face_hold:
+            return True
+        if moved:
+            if self.asleep:
+                # Something arrived: time how long it takes to find a face from here
+                self.asleep = False
+                self.wake_time = timestamp
+            self.recheck_interval = self.recheck_min
+            self.next_recheck = timestamp + self.recheck_interval
+            return True
+
+        if self.next_recheck is None:
+            self.next_recheck = timestamp + self.recheck_interval
+        if timestamp >= self.next_recheck:
+            # Static scene: look again now and then, less often the longer nothing changes
+            self.rechecks += 1
+            self.recheck_interval = min(self.recheck_interval * 2, self.recheck_max)
+            self.next_recheck = timestamp + self.recheck_interval
+            return True
+
+        self.asleep = True
+        self.wake_time = None
+        self.gated_frames += 1
+        return False
+
+    def face_found(self, timestamp):
+        """Record that detection found a face at timestamp"""
+        if self.wake_time is not None:
+            self.wake_latencies.append(timestamp - self.wake_time)
+            self.wake_time = None
+        self.last_face_time = timestamp
+        self.asleep = False
+        self.recheck_interval = self.recheck_min
+        self.next_recheck = None
+
+    def stats(self):
+        latencies = sorted(self.wake_latencies)
+        return {
+            "frames": self.frames,
+            "gated": self.gated_frames,
+            "motion": self.motion_frames,
+            "rechecks": self.rechecks,
+            "wakeups": len(latencies),
+            "wake_ms": latencies[len(latencies) // 2] * 1000 if latencies else 0.0
+        }
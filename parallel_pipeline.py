@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Multi-process detection pipeline for Face Navigator
+Frames are read straight into a shared-memory ring buffer, worker processes
+run detection and landmark prediction on alternating frames, and a reorder
+stage hands the results back strictly in capture order. The pipeline is a
+landmark frame source, so the processing loop consumes it like a replayed
+landmark trace.
+"""
+
+import multiprocessing
+import queue
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from metrics import LatencyHistogram
+
+
+class SharedFrameRing:
+    """Fixed-size frames in one shared-memory block, addressed by slot"""
+
+    def __init__(self, slots, shape, dtype=np.uint8, name=None):
+        self.slots = slots
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        frame_bytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        self.owner = name is None
+        if self.owner:
+            self.memory = shared_memory.SharedMemory(create=True, size=slots * frame_bytes)
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+        self.frames = np.ndarray((slots,) + self.shape, dtype=self.dtype, buffer=self.memory.buf)
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    def slot(self, index):
+        return self.frames[index]
+
+    def close(self):
+        """Detach from the block; the creating process also frees it"""
+        self.frames = None
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+
+class ReorderBuffer:
+    """Release out-of-order results by sequence number, strictly in order"""
+
+    def __init__(self, first=0):
+        self.next = first
+        self.pending = {}
+        self.max_pending = 0
+
+    def push(self, sequence, item):
+        self.pending[sequence] = item
+        self.max_pending = max(self.max_pending, len(self.pending))
+
+    def pop(self):
+        """Return the next result in order, or None if it has not arrived yet"""
+        if self.next not in self.pending:
+            return None
+        item = self.pending.pop(self.next)
+        self.next += 1
+        return item
+
+
+class LandmarkAnalyzer:
+    """Detection and landmark prediction for one worker process
+
+    Built in the parent and pickled to the worker; the models are loaded by
+    setup() in the worker itself. Landmarks are mirrored to match the
+    flipped frames of the single-process path.
+    """
+
+    def __init__(self, config, predictor_path):
+        self.config = config
+        self.predictor_path = predictor_path
+
+    def setup(self):
+        import dlib
+        from detectors import create_detector
+        from face_tracking import FaceTracker
+        from frame_buffers import FrameBuffers
+
+        self.detector = create_detector(self.config)
+        self.tracker = None
+        if self.config['face_tracking']:
+            self.tracker = FaceTracker(self.detector,
+                                       detection_interval=self.config['detection_interval'],
+                                       min_confidence=self.config['tracker_min_confidence'])
+        self.predictor = dlib.shape_predictor(self.predictor_path)
+        self.buffers = FrameBuffers()
+
+    def reset(self):
+        """Forget the tracked face, e.g. before frames that do not follow on from the last ones"""
+        if self.tracker is not None:
+            self.tracker.reset()
+
+    def __call__(self, frame):
+        """Return (landmarks, (left, top, right, bottom)) in mirrored coordinates, or (None, None)"""
+        gray = self.buffers.to_gray(frame)
+        if self.tracker is not None:
+            face = self.tracker.locate(gray)
+        else:
+            faces = self.detector(gray)
+            face = faces[0] if len(faces) > 0 else None
+        if face is None:
+            return None, None
+
+        width = gray.shape[1]
+        landmarks = self.buffers.landmarks_from_shape(self.predictor(gray, face), mirror_width=width)
+        # Copy: the queue pickles results on a feeder thread, after the buffer is reused
+        return landmarks.copy(), (width - 1 - face.right(), face.top(), width - 1 - face.left(), face.bottom())
+
+
+def _worker_main(ring_name, slots, shape, dtype, tasks, results, analyzer):
+    """Worker process: analyse the ring slots named in tasks until told to stop"""
+    ring = SharedFrameRing(slots, shape, dtype, name=ring_name)
+    try:
+        analyzer.setup()
+        results.put(('ready', None, None, None))
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            sequence, slot = task
+            start = time.perf_counter()
+            landmarks, rect = analyzer(ring.slot(slot))
+            results.put((sequence, landmarks, rect, time.perf_counter() - start))
+    except Exception as e:
+        results.put(('error', repr(e), None, None))
+    finally:
+        ring.close()
+
+
+class ParallelLandmarkPipeline:
+    """Landmark frame source that spreads frame analysis over worker processes
+
+    Frame n goes to worker n % workers. Up to in_flight frames are being
+    analysed at once (default: one per worker); more raises throughput on
+    recorded input at the cost of latency.
+    """
+
+    live = False
+    provides_landmarks = True
+
+    def __init__(self, source, analyzer, workers=2, in_flight=None, result_timeout=10.0):
+        self.source = source
+        self.analyzer = analyzer
+        self.workers = workers
+        self.in_flight = in_flight or workers
+        self.result_timeout = result_timeout
+
+        # Mirror the wrapped frame source
+        self.live = getattr(source, 'live', False)
+        self.realtime = getattr(source, 'realtime', False)
+        self.device = getattr(source, 'device', None)
+        self.frame_timestamp = 0.0
+        self.capture_timestamp = 0.0
+
+        self._context = multiprocessing.get_context('spawn')
+        self._ring = None
+        self._processes = []
+        self._tasks = []
+        self._results = None
+        self._reorder = ReorderBuffer()
+        self._free_slots = []
+        self._pending = {}  # sequence -> (slot, timestamp, capture timestamp, dispatch time)
+        self._next_sequence = 0
+        self._ended = False
+        self._first_frame = None
+
+        # Counters
+        self.frames_dispatched = 0
+        self.frames_delivered = 0
+        self.frames_copied = 0
+        # Dispatch-to-delivery time and the worker's own analysis time per frame
+        self.latency = LatencyHistogram()
+        self.worker_time = LatencyHistogram()
+
+    def start(self):
+        """Read the first frame to size the ring buffer, then start the workers"""
+        ret, frame = self.source.read()
+        if not ret:
+            self._ended = True
+            return self
+        self._first_frame = (frame, self.source.frame_timestamp,
+                             getattr(self.source, 'capture_timestamp', self.source.frame_timestamp))
+
+        self._ring = SharedFrameRing(self.in_flight, frame.shape, frame.dtype)
+        self._free_slots = list(range(self.in_flight))
+        self._results = self._context.Queue()
+        for i in range(self.workers):
+            tasks = self._context.Queue()
+            process = self._context.Process(
+                target=_worker_main, name=f"landmark-worker-{i}", daemon=True,
+                args=(self._ring.name, self.in_flight, frame.shape, frame.dtype.str, tasks, self._results,
+                      self.analyzer))
+            process.start()
+            self._tasks.append(tasks)
+            self._processes.append(process)
+
+        # Wait for every worker to load its models so startup cost is not counted as latency
+        ready = 0
+        while ready < self.workers:
+            if self._get_result()[0] == 'ready':
+                ready += 1
+        return self
+
+    def _get_result(self):
+        try:
+            result = self._results.get(timeout=self.result_timeout)
+        except queue.Empty:
+            dead = [p.name for p in self._processes if not p.is_alive()]
+            raise RuntimeError(f"No result from landmark workers in {self.result_timeout:.0f}s"
+                               + (f" ({', '.join(dead)} exited)" if dead else ""))
+        if result[0] == 'error':
+            raise RuntimeError(f"Landmark worker failed: {result[1]}")
+        return result
+
+    def _dispatch(self):
+        """Read the next frame into a free slot and hand it to its worker; False at end of input"""
+        slot = self._free_slots.pop()
+        target = self._ring.slot(slot)
+        if self._first_frame is not None:
+            frame, timestamp, captured = self._first_frame
+            self._first_frame = None
+            ret = True
+        else:
+            ret, frame = self.source.read(target)
+            timestamp = self.source.frame_timestamp
+            captured = getattr(self.source, 'capture_timestamp', timestamp)
+        if not ret:
+            self._free_slots.append(slot)
+            self._ended = True
+            return False
+
+        # Sources that decode into the buffer they are given need no copy
+        if frame is not target:
+            if frame.shape != target.shape:
+                raise ValueError(f"Frame size changed from {target.shape} to {frame.shape}")
+            np.copyto(target, frame)
+            self.frames_copied += 1
+
+        sequence = self._next_sequence
+        self._next_sequence += 1
+        self._pending[sequence] = (slot, timestamp, captured, time.perf_counter())
+        self._tasks[sequence % self.workers].put((sequence, slot))
+        self.frames_dispatched += 1
+        return True
+
+    def read(self, image=None):
+        """Return (ret, (landmarks, rect)) for the next frame in capture order
+
+        rect is (left, top, right, bottom) in mirrored coordinates, like the
+        rectangle the single-process path reports with mirrored landmarks.
+        """
+        while not self._ended and len(self._pending) < self.in_flight:
+            self._dispatch()
+        if not self._pending:
+            return False, None
+
+        item = self._reorder.pop()
+        while item is None:
+            sequence, landmarks, rect, worker_time = self._get_result()
+            self._reorder.push(sequence, (sequence, landmarks, rect, worker_time))
+            item = self._reorder.pop()
+
+        sequence, landmarks, rect, worker_time = item
+        slot, self.frame_timestamp, self.capture_timestamp, dispatched = self._pending.pop(sequence)
+        self._free_slots.append(slot)
+        self.frames_delivered += 1
+        self.latency.record(time.perf_counter() - dispatched)
+        self.worker_time.record(worker_time)
+
+        if landmarks is None:
+            return True, (None, None)
+        return True, (landmarks, rect)
+
+    def stats(self):
+        return {
+            "dispatched": self.frames_dispatched,
+            "delivered": self.frames_delivered,
+            "copied": self.frames_copied,
+            "max_reordered": self._reorder.max_pending
+        }
+
+    def release(self):
+        """Stop the workers and free the shared ring buffer"""
+        for tasks in self._tasks:
+            tasks.put(None)
+        for process in self._processes:
+            process.join(timeout=2.0)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+        if self._ring is not None:
+            self._ring.close()
+            self._ring = None
+        self.source.release()
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Field profiling for Face Navigator
+Profiles the processing loop for a number of frames or seconds, either by
+sampling the main thread's stack from a background thread or with cProfile,
+and optionally takes tracemalloc snapshots at intervals to catch leaks. The
+report ranks the hot functions of every frame stage, with the stage of each
+sample taken from the pipeline metrics laps around it.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict, deque
+
+PROFILE_MODES = ('sample', 'cprofile')
+
+
+class LoopProfiler:
+    """Profile the loop of a FaceNavigator until a frame or time limit
+
+    In 'sample' mode a thread records the main thread's stack every
+    interval seconds; each sample is weighted by the time since the
+    previous one and assigned to the stage whose metrics lap ends next.
+    The interval doubles whenever sampling costs more than max_overhead of
+    the elapsed time. 'cprofile' traces every call of the main thread
+    instead: exact call counts, at several times the cost. With
+    memory_interval > 0, tracemalloc keeps one frame per allocation and
+    another thread compares a snapshot with the previous one every
+    memory_interval seconds.
+    """
+
+    def __init__(self, metrics, mode='sample', frames=None, seconds=30.0, interval=0.005, max_overhead=0.02,
+                 memory_interval=10.0, directory="profiles", top=15, logger=None):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode {mode!r}, expected one of {PROFILE_MODES}")
+        self.metrics = metrics
+        self.mode = mode
+        self.frames = frames
+        self.seconds = seconds
+        self.interval = interval
+        self.max_overhead = max_overhead
+        self.memory_interval = memory_interval
+        self.directory = directory
+        self.top = top
+        self.logger = logger
+
+        self.active = False
+        self.report_path = None
+        self._frame_count = 0
+        self._start_time = None
+        self._stage_totals = None
+
+        # Sampling: samples waiting for the next lap, and time per stage, line and function
+        self._pending = deque()
+        self._thread = None
+        self._memory_thread = None
+        self._main_thread = None
+        self._loop_code = None
+        self._stop = threading.Event()
+        self._stage_time = defaultdict(float)
+        self._line_time = defaultdict(float)
+        self._function_time = defaultdict(float)
+        self.samples = 0
+        self.sampling_cost = 0.0
+
+        self._profile = None
+        self._switch_interval = None
+
+        # Memory: growth per source line over the snapshot intervals
+        self._snapshot = None
+        self._first_snapshot = None
+        self._growth = defaultdict(lambda: [0, 0])     # line -> [intervals grown, bytes]
+        self.snapshots = 0
+        self.snapshot_cost = 0.0
+
+    def start(self):
+        """Start profiling; call from the thread that runs the loop"""
+        self.active = True
+        self._frame_count = 0
+        self._start_time = time.perf_counter()
+        self._stage_totals = self._metrics_totals()
+        self._stop.clear()
+
+        if self.memory_interval > 0:
+            tracemalloc.start(1)
+            self._take_snapshot()
+            self._memory_thread = threading.Thread(target=self._memory_watcher, name="profile-memory",
+                                                   daemon=True)
+            self._memory_thread.start()
+
+        if self.mode == 'cprofile':
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            # Shadow the laps on this metrics instance only: every sample taken since the
+            # last lap belongs to the stage the next lap records
+            self.metrics.lap = self._lap
+            self.metrics.frame_done = self._frame_done
+            self._main_thread = threading.get_ident()
+            # Stacks are cut at the function that runs the loop
+            self._loop_code = sys._getframe(1).f_code
+            # Python code holds the interpreter for up to the switch interval (5 ms) before the
+            # sampler gets a turn, which would move samples onto whatever runs next
+            self._switch_interval = sys.getswitchinterval()
+            sys.setswitchinterval(min(self._switch_interval, 0.0005))
+            self._thread = threading.Thread(target=self._sampler, name="profile-sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def frame_done(self):
+        """Count a frame; returns True once the frame or time limit is reached"""
+        if not self.active:
+            return False
+        self._frame_count += 1
+        now = time.perf_counter()
+        if self.frames and self._frame_count >= self.frames:
+            return True
+        return bool(self.seconds) and now - self._start_time >= self.seconds
+
+    def stop(self):
+        """Stop profiling and write the report; returns its path"""
+        if not self.active:
+            return self.report_path
+        self.active = False
+        elapsed = time.perf_counter() - self._start_time
+
+        self._stop.set()
+        if self._profile is not None:
+            self._profile.disable()
+        if self._memory_thread is not None:
+            self._memory_thread.join()
+        if self._thread is not None:
+            self._thread.join()
+            sys.setswitchinterval(self._switch_interval)
+            self._assign('other')
+            del self.metrics.lap
+            del self.metrics.frame_done
+        if self._snapshot is not None:
+            self._take_snapshot()
+
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, f"profile-{time.strftime('%Y%m%d-%H%M%S')}")
+        self.report_path = base + ".txt"
+        if self._profile is not None:
+            self._profile.dump_stats(base + ".prof")
+        with open(self.report_path, 'w') as f:
+            f.write(self.report(elapsed))
+
+        if self._snapshot is not None:
+            tracemalloc.stop()
+            self._snapshot = self._first_snapshot = None
+        if self.logger:
+            self.logger.info(f"Profile of {self._frame_count} frames written to {self.report_path}")
+        return self.report_path
+
+    # Sampling
+
+    def _sampler(self):
+        last = window_start = time.perf_counter()
+        window_cost = 0.0
+        main = self._main_thread
+        while not self._stop.wait(self.interval):
+            # The cost is this thread's CPU time, not time spent waiting for the interpreter
+            began = time.thread_time()
+            now = time.perf_counter()
+            frame = sys._current_frames().get(main)
+            if frame is not None:
+                # Weight by the time since the last sample, so a long call that held the
+                # interpreter counts in full
+                self._pending.append((self._stack(frame, self._loop_code), now - last))
+                self.samples += 1
+            last = now
+            cost = time.thread_time() - began
+            self.sampling_cost += cost
+            window_cost += cost
+            if now - window_start >= 1.0:
+                # Back off for the next second if this one cost too much
+                if window_cost > self.max_overhead * (now - window_start) and self.interval < 0.1:
+                    self.interval *= 2
+                window_start, window_cost = now, 0.0
+
+    @staticmethod
+    def _stack(frame, loop_code, depth=64):
+        """(file, line, function) of the innermost frame, then every function on the stack below the loop"""
+        code = frame.f_code
+        top = (os.path.basename(code.co_filename), frame.f_lineno, code.co_name)
+        functions = []
+        while frame is not None and len(functions) < depth:
+            code = frame.f_code
+            if code is loop_code:
+                break
+            functions.append((os.path.basename(code.co_filename), code.co_firstlineno, code.co_name))
+            frame = frame.f_back
+        return top, functions
+
+    def _assign(self, stage):
+        pending = self._pending
+        while pending:
+            (top, functions), weight = pending.popleft()
+            self._stage_time[stage] += weight
+            self._line_time[stage, top] += weight
+            for function in set(functions):
+                self._function_time[stage, function] += weight
+
+    def _lap(self, stage, start):
+        self._assign(stage)
+        return type(self.metrics).lap(self.metrics, stage, start)
+
+    def _frame_done(self, start):
+        # Between the last lap and the end of the frame: recording, stats logging
+        self._assign('other')
+        return type(self.metrics).frame_done(self.metrics, start)
+
+    # Memory
+
+    def _memory_watcher(self):
+        while not self._stop.wait(self.memory_interval):
+            self._take_snapshot()
+
+    def _take_snapshot(self):
+        # Only taking the snapshot holds the interpreter for long; the comparison in
+        # Python lets the loop run in between
+        began = time.perf_counter()
+        snapshot = tracemalloc.take_snapshot()
+        if self._first_snapshot is None:
+            self._first_snapshot = snapshot
+        else:
+            for stat in self._growth_stats(snapshot, self._snapshot)[:50]:
+                if stat.size_diff > 0:
+                    growth = self._growth[str(stat.traceback[0])]
+                    growth[0] += 1
+                    growth[1] += stat.size_diff
+        self._snapshot = snapshot
+        self.snapshots += 1
+        self.snapshot_cost += time.perf_counter() - began
+
+    @staticmethod
+    def _growth_stats(snapshot, previous):
+        """Per-line differences, leaving out the snapshots' own allocations"""
+        own = (tracemalloc.__file__, __file__)
+        return [stat for stat in snapshot.compare_to(previous, 'lineno')
+                if stat.traceback[0].filename not in own]
+
+    # Report
+
+    def _metrics_totals(self):
+        return {stage: (histogram.total, histogram.count) for stage, histogram in self.metrics.histograms.items()}
+
+    def report(self, elapsed):
+        """Render the profile as text"""
+        lines = [f"Face Navigator profile: {self.mode}, {self._frame_count} frames in {elapsed:.1f}s "
+                 f"({self._frame_count / elapsed if elapsed > 0 else 0.0:.1f} FPS)", ""]
+
+        # Wall time per stage over the window, from the pipeline metrics
+        lines.append(f"{'stage':<12} {'frames':>7} {'mean ms':>8} {'share':>6}")
+        totals = self._metrics_totals()
+        frame_total = totals['frame'][0] - self._stage_totals['frame'][0]
+        for stage, (total, count) in totals.items():
+            total -= self._stage_totals[stage][0]
+            count -= self._stage_totals[stage][1]
+            if count and stage != 'frame':
+                share = total / frame_total * 100 if frame_total > 0 else 0.0
+                lines.append(f"{stage:<12} {count:>7} {total / count * 1000:8.3f} {share:5.1f}%")
+        lines.append("")
+
+        if self.mode == 'sample':
+            lines += self._sample_report(elapsed)
+        else:
+            stream = io.StringIO()
+            stats = pstats.Stats(self._profile, stream=stream)
+            stats.sort_stats('tottime').print_stats(self.top)
+            stats.sort_stats('cumulative').print_stats(self.top)
+            lines.append(stream.getvalue())
+
+        if self.snapshots:
+            lines += self._memory_report()
+        return "\n".join(lines) + "\n"
+
+    def _sample_report(self, elapsed):
+        total = sum(self._stage_time.values())
+        lines = [f"{self.samples} samples, final interval {self.interval * 1000:.1f} ms, "
+                 f"sampling overhead {self.sampling_cost / elapsed * 100 if elapsed > 0 else 0.0:.2f}%", ""]
+        for stage, stage_time in sorted(self._stage_time.items(), key=lambda item: -item[1]):
+            lines.append(f"[{stage}] {stage_time:.2f}s, {stage_time / total * 100:.1f}% of samples")
+            hot = sorted(((t, key[1]) for key, t in self._line_time.items() if key[0] == stage), reverse=True)
+            lines.append(f"  {'self':>6}  line")
+            for t, (filename, line, name) in hot[:self.top]:
+                lines.append(f"  {t / stage_time * 100:5.1f}%  {filename}:{line} {name}")
+            inclusive = sorted(((t, key[1]) for key, t in self._function_time.items() if key[0] == stage),
+                               reverse=True)
+            lines.append(f"  {'total':>6}  function")
+            for t, (filename, line, name) in inclusive[:self.top]:
+                lines.append(f"  {t / stage_time * 100:5.1f}%  {filename}:{line} {name}")
+            lines.append("")
+        return lines
+
+    def _memory_report(self):
+        current, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        lines = [f"Memory: {self.snapshots} snapshots every {self.memory_interval:g}s "
+                 f"({self.snapshot_cost / self.snapshots * 1000:.1f} ms each), traced {current / 1024:.0f} KiB, "
+                 f"peak {peak / 1024:.0f} KiB"]
+        if self._first_snapshot is not None and self._snapshot is not None:
+            lines.append(f"  {'growth':>10}  since start")
+            for stat in self._growth_stats(self._snapshot, self._first_snapshot)[:self.top]:
+                if stat.size_diff > 0:
+                    lines.append(f"  {stat.size_diff / 1024:9.1f}K  {stat.traceback[0]}")
+        intervals = self.snapshots - 1
+        steady = sorted(((grown, size, line) for line, (grown, size) in self._growth.items()
+                         if intervals > 1 and grown == intervals), reverse=True)
+        if steady:
+            lines.append(f"  Grew in every one of the {intervals} intervals (possible leaks):")
+            for _, size, line in steady[:self.top]:
+                lines.append(f"  {size / 1024:9.1f}K  {line}")
+        return lines
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Deadline-based frame scheduler for Face Navigator
+Sleeps only for what is left of each frame's time budget, and drops to a
+low idle rate when no face has been seen for a while
+"""
+
+import time
+
+
+class FrameScheduler:
+    """Pace the processing loop to a target frame rate with an idle mode"""
+
+    def __init__(self, target_fps=30.0, idle_fps=5.0, idle_after=5.0):
+        self.target_fps = target_fps
+        self.idle_fps = idle_fps
+        self.idle_after = idle_after
+
+        self.idle = False
+        self.last_face_time = time.monotonic()
+        self.next_deadline = None
+
+        # Counters
+        self.frames = 0
+        self.overruns = 0
+        self.idle_transitions = 0
+        self.active_transitions = 0
+        self._window_start = time.monotonic()
+        self._window_frames = 0
+
+    def frame_interval(self):
+        """Seconds per frame at the current rate (0 means unthrottled)"""
+        fps = self.idle_fps if self.idle else self.target_fps
+        return 1.0 / fps if fps > 0 else 0.0
+
+    def update(self, face_present):
+        """Switch between active and idle mode from this frame's detection result"""
+        now = time.monotonic()
+        if face_present:
+            self.last_face_time = now
+            if self.idle:
+                # Jump straight back to the full rate without waiting out the idle frame
+                self.idle = False
+                self.active_transitions += 1
+                self.next_deadline = now
+        elif not self.idle and now - self.last_face_time >= self.idle_after:
+            self.idle = True
+            self.idle_transitions += 1
+
+    def wait(self):
+        """Sleep until the current frame's deadline and schedule the next one"""
+        self.frames += 1
+        interval = self.frame_interval()
+        if interval <= 0:
+            return
+
+        now = time.monotonic()
+        if self.next_deadline is None:
+            self.next_deadline = now
+        self.next_deadline += interval
+
+        delay = self.next_deadline - now
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            # Over budget: don't try to catch up with a burst of frames
+            self.overruns += 1
+            self.next_deadline = now
+
+    def stats(self):
+        """Return achieved FPS since the previous call plus mode counters"""
+        now = time.monotonic()
+        elapsed = now - self._window_start
+        fps = (self.frames - self._window_frames) / elapsed if elapsed > 0 else 0.0
+        self._window_start = now
+        self._window_frames = self.frames
+        return {
+            "fps": fps,
+            "mode": "idle" if self.idle else "active",
+            "overruns": self.overruns,
+            "idle_transitions": self.idle_transitions,
+            "active_transitions": self.active_transitions
+        }
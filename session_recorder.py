@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Session recording for Face Navigator
+Appends one fixed-size record per frame (timestamp, face rectangle, 68
+landmarks, eye aspect ratios, cursor position and clicks) to memory-mapped
+.npy segments. The processing loop only fills a slot in a preallocated
+staging ring; a writer thread copies the slots into the current segment
+and starts a new segment when it is full. Segments load back with
+load_session() as zero-copy structured arrays.
+"""
+
+import os
+import threading
+import time
+
+import numpy as np
+from numpy.lib import format as npy_format
+
+# Click bits in the 'clicks' field
+CLICK_LEFT = 1
+CLICK_RIGHT = 2
+
+RECORD_DTYPE = np.dtype([
+    ('frame', '<i8'),                   # 1-based frame number; 0 marks a slot never written
+    ('timestamp', '<f8'),               # frame timestamp (s)
+    ('found', '?'),                     # a face with landmarks was processed
+    ('moved', '?'),                     # the cursor was moved
+    ('clicks', 'u1'),                   # CLICK_LEFT | CLICK_RIGHT
+    ('rect', '<i4', (4,)),              # left, top, right, bottom (-1 without a face)
+    ('landmarks', '<i2', (68, 2)),
+    ('ear', '<f4', (2,)),               # left, right eye aspect ratio
+    ('cursor', '<f4', (2,)),            # cursor position after the frame
+])
+
+
+def load_session(path):
+    """Return the records of a session segment as a read-only memory-mapped array
+
+    A segment that was not closed cleanly still has its unwritten slots at the
+    end; they are cut off with a view, so nothing is copied.
+    """
+    records = np.load(path, mmap_mode='r')
+    if records.dtype != RECORD_DTYPE:
+        raise ValueError(f"{path} is not a session recording")
+    if len(records) and records['frame'][-1] == 0:
+        written = np.flatnonzero(records['frame'])
+        records = records[:written[-1] + 1 if len(written) else 0]
+    return records
+
+
+class SessionRecorder:
+    """Record frames into rolling memory-mapped segments from a background writer thread
+
+    record() never blocks: it fills the next slot of a staging ring of
+    buffer_size records and returns. If the writer falls that far behind,
+    frames are dropped and counted instead. Each segment holds
+    segment_frames records.
+    """
+
+    def __init__(self, directory, prefix="session", segment_frames=108000, buffer_size=256, batch=32):
+        self.directory = directory
+        self.prefix = prefix
+        self.segment_frames = segment_frames
+        self.batch = batch
+
+        # Staging ring and a view per field, so record() is a handful of slot writes
+        self._stage = np.zeros(buffer_size, dtype=RECORD_DTYPE)
+        self._fields = {name: self._stage[name] for name in RECORD_DTYPE.names}
+        self._head = 0      # slots filled by record()
+        self._tail = 0      # slots copied by the writer
+
+        self._wake = threading.Event()
+        self._thread = None
+        self._running = False
+        self._started = time.strftime('%Y%m%d-%H%M%S')
+
+        # Current segment
+        self._segment = None
+        self._segment_path = None
+        self._segment_count = 0
+
+        # Counters
+        self.frames = 0
+        self.dropped = 0
+        self.written = 0
+        self.paths = []
+
+    def start(self):
+        """Start the writer thread"""
+        if self._running:
+            return self
+        os.makedirs(self.directory, exist_ok=True)
+        self._running = True
+        self._thread = threading.Thread(target=self._writer, name="session-writer", daemon=True)
+        self._thread.start()
+        return self
+
+    def record(self, timestamp, landmarks=None, rect=None, ear=(0.0, 0.0), cursor=(0.0, 0.0), moved=False,
+               clicks=0):
+        """Stage one frame's record; returns False if it had to be dropped"""
+        self.frames += 1
+        if self._head - self._tail >= len(self._stage):
+            self.dropped += 1
+            return False
+
+        i = self._head % len(self._stage)
+        fields = self._fields
+        fields['frame'][i] = self.frames
+        fields['timestamp'][i] = timestamp
+        fields['found'][i] = landmarks is not None
+        fields['moved'][i] = moved
+        fields['clicks'][i] = clicks
+        if landmarks is not None:
+            fields['landmarks'][i] = landmarks
+            fields['ear'][i] = ear
+        else:
+            fields['landmarks'][i] = 0
+            fields['ear'][i] = 0.0
+        if rect is not None:
+            fields['rect'][i] = rect
+        else:
+            fields['rect'][i] = -1
+        fields['cursor'][i] = cursor
+
+        self._head += 1
+        if self._head - self._tail >= self.batch:
+            self._wake.set()
+        return True
+
+    def _writer(self):
+        """Copy staged records into the segments until stopped, then drain"""
+        while self._running:
+            self._wake.wait(0.5)
+            self._wake.clear()
+            self._drain()
+        self._drain()
+        self._close_segment()
+
+    def _drain(self):
+        head = self._head
+        size = len(self._stage)
+        while self._tail < head:
+            if self._segment is None or self._segment_count >= self.segment_frames:
+                self._open_segment()
+
+            # Contiguous run: up to the end of the ring, of the pending slots and of the segment
+            start = self._tail % size
+            count = min(head - self._tail, size - start, self.segment_frames - self._segment_count)
+            self._segment[self._segment_count:self._segment_count + count] = self._stage[start:start + count]
+            self._segment_count += count
+            self._tail += count
+            self.written += count
+
+    def _open_segment(self):
+        self._close_segment()
+        self._segment_path = os.path.join(self.directory,
+                                          f"{self.prefix}-{self._started}-{len(self.paths):03d}.npy")
+        self._segment = npy_format.open_memmap(self._segment_path, mode='w+', dtype=RECORD_DTYPE,
+                                               shape=(self.segment_frames,))
+        self._segment_count = 0
+        self.paths.append(self._segment_path)
+
+    def _close_segment(self):
+        """Flush the current segment and cut it down to the records written"""
+        if self._segment is None:
+            return
+        segment, self._segment = self._segment, None
+        segment.flush()
+        header_size = segment.offset
+        del segment
+
+        if self._segment_count < self.segment_frames:
+            # The header is padded to a fixed size, so the shorter shape fits in place
+            header = {'descr': npy_format.dtype_to_descr(RECORD_DTYPE), 'fortran_order': False,
+                      'shape': (self._segment_count,)}
+            with open(self._segment_path, 'r+b') as f:
+                npy_format.write_array_header_1_0(f, header)
+                if f.tell() == header_size:
+                    f.truncate(header_size + self._segment_count * RECORD_DTYPE.itemsize)
+                else:
+                    # Should not happen; load_session() still trims the unwritten slots
+                    f.seek(0)
+                    header['shape'] = (self.segment_frames,)
+                    npy_format.write_array_header_1_0(f, header)
+
+    def close(self):
+        """Stop the writer after it has written everything staged"""
+        if not self._running:
+            return
+        self._running = False
+        self._wake.set()
+        self._thread.join()
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "written": self.written,
+            "dropped": self.dropped,
+            "segments": len(self.paths)
+        }
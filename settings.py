@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Configuration defaults for Face Navigator
+Kept free of camera/display imports so tools and benchmarks can share them
+"""
+
+import json
+import os
+
+DEFAULT_CONFIG = {
+    "sensitivity": 2.0,
+    "eye_ar_threshold": 0.25,
+    "blink_min_ms": 100,
+    "blink_max_ms": 1000,
+    "blink_adaptive_threshold": True,
+    "blink_threshold_ratio": 0.75,
+    "blink_cooldown": 0.5,
+    "blink_both_action": "none",
+    "smoothing_factor": 0.7,
+    "movement_threshold": 10,
+    "calibration_region_size": 50,
+    "threaded_capture": True,
+    "stale_frame_ms": 100,
+    "stats_log_interval": 10.0,
+    "face_tracking": True,
+    "detection_interval": 10,
+    "tracker_min_confidence": 7.0,
+    "detector_backend": "dlib_hog",
+    "detection_scale": 0.5,
+    "detection_upsample": 0,
+    "haar_cascade_path": "",
+    "dnn_model_path": "res10_300x300_ssd_iter_140000.caffemodel",
+    "dnn_config_path": "deploy.prototxt",
+    "dnn_confidence": 0.5,
+    "metrics_port": 0,
+    "cursor_backend": "auto",
+    "screen_size": [],
+    "target_fps": 30,
+    "idle_fps": 5,
+    "idle_after": 5.0,
+    "motion_gate": True,
+    "motion_threshold": 12,
+    "motion_min_area": 0.01,
+    "motion_face_hold": 2.0,
+    "motion_recheck_min": 0.5,
+    "motion_recheck_max": 4.0,
+    "cpu_budget": 0.0,
+    "frame_budget_ms": 0.0,
+    "governor_min_fps": 10,
+    "session_recording": False,
+    "session_directory": "sessions",
+    "session_segment_frames": 108000,
+    "profile_frames": 0,
+    "profile_seconds": 30.0,
+    "profile_memory_interval": 10.0,
+    "profile_directory": "profiles",
+    "cursor_source": "centre",
+    "cursor_filter": "exponential",
+    "one_euro_min_cutoff": 1.0,
+    "one_euro_beta": 0.05,
+    "kalman_process_noise": 2000.0,
+    "kalman_measurement_noise": 4.0,
+    "kalman_predict_latency": True,
+    "shape_predictor_url": "http://dlib.net/files/shape_predictor_68_face_landmarks.dat.bz2",
+    "shape_predictor_sha256": "fbdc2cb80eb9aa7a758672cbfdda32ba6300efe9b6e6c7a299ff7e736b11b92f",
+    "allocation_free": False,
+    "camera_probe": True,
+    "camera_grayscale": True,
+    "camera_mode_cache": "camera_modes.json",
+    "pipeline_workers": 0,
+    "landmark_flow": False,
+    "landmark_prediction_interval": 4,
+    "flow_max_error": 1.0,
+    "flow_max_eye_error": 0.5,
+    "calibration_profile": "default",
+    "calibration_profiles_file": "calibration_profiles.json",
+    "drift_correction": True,
+    "drift_time_constant": 30.0,
+    "drift_still_speed": 15.0
+}
+
+
+def load_config(config_file):
+    """Load configuration from JSON file, filling in missing keys from the defaults"""
+    config = dict(DEFAULT_CONFIG)
+    if os.path.exists(config_file):
+        with open(config_file, 'r') as f:
+            config.update(json.load(f))
+    return config
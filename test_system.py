@@ -96,6 +96,1622 @@ def test_face_detection():
         print(f"✗ Face detection test failed: {e}")
         return False
 
+def test_threaded_capture():
+    """Test that a slow consumer always gets the newest frame and the drops are counted"""
+    print("\nTesting threaded capture...")
+    try:
+        import threading
+        import time
+        import numpy as np
+        from capture import ThreadedCapture
+        
+        class FastCamera:
+            """1 kHz camera numbering its frames; clear flowing to hold it after the current frame"""
+            def __init__(self):
+                self.produced = 0
+                self.flowing = threading.Event()
+                self.flowing.set()
+            def read(self, image=None):
+                self.flowing.wait()
+                time.sleep(0.001)
+                self.produced += 1
+                return True, np.full((4, 4), self.produced, dtype=np.int64)
+            def release(self):
+                self.flowing.set()
+        
+        camera = FastCamera()
+        capture = ThreadedCapture(camera, stale_after=0.015).start()
+        rounds = 5
+        for _ in range(rounds):
+            # Let the camera run ahead of the consumer, then hold it so the newest frame is known
+            camera.flowing.set()
+            time.sleep(0.01)
+            camera.flowing.clear()
+            time.sleep(0.03)
+            ret, frame = capture.read(timeout=1.0)
+            if not ret or frame[0, 0] != camera.produced:
+                print(f"✗ Read frame {frame[0, 0] if ret else None}, newest is {camera.produced}")
+                return False
+        
+        # Frames read straight after capture are fresh
+        camera.flowing.set()
+        fresh = [capture.read(timeout=1.0)[0] for _ in range(5)]
+        capture.release()
+        
+        if not all(fresh) or capture.frames_stale != rounds:
+            print(f"✗ {capture.frames_stale} stale frames counted, expected {rounds}")
+            return False
+        # Every frame the consumer skipped was overwritten (the last one may still be pending)
+        skipped = capture.frames_captured - capture.frames_read
+        if capture.frames_dropped < rounds or not skipped - 1 <= capture.frames_dropped <= skipped:
+            print(f"✗ {capture.frames_dropped} frames counted dropped, {skipped} skipped")
+            return False
+        print(f"✓ Newest frame every read: {capture.frames_captured} captured, {capture.frames_read} read, "
+              f"{capture.frames_dropped} dropped, {capture.frames_stale} stale")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Threaded capture test failed: {e}")
+        return False
+
+def test_face_tracker():
+    """Test detect-then-track cadence and the fallback to detection on low confidence"""
+    print("\nTesting detect-then-track...")
+    try:
+        import cv2
+        import dlib
+        import numpy as np
+        from face_tracking import FaceTracker
+        
+        rng = np.random.default_rng(3)
+        scene = cv2.GaussianBlur(rng.integers(0, 255, (240, 320), dtype=np.uint8), (5, 5), 0)
+        other = cv2.GaussianBlur(rng.integers(0, 255, (240, 320), dtype=np.uint8), (5, 5), 0)
+        calls = []
+        def detect(gray):
+            calls.append(len(calls))
+            return [dlib.rectangle(100, 60, 180, 140)]
+        
+        # Matched frames score around 20, unrelated ones around 6
+        tracker = FaceTracker(detect, detection_interval=5, min_confidence=10.0)
+        faces = [tracker.locate(scene) for _ in range(24)]
+        stats = tracker.stats()
+        # Detection on frame 0, then every sixth frame after five tracked ones
+        if len(calls) != 4 or stats['tracked'] != 20 or any(face is None for face in faces):
+            print(f"✗ {len(calls)} detections and {stats['tracked']} tracked frames for 24 frames")
+            return False
+        tracked = faces[1]
+        if abs(tracked.left() - 100) > 2 or abs(tracked.top() - 60) > 2:
+            print(f"✗ Tracked face moved on a static scene: {tracked}")
+            return False
+        print(f"✓ {len(calls)} full detections and {stats['tracked']} tracked frames for 24 frames")
+        
+        # A frame the tracker cannot match falls back to full detection at once
+        tracker.locate(scene)
+        before = len(calls)
+        tracker.locate(other)
+        if len(calls) != before + 1 or tracker.stats()['lost'] != 1:
+            print(f"✗ Low confidence ({tracker.confidence:.1f}) did not trigger a detection")
+            return False
+        print("✓ Low tracking confidence falls back to full detection")
+        
+        # No face: the tracker is dropped and every frame runs detection
+        detect_none = FaceTracker(lambda gray: [], detection_interval=5)
+        if any(detect_none.locate(scene) is not None for _ in range(3)) or detect_none.stats()['detections'] != 3:
+            print("✗ Detection did not run on every frame without a face")
+            return False
+        print("✓ Without a face every frame runs detection")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Face tracker test failed: {e}")
+        return False
+
+def test_detection_scale():
+    """Test that detection on a downscaled frame maps boxes back to full resolution"""
+    print("\nTesting downscaled detection...")
+    try:
+        import numpy as np
+        from detectors import FaceDetector
+        
+        class FixedDetector(FaceDetector):
+            """Finds one face at a fixed place in whatever frame it is given"""
+            def detect_boxes(self, gray):
+                self.seen = gray.shape
+                return [(50, 40, 100, 90)]
+        
+        detector = FixedDetector(scale=0.5)
+        face = detector(np.zeros((480, 640), dtype=np.uint8))[0]
+        if detector.seen != (240, 320) or (face.left(), face.top(), face.right(), face.bottom()) != (100, 80, 200, 180):
+            print(f"✗ Detected on {detector.seen}, mapped to {face}")
+            return False
+        print("✓ Detection runs on the half-size frame and boxes map back to full resolution")
+        
+        # Odd sizes scale x and y separately
+        face = detector(np.zeros((481, 641), dtype=np.uint8))[0]
+        if detector.seen != (240, 320) or (face.left(), face.bottom()) != (100, 180):
+            print(f"✗ Odd frame size mapped to {face}")
+            return False
+        
+        detector.scale = 1.0
+        frame = np.zeros((480, 640), dtype=np.uint8)
+        face = detector(frame)[0]
+        if detector.seen != frame.shape or (face.left(), face.top()) != (50, 40):
+            print("✗ Scale 1.0 did not detect on the full frame")
+            return False
+        print("✓ Full-resolution detection at scale 1.0")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Detection scale test failed: {e}")
+        return False
+
+def test_detector_backends():
+    """Test detector backend selection from the config"""
+    print("\nTesting face detector backends...")
+    try:
+        import cv2
+        import numpy as np
+        from detectors import create_detector, DlibHogDetector, HaarCascadeDetector
+        from settings import DEFAULT_CONFIG
+        
+        config = dict(DEFAULT_CONFIG, detector_backend='dlib_hog', detection_scale=0.75, detection_upsample=1,
+                      dnn_model_path="missing.caffemodel")
+        hog = create_detector(config)
+        if not isinstance(hog, DlibHogDetector) or hog.scale != 0.75 or hog.upsample != 1:
+            print(f"✗ Config selected {type(hog).__name__} at scale {hog.scale}")
+            return False
+        if hog(np.zeros((240, 320), dtype=np.uint8)) != []:
+            print("✗ HOG detector found a face in a blank frame")
+            return False
+        print("✓ Backend selected from the config, with the configured scale")
+        
+        # An explicit scale overrides detection_scale, and the backend argument the config
+        if create_detector(config, scale=1.0).scale != 1.0:
+            print("✗ Scale argument did not override the config")
+            return False
+        if not hasattr(cv2, 'CascadeClassifier'):
+            print("⚠ This OpenCV build has no Haar cascades - skipping the Haar backend")
+        else:
+            haar = create_detector(config, backend='haar', scale=1.0)
+            if not isinstance(haar, HaarCascadeDetector) or haar.scale != 1.0 or haar.name != 'haar':
+                print("✗ Backend argument did not override the config")
+                return False
+            if haar(np.zeros((240, 320), dtype=np.uint8)) != []:
+                print("✗ Haar cascade found a face in a blank frame")
+                return False
+            print("✓ Backend and scale arguments override the config")
+        
+        for backend, error in (('dnn', IOError), ('nonexistent', ValueError)):
+            try:
+                create_detector(config, backend=backend)
+                print(f"✗ {backend} backend built without its model")
+                return False
+            except error:
+                pass
+        print("✓ Missing DNN model files and unknown backends are rejected")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Detector backend test failed: {e}")
+        return False
+
+def test_frame_sources():
+    """Test recorded frame sources without a camera"""
+    print("\nTesting recorded frame sources...")
+    try:
+        import os
+        import tempfile
+        import cv2
+        import numpy as np
+        from frame_sources import open_source, is_landmark_input, ImageDirectorySource, LandmarkReplaySource
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            # Image directory input
+            for i in range(3):
+                cv2.imwrite(os.path.join(tmp, f"frame_{i:03d}.png"), np.full((48, 64, 3), i, dtype=np.uint8))
+            source = open_source(tmp)
+            frames = []
+            while True:
+                ret, frame = source.read()
+                if not ret:
+                    break
+                frames.append(frame)
+            if not isinstance(source, ImageDirectorySource) or len(frames) != 3 or frames[0].shape != (48, 64, 3):
+                print("✗ Image directory source returned unexpected frames")
+                return False
+            print(f"✓ Image directory source - {len(frames)} frames")
+            
+            # Landmark trace input
+            trace = os.path.join(tmp, "trace.npz")
+            np.savez(trace, landmarks=np.zeros((5, 68, 2)), timestamps=np.arange(5) / 30.0,
+                     found=np.array([True, True, False, True, True]))
+            source = open_source(trace)
+            items = []
+            while True:
+                ret, item = source.read()
+                if not ret:
+                    break
+                items.append(item)
+            faces = sum(1 for landmarks, _ in items if landmarks is not None)
+            if not isinstance(source, LandmarkReplaySource) or len(items) != 5 or faces != 4:
+                print("✗ Landmark replay source returned unexpected items")
+                return False
+            print(f"✓ Landmark replay source - {len(items)} frames, {faces} with a face")
+            
+            # The navigator decides what to load from the spec before the source is open
+            kinds = [is_landmark_input(spec) for spec in (None, "0", tmp, "clip.mp4", trace, "session.npy", "synthetic")]
+            if kinds != [False, False, False, False, True, True, True]:
+                print(f"✗ Landmark inputs misclassified: {kinds}")
+                return False
+            if any(source.provides_landmarks != is_landmark_input(spec)
+                   for source, spec in ((open_source(tmp), tmp), (open_source(trace), trace))):
+                print("✗ Landmark input check disagrees with open_source")
+                return False
+            print("✓ Landmark inputs recognised from the spec")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ Frame source test failed: {e}")
+        return False
+
+def test_latency_metrics():
+    """Test histogram percentiles and the Prometheus text endpoint"""
+    print("\nTesting latency metrics...")
+    try:
+        import re
+        import urllib.request
+        from metrics import LatencyHistogram, PipelineMetrics, MetricsServer
+        
+        histogram = LatencyHistogram()
+        if histogram.percentile(50) != 0.0:
+            print("✗ Empty histogram has a percentile")
+            return False
+        for ms in range(1, 101):
+            histogram.record(ms / 1000.0)
+        # Buckets are 25% wide, and no percentile can exceed the largest observation
+        p50, p95, p99 = (histogram.percentile(q) for q in (50, 95, 99))
+        if not (0.050 <= p50 < 0.0625 and 0.095 <= p95 <= 0.100 and p99 == 0.100 == histogram.maximum):
+            print(f"✗ Percentiles p50 {p50}, p95 {p95}, p99 {p99}")
+            return False
+        if abs(histogram.mean() - 0.0505) > 1e-9:
+            print(f"✗ Mean {histogram.mean()}")
+            return False
+        outlier = LatencyHistogram()
+        outlier.record(60.0)
+        if outlier.percentile(50) != 60.0:
+            print("✗ Observation above the last bucket lost")
+            return False
+        print(f"✓ Percentiles within one bucket: p50 {p50 * 1000:.1f} ms, p95 {p95 * 1000:.1f} ms, "
+              f"p99 {p99 * 1000:.1f} ms")
+        
+        metrics = PipelineMetrics(stages=('detect', 'frame'))
+        metrics.record('detect', 0.004)
+        metrics.frame_done(0.0)
+        metrics.add_gauge('frames_dropped', lambda: 3, "Captured frames replaced before processing")
+        server = MetricsServer(metrics, 0).start()
+        try:
+            url = f"http://127.0.0.1:{server.server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                content_type = response.headers['Content-Type']
+                text = response.read().decode('utf-8')
+        finally:
+            server.stop()
+        sample = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{[a-z]+="[^"]*"(,[a-z]+="[^"]*")*\})? -?[0-9.e+-]+$')
+        bad = [line for line in text.splitlines() if not line.startswith('#') and not sample.match(line)]
+        expected = ['face_navigator_stage_latency_seconds{stage="detect",quantile="0.95"} 0.004',
+                    'face_navigator_stage_latency_seconds_count{stage="detect"} 1',
+                    'face_navigator_frames_total 1',
+                    '# TYPE face_navigator_frames_dropped gauge',
+                    'face_navigator_frames_dropped 3']
+        missing = [line for line in expected if not any(l.startswith(line) for l in text.splitlines())]
+        if bad or missing or not content_type.startswith('text/plain'):
+            print(f"✗ Prometheus text malformed: {bad[:3]}, missing {missing}")
+            return False
+        print(f"✓ Prometheus endpoint serves {len(text.splitlines())} well-formed lines")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Latency metrics test failed: {e}")
+        return False
+
+def test_cursor_output():
+    """Test that cursor backends track the position and skip unchanged moves"""
+    print("\nTesting cursor output...")
+    try:
+        from cursor_output import NullCursorOutput, create_cursor_output
+        
+        cursor = NullCursorOutput((800, 600), record=True)
+        if cursor.position() != (400, 300):
+            print(f"✗ Cursor starts at {cursor.position()}, not the screen centre")
+            return False
+        # Sub-pixel changes round to the same position and never reach the backend
+        results = [cursor.move_to(400.2, 299.8), cursor.move_to(410.6, 300), cursor.move_to(411.4, 300.3),
+                   cursor.move_to(420, 310)]
+        if results != [False, True, False, True] or cursor.position() != (420, 310):
+            print(f"✗ Moves {results}, position {cursor.position()}")
+            return False
+        if cursor.moves != 2 or cursor.skipped_moves != 2 or [e[2:] for e in cursor.events] != [(411, 300), (420, 310)]:
+            print(f"✗ Backend saw {cursor.events} ({cursor.moves} moves, {cursor.skipped_moves} skipped)")
+            return False
+        cursor.click('right')
+        if cursor.clicks != 1 or cursor.events[-1][1:3] != ('click', 'right'):
+            print("✗ Click not recorded")
+            return False
+        print("✓ Unchanged moves skipped, position tracked without querying the display")
+        
+        config = {'cursor_backend': 'auto', 'screen_size': [1024, 768]}
+        if create_cursor_output(config, 'null').size() != (1024, 768):
+            print("✗ Configured screen size ignored")
+            return False
+        try:
+            create_cursor_output(config, 'nonexistent')
+            print("✗ Unknown cursor backend accepted")
+            return False
+        except ValueError:
+            pass
+        print("✓ Cursor backend built from the configuration")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Cursor output test failed: {e}")
+        return False
+
+def test_frame_scheduler():
+    """Test deadline pacing, overrun handling and idle transitions"""
+    print("\nTesting frame scheduler...")
+    try:
+        import time
+        from scheduler import FrameScheduler
+        
+        scheduler = FrameScheduler(target_fps=100.0, idle_fps=20.0, idle_after=0.05)
+        # Work done within the frame comes out of its budget instead of adding to it
+        start = time.monotonic()
+        for _ in range(20):
+            time.sleep(0.004)
+            scheduler.update(True)
+            scheduler.wait()
+        elapsed = time.monotonic() - start
+        if not 0.19 <= elapsed < 0.30 or scheduler.overruns > 2:
+            print(f"✗ 20 frames at 100 FPS took {elapsed * 1000:.0f} ms ({scheduler.overruns} overruns)")
+            return False
+        print(f"✓ 20 frames paced to {elapsed * 1000:.0f} ms")
+        
+        # An overrun reschedules from now rather than bursting to catch up
+        time.sleep(0.05)
+        scheduler.wait()
+        overruns = scheduler.overruns
+        start = time.monotonic()
+        scheduler.wait()
+        if overruns == 0 or time.monotonic() - start < 0.008:
+            print("✗ Overrun not detected, or frames burst to catch up")
+            return False
+        print("✓ Overrun counted without a catch-up burst")
+        
+        time.sleep(0.06)
+        scheduler.update(False)
+        if not scheduler.idle or scheduler.idle_transitions != 1 or scheduler.frame_interval() != 1.0 / 20.0:
+            print("✗ No idle mode after the face was lost")
+            return False
+        scheduler.update(True)
+        if scheduler.idle or scheduler.active_transitions != 1 or scheduler.next_deadline > time.monotonic():
+            print("✗ Idle mode not left as soon as the face returned")
+            return False
+        start = time.monotonic()
+        scheduler.wait()
+        if time.monotonic() - start > 0.03:
+            print("✗ Waited out the idle interval after the face returned")
+            return False
+        if FrameScheduler(target_fps=0).frame_interval() != 0.0:
+            print("✗ target_fps 0 is throttled")
+            return False
+        print("✓ Idle after idle_after seconds without a face, full rate as soon as it returns")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Frame scheduler test failed: {e}")
+        return False
+
+def test_cursor_filters():
+    """Test jitter suppression, tracking lag, Kalman lead and reset of the cursor filters"""
+    print("\nTesting cursor filters...")
+    try:
+        import numpy as np
+        from filters import OneEuroFilter, KalmanFilter2D, create_filter
+        
+        rng = np.random.default_rng(0)
+        times = np.arange(90) / 30.0
+        still = np.array([100.0, 50.0]) + rng.normal(0, 2, (90, 2))
+        # 200 px/s to the right, with the same 2 px landmark noise
+        truth = np.stack([100 + 200 * times, np.full(90, 50.0)], axis=1)
+        moving = truth + rng.normal(0, 2, (90, 2))
+        
+        for cursor_filter in (OneEuroFilter(), KalmanFilter2D()):
+            name = type(cursor_filter).__name__
+            jitter = np.array([cursor_filter.filter(v, t).copy() for v, t in zip(still, times)])[30:].std(axis=0)
+            if not (jitter < 0.7 * still[30:].std(axis=0)).all():
+                print(f"✗ {name} leaves {jitter} px of jitter on a still face")
+                return False
+            
+            cursor_filter.reset()
+            first = cursor_filter.filter(moving[0], times[0])
+            if not np.array_equal(first, moving[0]):
+                print(f"✗ {name} remembers the previous track after reset()")
+                return False
+            tracked = np.array([cursor_filter.filter(v, t).copy() for v, t in zip(moving[1:], times[1:])])
+            lag = (truth[61:, 0] - tracked[60:, 0]).mean()
+            if abs(lag) > 4.0:
+                print(f"✗ {name} lags a constant-velocity face by {lag:.1f} px")
+                return False
+            print(f"✓ {name}: still-face jitter {jitter.mean():.2f} px, lag {lag:.2f} px at 200 px/s")
+        
+        # Kalman lead extrapolates along the estimated velocity
+        kalman = KalmanFilter2D()
+        led = np.array([kalman.filter(v, t, lead=0.05).copy() for v, t in zip(moving, times)])
+        lead_error = led[60:, 0] - (truth[60:, 0] + 200 * 0.05)
+        if abs(lead_error.mean()) > 1.0 or np.abs(lead_error).max() > 5.0:
+            print(f"✗ Kalman lead off by {lead_error.mean():.2f} px (max {np.abs(lead_error).max():.2f})")
+            return False
+        print(f"✓ Kalman 50 ms lead within {np.abs(lead_error).max():.1f} px of the face's future position")
+        
+        config = {'cursor_filter': 'exponential', 'one_euro_min_cutoff': 1.0, 'one_euro_beta': 0.05,
+                  'kalman_process_noise': 2000.0, 'kalman_measurement_noise': 4.0}
+        if create_filter(config) is not None or not isinstance(create_filter(config, 'kalman'), KalmanFilter2D):
+            print("✗ Wrong filter built from the configuration")
+            return False
+        try:
+            create_filter(config, 'nonexistent')
+            print("✗ Unknown cursor filter accepted")
+            return False
+        except ValueError:
+            pass
+        return True
+        
+    except Exception as e:
+        print(f"✗ Cursor filter test failed: {e}")
+        return False
+
+def test_model_download():
+    """Test the streaming bz2 download of the landmark model and its checksum check"""
+    print("\nTesting landmark model download...")
+    try:
+        import bz2
+        import hashlib
+        import logging
+        import os
+        import tempfile
+        from face_navigator import FaceNavigator
+        from settings import DEFAULT_CONFIG
+        
+        # Incompressible, so the compressed stream spans several read chunks
+        payload = os.urandom(3 << 20)
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = os.path.join(tmp, "model.dat.bz2")
+            with open(archive, 'wb') as f:
+                f.write(bz2.compress(payload))
+            
+            navigator = FaceNavigator.__new__(FaceNavigator)
+            navigator.logger = logging.getLogger("test")
+            navigator.shape_predictor_path = os.path.join(tmp, "model.dat")
+            partial = navigator.shape_predictor_path + ".part"
+            url = "file://" + archive
+            
+            navigator.config = dict(DEFAULT_CONFIG, shape_predictor_url=url, shape_predictor_sha256="0" * 64)
+            try:
+                navigator.download_shape_predictor()
+                print("✗ Checksum mismatch was accepted")
+                return False
+            except IOError:
+                pass
+            if os.path.exists(partial) or os.path.exists(navigator.shape_predictor_path):
+                print("✗ Rejected download left a file behind")
+                return False
+            print("✓ Checksum mismatch rejected and the partial file removed")
+            
+            navigator.config['shape_predictor_sha256'] = hashlib.sha256(payload).hexdigest()
+            navigator.download_shape_predictor()
+            with open(navigator.shape_predictor_path, 'rb') as f:
+                if f.read() != payload or os.path.exists(partial):
+                    print("✗ Downloaded model differs from the archive")
+                    return False
+            print("✓ Verified model decompressed while downloading")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Model download test failed: {e}")
+        return False
+
+def test_allocation_free_frame_path():
+    """Test that the allocation-free frame path allocates (almost) nothing per frame"""
+    print("\nTesting allocation-free frame path...")
+    try:
+        import time
+        import tracemalloc
+        import numpy as np
+        from capture import ThreadedCapture
+        from frame_buffers import FrameBuffers, MIRROR_INDEX
+        
+        class Camera:
+            """Synthetic 640x480 camera that decodes into the buffer it is given"""
+            def __init__(self):
+                self.frame = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+            def read(self, image=None):
+                if image is None:
+                    image = self.frame.copy()
+                else:
+                    np.copyto(image, self.frame)
+                return True, image
+            def release(self):
+                pass
+        
+        class Point:
+            def __init__(self, x, y):
+                self.x, self.y = x, y
+        
+        class Shape:
+            """Stand-in for dlib.full_object_detection"""
+            def __init__(self):
+                self.points = [Point(100 + i, 200 + i) for i in range(68)]
+            def part(self, i):
+                return self.points[i]
+        
+        # Mirroring relabels left/right points and flips x
+        buffers = FrameBuffers()
+        shape = Shape()
+        landmarks = buffers.landmarks_from_shape(shape, mirror_width=640)
+        if landmarks[36, 0] != 639 - (100 + MIRROR_INDEX[36]) or landmarks[30, 0] != 639 - 130:
+            print("✗ Mirrored landmarks are wrong")
+            return False
+        print("✓ Landmark mirroring")
+        
+        capture = ThreadedCapture(Camera(), reuse_buffers=True).start()
+        
+        def process(frames):
+            for _ in range(frames):
+                ret, frame = capture.read()
+                buffers.to_gray(frame)
+                buffers.landmarks_from_shape(shape, mirror_width=frame.shape[1])
+        
+        # Warm up so every buffer exists, then measure the steady state
+        process(20)
+        tracemalloc.start()
+        process(5)
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        frames = 200
+        process(frames)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        capture.release()
+        
+        # A single 640x480 grayscale frame is 300 KB; steady state must stay far below that
+        growth_per_frame = (current - baseline) / frames
+        transient = peak - baseline
+        print(f"  Net growth per frame: {growth_per_frame:.1f} bytes, peak transient: {transient} bytes")
+        if growth_per_frame > 64 or transient > 16 * 1024:
+            print("✗ Frame path allocates per frame")
+            return False
+        print("✓ Steady-state allocations per frame are near zero")
+        
+        # Landmark sources hand out (landmarks, rect) tuples, which cannot be triple buffered
+        from frame_sources import SyntheticFaceSource
+        landmark_capture = ThreadedCapture(SyntheticFaceSource(duration=0.2, fps=50), reuse_buffers=True).start()
+        ret, item = landmark_capture.read(timeout=1.0)
+        landmark_capture.release()
+        if not ret or landmark_capture.reuse_buffers or item[0].shape != (68, 2):
+            print("✗ Landmark source broke the buffered capture thread")
+            return False
+        
+        # A reader that raises ends the capture at once, with the error kept
+        class BrokenCamera(Camera):
+            def read(self, image=None):
+                raise RuntimeError("device gone")
+        broken = ThreadedCapture(BrokenCamera(), reuse_buffers=True).start()
+        began = time.monotonic()
+        ret, _ = broken.read(timeout=5.0)
+        broken.release()
+        if ret or time.monotonic() - began > 1.0 or not isinstance(broken.error, RuntimeError):
+            print("✗ Capture thread failure was not reported")
+            return False
+        print("✓ Capture thread handles landmark sources and reports failures")
+        
+        try:
+            import dlib
+            from face_navigator import FaceNavigator
+        except ImportError as e:
+            print(f"⚠ Skipping the navigator frame path: {e}")
+            return True
+        import cv2
+        import json
+        import logging
+        import os
+        import tempfile
+        from cursor_output import NullCursorOutput
+        from settings import DEFAULT_CONFIG
+        
+        class RenderedFaceSource(SyntheticFaceSource):
+            """The synthetic face drawn into the frame buffer it is given"""
+            provides_landmarks = False
+            def read(self, image=None):
+                ret, item = super().read()
+                if not ret:
+                    return False, None
+                self.points = item[0]
+                if image is None:
+                    image = np.empty((480, 640, 3), dtype=np.uint8)
+                image[:] = 90
+                cv2.fillConvexPoly(image, self.points[0:27], (160, 170, 180))
+                cv2.fillConvexPoly(image, self.points[36:42], (20, 20, 20))
+                cv2.fillConvexPoly(image, self.points[42:48], (20, 20, 20))
+                cv2.fillConvexPoly(image, self.points[48:60], (40, 40, 120))
+                return True, image
+        
+        def frame_path_allocations(landmark_flow, tmp):
+            """Bytes kept and peak bytes allocated per frame by FaceNavigator.process_frame"""
+            source = RenderedFaceSource(duration=30.0, realtime=False)
+            def detect(gray):
+                left, top = source.points.min(axis=0)
+                right, bottom = source.points.max(axis=0)
+                return [dlib.rectangle(int(left), int(top), int(right), int(bottom))]
+            def predict(gray, face):
+                return dlib.full_object_detection(face, [dlib.point(int(x), int(y)) for x, y in source.points])
+            
+            class Navigator(FaceNavigator):
+                def load_landmark_predictor(self):
+                    return predict
+            
+            config_file = os.path.join(tmp, f"config_{landmark_flow}.json")
+            with open(config_file, 'w') as f:
+                json.dump(dict(DEFAULT_CONFIG, allocation_free=True, landmark_flow=landmark_flow,
+                               calibration_profiles_file=os.path.join(tmp, "profiles.json")), f)
+            navigator = Navigator(config_file=config_file, source=source, cursor=NullCursorOutput(),
+                                  recalibrate=True)
+            navigator.face_detector = navigator.face_tracker.detect = detect
+            
+            def process(frames):
+                for _ in range(frames):
+                    ret, frame = source.read(navigator.frame_buffer)
+                    navigator.frame_buffer = frame
+                    navigator.frame_timestamp = source.frame_timestamp
+                    navigator.capture_time = source.capture_timestamp
+                    navigator.process_frame(frame)
+            
+            # Past calibration, so the cursor and blink stages run too
+            process(120)
+            tracemalloc.start()
+            process(5)
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            frames = 300
+            process(frames)
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            if not navigator.calibrated or navigator.cursor.moves == 0:
+                raise RuntimeError("the synthetic face never moved the cursor")
+            return (current - baseline) / frames, peak - baseline
+        
+        logging.disable(logging.INFO)
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                for landmark_flow in (False, True):
+                    growth_per_frame, transient = frame_path_allocations(landmark_flow, tmp)
+                    label = "with landmark flow" if landmark_flow else "with the shape predictor"
+                    print(f"  process_frame {label}: {growth_per_frame:.1f} bytes kept per frame, "
+                          f"peak transient {transient} bytes")
+                    # A 640x480 grayscale frame is 300 KB
+                    if growth_per_frame > 64 or transient > 32 * 1024:
+                        print(f"✗ process_frame {label} allocates per frame")
+                        return False
+        finally:
+            logging.disable(logging.NOTSET)
+        print("✓ Navigator frame path allocates no frame-sized buffers")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Allocation test failed: {e}")
+        return False
+
+def test_camera_modes():
+    """Test Y-plane extraction, mode selection and the per-device mode cache"""
+    print("\nTesting camera mode negotiation...")
+    try:
+        import os
+        import tempfile
+        import cv2
+        import numpy as np
+        from camera_modes import CameraMode, CameraModeCache, raw_to_gray, select_mode
+        
+        frame = np.random.randint(0, 255, (48, 64, 3), dtype=np.uint8)
+        frame = cv2.GaussianBlur(frame, (7, 7), 0)
+        expected = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        
+        # YUYV: Y is every other byte
+        yuv = cv2.cvtColor(frame, cv2.COLOR_BGR2YUV)
+        yuyv = np.empty((48, 128), dtype=np.uint8)
+        yuyv[:, ::2] = yuv[:, :, 0]
+        yuyv[:, 1::2] = 128
+        gray = raw_to_gray(yuyv, 'YUYV', 64, 48, np.empty((48, 64), dtype=np.uint8))
+        if gray is None or np.abs(gray.astype(int) - expected).max() > 2:
+            print("✗ YUYV Y-plane extraction is wrong")
+            return False
+        
+        # MJPG: decode straight to grayscale
+        ok, jpeg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 95])
+        gray = raw_to_gray(jpeg, 'MJPG', 64, 48)
+        if gray is None or np.abs(gray.astype(int) - expected).mean() > 3:
+            print("✗ MJPG grayscale decode is wrong")
+            return False
+        if raw_to_gray(jpeg, 'MJPG', 640, 480) is not None:
+            print("✗ Mismatched frame size was accepted")
+            return False
+        print("✓ Y-plane extraction")
+        
+        modes = [CameraMode('MJPG', fps=30, latency=0.040), CameraMode('YUYV', fps=30, latency=0.035, grayscale=True)]
+        if select_mode(modes).fourcc != 'YUYV':
+            print("✗ Lowest-latency mode was not selected")
+            return False
+        
+        with tempfile.TemporaryDirectory() as directory:
+            cache = CameraModeCache(os.path.join(directory, 'camera_modes.json'))
+            cache.put('0:Test Camera:64x48', modes[1])
+            cached = cache.get('0:Test Camera:64x48')
+            if cached is None or cached.fourcc != 'YUYV' or not cached.grayscale or cache.get('1::64x48'):
+                print("✗ Camera mode cache round trip failed")
+                return False
+        print("✓ Mode selection and cache")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Camera mode test failed: {e}")
+        return False
+
+class FrameValueAnalyzer:
+    """Worker analyzer for the pipeline test: reports each frame's pixel value, taking uneven time"""
+    
+    def setup(self):
+        pass
+    
+    def __call__(self, frame):
+        import time
+        import numpy as np
+        value = int(frame[0, 0, 0])
+        # Early frames finish last so results arrive out of order
+        time.sleep(0.002 * (value % 3 == 0) + 0.01 * (value % 5 == 0))
+        return np.full((68, 2), value, dtype=np.int32), None
+
+def test_parallel_pipeline():
+    """Test that the multi-process pipeline returns every frame in capture order"""
+    print("\nTesting multi-process pipeline...")
+    try:
+        import os
+        import tempfile
+        import cv2
+        import numpy as np
+        from frame_sources import ImageDirectorySource
+        from parallel_pipeline import ParallelLandmarkPipeline
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            for i in range(40):
+                cv2.imwrite(os.path.join(tmp, f"frame_{i:03d}.png"), np.full((48, 64, 3), i * 5, dtype=np.uint8))
+            
+            pipeline = ParallelLandmarkPipeline(ImageDirectorySource(tmp), FrameValueAnalyzer(),
+                                                workers=3, in_flight=6).start()
+            values = []
+            timestamps = []
+            try:
+                while True:
+                    ret, result = pipeline.read()
+                    if not ret:
+                        break
+                    values.append(int(result[0][0, 0]))
+                    timestamps.append(pipeline.frame_timestamp)
+            finally:
+                pipeline.release()
+        
+        if values != [i * 5 for i in range(40)]:
+            print(f"✗ Results out of order or missing: {values}")
+            return False
+        if any(b <= a for a, b in zip(timestamps, timestamps[1:])):
+            print("✗ Frame timestamps are not increasing")
+            return False
+        stats = pipeline.stats()
+        print(f"✓ {stats['delivered']} frames in order from 3 workers "
+              f"(up to {stats['max_reordered']} held for reordering)")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Pipeline test failed: {e}")
+        return False
+
+def test_landmark_flow():
+    """Test optical-flow landmark propagation against known motion"""
+    print("\nTesting landmark optical flow...")
+    try:
+        import cv2
+        import numpy as np
+        from landmark_flow import LandmarkFlow
+        
+        rng = np.random.default_rng(1)
+        texture = cv2.GaussianBlur(rng.integers(0, 255, (480, 640), dtype=np.uint8), (5, 5), 0)
+        
+        def face_points(eye_height):
+            points = rng.uniform(220, 300, (68, 2))
+            for start, x in ((36, 230), (42, 270)):
+                points[start:start + 6] = [(x, 250), (x + 10, 250 - eye_height / 2), (x + 20, 250 - eye_height / 2),
+                                           (x + 30, 250), (x + 20, 250 + eye_height / 2), (x + 10, 250 + eye_height / 2)]
+            return points
+        
+        class Face:
+            def __init__(self, dx, dy):
+                self.dx, self.dy = dx, dy
+            def left(self): return 200 + self.dx
+            def top(self): return 200 + self.dy
+            def right(self): return 320 + self.dx
+            def bottom(self): return 320 + self.dy
+        
+        state = {'points': face_points(11), 'shift': (0, 0), 'calls': 0}
+        def predict(gray, face):
+            state['calls'] += 1
+            return state['points'] + state['shift']
+        
+        flow = LandmarkFlow(predict, prediction_interval=4)
+        errors = []
+        for i in range(30):
+            dx, dy = i, i // 2
+            state['shift'] = (dx, dy)
+            gray = np.roll(texture, (dy, dx), axis=(0, 1))
+            landmarks = flow.update(gray, Face(dx, dy))
+            errors.append(np.abs(landmarks - np.rint(state['points'] + (dx, dy))).max())
+        
+        if state['calls'] > 8 or max(errors) > 1:
+            print(f"✗ {state['calls']} predictions for 30 frames, worst error {max(errors)} px")
+            return False
+        print(f"✓ {state['calls']} full predictions for 30 moving frames, worst error {max(errors)} px")
+        
+        # Nearly closed eyes are handed to the predictor on every frame
+        state['points'] = face_points(3)
+        flow.reset()
+        state['calls'] = 0
+        for i in range(10):
+            flow.update(texture, Face(0, 0))
+        if state['calls'] != 10:
+            print(f"✗ Only {state['calls']} of 10 frames with closing eyes were predicted")
+            return False
+        print("✓ Possible blinks always use full predictions")
+        
+        # Open eyes at an ordinary EAR of 0.27 propagate once the blink thresholds have adapted
+        from blinks import BlinkDetector
+        blinks = BlinkDetector()
+        for i, (left, right) in enumerate(rng.normal(0.27, 0.01, (90, 2))):
+            blinks.update(left, right, i / 30.0)
+        flow = LandmarkFlow(predict, prediction_interval=4)
+        flow.eye_guard_ear = blinks.open_levels()
+        state['points'] = face_points(8.1)
+        state['calls'] = 0
+        for i in range(30):
+            state['shift'] = (i, 0)
+            flow.update(np.roll(texture, i, axis=1), Face(i, 0))
+        if state['calls'] > 8:
+            print(f"✗ {state['calls']} predictions for 30 frames of open eyes at EAR 0.27 "
+                  f"(guard {flow.eye_guard_ear[0]:.3f})")
+            return False
+        print(f"✓ Open eyes at EAR 0.27 propagated by flow (guard {flow.eye_guard_ear[0]:.3f}, "
+              f"{state['calls']} full predictions)")
+        
+        # Mirrored landmarks swap the eyes: the image's left eye (36-41) is the detectors' left one
+        points = face_points(11)
+        points[36:42] = face_points(5)[36:42]
+        state['points'] = points
+        results = {}
+        for mirrored in (False, True):
+            flow = LandmarkFlow(predict, prediction_interval=30, eye_guard_ear=(0.25, 0.0))
+            state['calls'] = 0
+            for i in range(10):
+                state['shift'] = (i, 0)
+                flow.update(np.roll(texture, i, axis=1), Face(i, 0), mirrored=mirrored)
+            results[mirrored] = state['calls']
+        if results[False] > 2 or results[True] != 10:
+            print(f"✗ Eye guard ignores mirroring: {results[False]} predictions unmirrored, "
+                  f"{results[True]} mirrored")
+            return False
+        print("✓ Eye guard levels applied to the detectors' eyes with mirrored landmarks")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Landmark flow test failed: {e}")
+        return False
+
+def test_face_observation():
+    """Test that FaceObservation features match the per-eye formulas"""
+    print("\nTesting face observation features...")
+    try:
+        import numpy as np
+        from scipy.spatial import distance as dist
+        from observation import FaceObservation, eye_aspect_ratio_series
+        
+        def eye_aspect_ratio(eye):
+            return (dist.euclidean(eye[1], eye[5]) + dist.euclidean(eye[2], eye[4])) / (2.0 * dist.euclidean(eye[0], eye[3]))
+        
+        rng = np.random.default_rng(2)
+        for _ in range(20):
+            landmarks = rng.integers(100, 400, (68, 2)).astype(np.int32)
+            observation = FaceObservation(landmarks, timestamp=1.5)
+            if not (np.allclose(observation.centre, landmarks.mean(axis=0))
+                    and np.isclose(observation.left_ear, eye_aspect_ratio(landmarks[42:48]))
+                    and np.isclose(observation.right_ear, eye_aspect_ratio(landmarks[36:42]))):
+                print("✗ Observation features differ from the reference formulas")
+                return False
+        if hasattr(observation, '__dict__'):
+            print("✗ FaceObservation is not slotted")
+            return False
+        print("✓ Centre and eye aspect ratios")
+        
+        # A collapsed eye (corners on the same pixel) reads as closed instead of dividing by zero
+        landmarks[39] = landmarks[36]
+        observation = FaceObservation(landmarks)
+        series = eye_aspect_ratio_series(landmarks[None])
+        if (observation.right_ear != 0.0 or series[0, 1] != 0.0
+                or not np.isclose(series[0, 0], observation.left_ear)):
+            print("✗ Collapsed eye not handled")
+            return False
+        print("✓ Collapsed eye gives an aspect ratio of 0")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Face observation test failed: {e}")
+        return False
+
+def test_blink_detection():
+    """Test that blink detection gives the same clicks at 10, 30 and 60 FPS"""
+    print("\nTesting time-based blink detection...")
+    try:
+        import numpy as np
+        from blinks import BlinkDetector
+        
+        # (start, duration) of left-eye closures: two blinks, a twitch and a long closure
+        closures = [(3.013, 0.25), (5.527, 0.4), (7.041, 0.04), (9.055, 2.0), (12.569, 0.3)]
+        expected = [0.25, 0.4, 0.3]
+        
+        def ear_at(t, rng):
+            # 40 ms eyelid ramps between open (0.32) and closed (0.08) EAR
+            closed = 0.0
+            for start, duration in closures:
+                ramp_in = np.clip((t - start + 0.02) / 0.04, 0, 1)
+                ramp_out = np.clip((start + duration + 0.02 - t) / 0.04, 0, 1)
+                closed = max(closed, min(ramp_in, ramp_out))
+            return 0.32 - 0.24 * closed + rng.normal(0, 0.005)
+        
+        for fps in (10, 30, 60):
+            rng = np.random.default_rng(fps)
+            detector = BlinkDetector(threshold=0.25, min_duration=0.1, max_duration=1.0, cooldown=0.5)
+            blinks = []
+            for t in np.arange(0, 15, 1.0 / fps) + 0.0037:
+                ear = ear_at(t, rng)
+                blinks += detector.update(ear, 0.32 + rng.normal(0, 0.005), t)
+            durations = [duration for eye, duration in blinks if eye == 'left']
+            right = [eye for eye, _ in blinks if eye == 'right']
+            if right or len(durations) != len(expected) or \
+                    max(abs(d - e) for d, e in zip(durations, expected)) > 0.06:
+                print(f"✗ {fps} FPS: blinks {blinks}, expected left blinks of {expected}")
+                return False
+            print(f"✓ {fps} FPS: {len(durations)} blinks, durations "
+                  f"{', '.join(f'{d * 1000:.0f}' for d in durations)} ms, "
+                  f"threshold {detector.left.threshold:.3f}")
+        
+        # Overlapping closures of both eyes are one bilateral blink when the second eye opens
+        def run(left, right, times):
+            detector = BlinkDetector(threshold=0.25, min_duration=0.1, max_duration=1.0, cooldown=0.5,
+                                     adaptive=False)
+            return [blink for l, r, t in zip(left, right, times) for blink in detector.update(l, r, t)]
+        
+        times = np.arange(0, 3, 1 / 30)
+        open_, closed = 0.32, 0.1
+        left = np.where((times >= 1.0) & (times < 1.2), closed, open_)
+        right = np.where((times >= 1.03) & (times < 1.3), closed, open_)
+        blinks = run(left, right, times)
+        if len(blinks) != 1 or blinks[0][0] != 'both' or abs(blinks[0][1] - 0.27) > 0.04:
+            print(f"✗ Overlapping closures gave {blinks}, expected one bilateral blink")
+            return False
+        # A wink is reported at once; a partner closure cut by a tracking gap leaves no blink
+        winks = run(np.full(len(times), open_), right, times)
+        cut = run(left, right, np.where(times < 1.25, times, times + 1.0))
+        if [eye for eye, _ in winks] != ['right'] or cut:
+            print(f"✗ Wink gave {winks}, gap-cut closures gave {cut}")
+            return False
+        print("✓ Bilateral blink reported once, winks reported per eye")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Blink detection test failed: {e}")
+        return False
+
+def test_calibration_profiles():
+    """Test saved calibration baselines and background drift correction"""
+    print("\nTesting calibration profiles...")
+    try:
+        import os
+        import tempfile
+        import numpy as np
+        from calibration import CalibrationProfiles, DriftCorrector
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            profiles = CalibrationProfiles(os.path.join(tmp, 'calibration_profiles.json'))
+            key = CalibrationProfiles.key('alice', '0:Webcam:640x480')
+            profiles.save(key, np.array([320.5, 240.25]))
+            profiles.save(CalibrationProfiles.key('bob', '0:Webcam:640x480'), np.array([300.0, 200.0]))
+            baseline = profiles.load(key)
+            if baseline is None or not np.allclose(baseline, [320.5, 240.25]) or profiles.load('carol@none'):
+                print("✗ Calibration profile round trip failed")
+                return False
+        print("✓ Profiles saved and loaded per user and camera")
+        
+        def simulate(centres, fps=30):
+            corrector = DriftCorrector(time_constant=5.0, still_speed=15.0, radius=50.0)
+            baseline = np.array([320.0, 240.0])
+            for i, centre in enumerate(centres):
+                corrector.update(baseline, centre, i / fps)
+            return baseline
+        
+        rng = np.random.default_rng(3)
+        # Resting 20 px to the right of the baseline for 30 s: the baseline follows
+        still = [np.array([340.0, 240.0]) + rng.normal(0, 0.3, 2) for _ in range(900)]
+        if abs(simulate(still)[0] - 340.0) > 1.0:
+            print("✗ Baseline did not follow the new resting position")
+            return False
+        # Head swinging left and right: deliberate movement is left alone
+        swinging = [np.array([320.0 + 30 * np.sin(i / 5), 240.0]) for i in range(900)]
+        if abs(simulate(swinging)[0] - 320.0) > 1.0:
+            print("✗ Deliberate movement moved the baseline")
+            return False
+        # Held far from the baseline (outside the radius): left alone
+        far = [np.array([400.0, 240.0]) for _ in range(900)]
+        if abs(simulate(far)[0] - 320.0) > 1e-6:
+            print("✗ A far head position moved the baseline")
+            return False
+        print("✓ Drift correction follows a still head only")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Calibration profile test failed: {e}")
+        return False
+
+def test_head_pose():
+    """Test head-pose recovery and the direction of the nose pointer"""
+    print("\nTesting head pose...")
+    try:
+        import cv2
+        import numpy as np
+        from head_pose import HeadPoseEstimator, MODEL_POINTS, POSE_POINTS
+        
+        camera_matrix = np.array([[640.0, 0.0, 320.0], [0.0, 640.0, 240.0], [0.0, 0.0, 1.0]])
+        
+        def project(yaw, pitch):
+            pitch_rotation, _ = cv2.Rodrigues(np.array([np.radians(pitch), 0.0, 0.0]))
+            yaw_rotation, _ = cv2.Rodrigues(np.array([0.0, np.radians(yaw), 0.0]))
+            rvec, _ = cv2.Rodrigues(yaw_rotation @ pitch_rotation)
+            points, _ = cv2.projectPoints(MODEL_POINTS, rvec, np.array([0.0, 0.0, 600.0]), camera_matrix, None)
+            landmarks = np.zeros((68, 2))
+            landmarks[POSE_POINTS] = points.reshape(-1, 2)
+            return landmarks
+        
+        estimator = HeadPoseEstimator((640, 480))
+        poses = {}
+        # The second pass over the angles runs warm-started from the previous pose
+        for yaw, pitch in [(0, 0), (15, 0), (-15, 0), (0, 10), (10, -5)] * 2:
+            pose = estimator.estimate(project(yaw, pitch))
+            if pose is None or abs(pose.yaw - yaw) > 1.0 or abs(pose.pitch - pitch) > 1.0:
+                print(f"✗ Pose at yaw {yaw}, pitch {pitch} recovered as {pose and (pose.yaw, pose.pitch)}")
+                return False
+            poses[(yaw, pitch)] = pose
+        print("✓ Yaw and pitch recovered within 1 degree, cold and warm-started")
+        
+        # Yaw and pitch move the pointer along x and y
+        centre = poses[(0, 0)].pointer
+        if not (poses[(15, 0)].pointer[0] < centre[0] < poses[(-15, 0)].pointer[0]
+                and abs(poses[(0, 10)].pointer[1] - centre[1]) > 10):
+            print("✗ Nose pointer does not follow the head")
+            return False
+        print("✓ Nose pointer follows yaw and pitch")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Head pose test failed: {e}")
+        return False
+
+def test_motion_gate():
+    """Test detection gating on a static and a changing scene"""
+    print("\nTesting motion gate...")
+    try:
+        import numpy as np
+        from motion_gate import MotionGate
+        
+        rng = np.random.default_rng(5)
+        scene = rng.integers(0, 255, (480, 640), dtype=np.uint8)
+        
+        def noisy(image):
+            return np.clip(image + rng.normal(0, 4, image.shape), 0, 255).astype(np.uint8)
+        
+        gate = MotionGate(recheck_min=0.5, recheck_max=2.0)
+        # Ten seconds of an empty, static room at 30 FPS: only back-off rechecks run
+        detected = [i for i in range(300) if gate.should_detect(noisy(scene), i / 30.0)]
+        rechecks = np.diff(detected[1:]) / 30.0
+        if detected[0] != 0 or len(detected) > 8 or not np.allclose(rechecks[:2], [1.0, 2.0], atol=0.05):
+            print(f"✗ Static scene ran detection on frames {detected}")
+            return False
+        print(f"✓ Static scene: detection on {len(detected)} of 300 frames, backing off to 2 s")
+        
+        # Someone walks in: detection runs at once, and keeps running while the face is found
+        person = scene.copy()
+        person[100:400, 200:440] = 90
+        if not gate.should_detect(noisy(person), 300 / 30.0):
+            print("✗ Motion did not wake the gate")
+            return False
+        gate.face_found(301 / 30.0)
+        if not all(gate.should_detect(noisy(person), i / 30.0) for i in range(302, 360)):
+            print("✗ Detection stopped while the face was recently found")
+            return False
+        stats = gate.stats()
+        if stats['wakeups'] != 1 or abs(stats['wake_ms'] - 1000 / 30.0) > 1.0:
+            print(f"✗ Wake-up latency not measured: {stats}")
+            return False
+        print(f"✓ Woke on motion and measured {stats['wake_ms']:.0f} ms to the face")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Motion gate test failed: {e}")
+        return False
+
+def test_cpu_governor():
+    """Test the governor's operating point ladder and budget steps"""
+    print("\nTesting CPU governor...")
+    try:
+        from governor import CpuGovernor, operating_points
+        
+        points = operating_points(30, 0.5, 10, 4, min_fps=10)
+        first, last = points[0], points[-1]
+        if first.knobs() != (30, 0.5, 10, 4) or last.target_fps < 10 or last.detection_scale < 0.25:
+            print(f"✗ Unexpected ladder from {first} to {last}")
+            return False
+        # Frame rate is the last knob to go
+        fps_drop = next(p.level for p in points if p.target_fps < 30)
+        if any(p.detection_interval == 10 for p in points[fps_drop:]):
+            print("✗ Frame rate drops before the detection interval grows")
+            return False
+        print(f"✓ {len(points)} operating points from {first} to {last}")
+        
+        # Worker processes keep their detection and landmark settings: only the frame rate moves
+        fps_points = operating_points(30, 0.5, 10, 4, min_fps=10, fps_only=True)
+        if (any(p.knobs()[1:] != (0.5, 10, 4) for p in fps_points)
+                or [p.target_fps for p in fps_points] != [30, 22, 15, 10]):
+            print(f"✗ Frame-rate-only ladder wrong: {[str(p) for p in fps_points]}")
+            return False
+        print(f"✓ Frame-rate-only ladder of {len(fps_points)} points for worker pipelines")
+        
+        # The scale stops at the detector's minimum, and intervals of disabled components stay off
+        if (min(p.detection_scale for p in operating_points(30, 1.0, 10, 4, min_scale=0.5)) != 0.5
+                or min(p.detection_scale for p in operating_points(30, 0.5, 10, 4, min_scale=0.25)) != 0.25):
+            print("✗ Detection scale not clamped to the backend minimum")
+            return False
+        bare = operating_points(30, 1.0, 10, 4, min_scale=0.5, tracking=False, landmark_flow=False)
+        if any(p.detection_interval is not None or p.landmark_interval is not None or 'every' in str(p)
+               for p in bare) or len(bare) >= len(points):
+            print(f"✗ Disabled components still on the ladder: {[str(p) for p in bare]}")
+            return False
+        print(f"✓ {len(bare)} operating points without tracking or landmark flow")
+        
+        # A 20 ms frame budget with interval 0: every frame is a governor window
+        governor = CpuGovernor(points, frame_budget=0.020, interval=0.0, settle=3)
+        governor.update(0.0)
+        levels = [governor.update(0.030) and governor.level for _ in range(3)]
+        if levels != [1, 2, 3]:
+            print(f"✗ Over budget stepped to levels {levels}")
+            return False
+        # Within budget but not clear of the headroom: hold
+        if any(governor.update(0.018) for _ in range(5)) or governor.level != 3:
+            print("✗ Governor moved while within budget")
+            return False
+        # Well under budget: back up one rung per settle windows
+        changes = [governor.update(0.005) for _ in range(6)]
+        if [p.level for p in changes if p is not None] != [2, 1]:
+            print(f"✗ Under budget steps were {changes}")
+            return False
+        print("✓ Steps down when over budget and back up after settling under it")
+        
+        # The cursor covers the same distance per second at every governed frame rate
+        try:
+            import numpy as np
+            from cursor_output import NullCursorOutput
+            from face_navigator import FaceNavigator
+            from metrics import PipelineMetrics
+            from settings import DEFAULT_CONFIG
+        except ImportError as e:
+            print(f"⚠ Skipping cursor speed check: {e}")
+            return True
+        distances = []
+        for fps in (30, 10):
+            navigator = FaceNavigator.__new__(FaceNavigator)
+            navigator.config = dict(DEFAULT_CONFIG, target_fps=30, sensitivity=2.0, movement_threshold=10)
+            navigator.cursor = NullCursorOutput(screen_size=(100000, 1000), position=(0, 500))
+            navigator.screen_width, navigator.screen_height = navigator.cursor.size()
+            navigator.metrics = PipelineMetrics()
+            navigator.calibrated, navigator.face_filter = True, None
+            navigator.face_center_baseline = np.array([320.0, 240.0])
+            navigator.smoothing_factor = navigator.config['smoothing_factor']
+            navigator.last_cursor_pos = navigator.cursor.position()
+            navigator.last_move_timestamp = None
+            navigator.startup_marks, navigator.startup_time = {'first_cursor_move': 0.0}, 0.0
+            navigator.capture_time = navigator.frame_moved = 0
+            for i in range(3 * fps + 1):
+                navigator.frame_timestamp = i / fps
+                navigator.move_cursor_with_face((340.0, 240.0))
+            distances.append(navigator.cursor.x)
+        if abs(distances[1] - distances[0]) > 0.05 * distances[0]:
+            print(f"✗ Cursor moved {distances[0]} px in 3 s at 30 FPS but {distances[1]} px at 10 FPS")
+            return False
+        print(f"✓ Cursor moved {distances[0]} px in 3 s at 30 FPS and {distances[1]} px at 10 FPS")
+        return True
+        
+    except Exception as e:
+        print(f"✗ CPU governor test failed: {e}")
+        return False
+
+def test_session_recorder():
+    """Test session recording segments, rollover and replay"""
+    print("\nTesting session recorder...")
+    try:
+        import os
+        import tempfile
+        import time
+        import numpy as np
+        from frame_sources import open_source, LandmarkReplaySource
+        from session_recorder import SessionRecorder, load_session, CLICK_LEFT
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            recorder = SessionRecorder(tmp, segment_frames=40).start()
+            landmarks = np.arange(136, dtype=np.int32).reshape(68, 2)
+            for i in range(100):
+                face = i % 10 != 0
+                recorder.record(i / 30.0, landmarks + i if face else None, (10, 20, 110, 140) if face else None,
+                                (0.3, 0.31), (float(i), 50.0), moved=face, clicks=CLICK_LEFT if i == 55 else 0)
+                if i % 20 == 19:
+                    time.sleep(0.05)
+            recorder.close()
+            stats = recorder.stats()
+            if stats['written'] != 100 or stats['dropped'] or stats['segments'] != 3:
+                print(f"✗ Unexpected recorder stats: {stats}")
+                return False
+            
+            segments = [load_session(path) for path in recorder.paths]
+            if [len(records) for records in segments] != [40, 40, 20] or not isinstance(segments[0], np.memmap):
+                print("✗ Segments did not roll over into memory-mapped files")
+                return False
+            records = segments[1]
+            if (records['frame'][0] != 41 or records['clicks'][15] != CLICK_LEFT or records['found'][0]
+                    or not np.array_equal(records['landmarks'][1], landmarks + 41)):
+                print("✗ Recorded fields do not match what was recorded")
+                return False
+            print(f"✓ {stats['written']} frames in {stats['segments']} memory-mapped segments")
+            
+            source = open_source(recorder.paths[0])
+            if (not isinstance(source, LandmarkReplaySource) or source.found.sum() != 36
+                    or not np.array_equal(source.landmarks[1], landmarks + 1)):
+                print("✗ Recording did not replay as a landmark source")
+                return False
+            print("✓ Recording replays as a landmark source")
+            del segments, records, source
+        return True
+        
+    except Exception as e:
+        print(f"✗ Session recorder test failed: {e}")
+        return False
+
+class FrameBrightnessAnalyzer:
+    """Batch extraction test analyzer: a face wherever the frame is not dark, offset by its brightness"""
+    
+    def setup(self):
+        pass
+    
+    def reset(self):
+        pass
+    
+    def __call__(self, frame):
+        import numpy as np
+        value = int(round(frame.mean() / 10.0))
+        if value == 0:
+            return None, None
+        return value + np.arange(136, dtype=np.int32).reshape(68, 2), (value, value, value + 10, value + 10)
+
+def test_batch_extract():
+    """Test chunked multi-process landmark extraction from a video"""
+    print("\nTesting batch extraction...")
+    try:
+        import os
+        import tempfile
+        import cv2
+        import numpy as np
+        from batch_extract import extract, output_names
+        from session_recorder import load_session
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            video = os.path.join(tmp, "session.avi")
+            writer = cv2.VideoWriter(video, cv2.VideoWriter_fourcc(*'MJPG'), 30, (64, 48))
+            if not writer.isOpened():
+                print("⚠ No video encoder available - skipping batch extraction test")
+                return True
+            for i in range(25):
+                writer.write(np.full((48, 64, 3), i * 10, dtype=np.uint8))
+            writer.release()
+            
+            expected = np.arange(25)
+            for output_format in ('npz', 'npy'):
+                summary = extract([video], FrameBrightnessAnalyzer(), tmp, workers=2, chunk_frames=7,
+                                  output_format=output_format)
+                output = summary[video]['output']
+                if output_format == 'npz':
+                    data = np.load(output)
+                    landmarks, found, timestamps = data['landmarks'], data['found'], data['timestamps']
+                else:
+                    records = load_session(output)
+                    landmarks, found, timestamps = records['landmarks'], records['found'], records['timestamp']
+                if (len(found) != 25 or found[0] or not found[1:].all()
+                        or not np.array_equal(landmarks[:, 0, 0], expected)
+                        or not np.allclose(timestamps, expected / 30.0)):
+                    print(f"✗ {output_format} trace out of order or incomplete: {landmarks[:, 0, 0]}")
+                    return False
+                print(f"✓ {output_format}: 25 frames from 4 chunks on 2 workers, in order")
+                del landmarks, found, timestamps
+            
+            # Same file name in two directories, and one video listed twice
+            for name in ("a", "b"):
+                os.makedirs(os.path.join(tmp, name))
+                os.link(video, os.path.join(tmp, name, "session.avi"))
+            videos = [os.path.join(tmp, "a", "session.avi"), os.path.join(tmp, "b", "session.avi"),
+                      os.path.join(tmp, "b", ".", "session.avi")]
+            summary = extract(videos, FrameBrightnessAnalyzer(), os.path.join(tmp, "out"), workers=2,
+                              chunk_frames=7)
+            outputs = sorted(os.path.basename(result['output']) for result in summary.values())
+            if outputs != ["a_session.npz", "b_session.npz"] or any(r['frames'] != 25 for r in summary.values()):
+                print(f"✗ Clashing names or duplicates mishandled: {outputs}")
+                return False
+            try:
+                output_names(["x/s1.mp4", "x/s1.avi"])
+                print("✗ Unresolvable name clash accepted")
+                return False
+            except ValueError:
+                pass
+            print("✓ Duplicate inputs extracted once, clashing names disambiguated")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Batch extraction test failed: {e}")
+        return False
+
+def test_autotune():
+    """Test the vectorised blink and cursor parameter search on a labelled trace"""
+    print("\nTesting parameter autotuning...")
+    try:
+        import json
+        import os
+        import tempfile
+        import numpy as np
+        from autotune import load_labels, load_trace, tune_user
+        from settings import DEFAULT_CONFIG
+        
+        rng = np.random.default_rng(0)
+        fps = 30
+        timestamps = np.arange(20 * fps) / fps
+        # Eye outline with aspect ratio h / 15: 0.3 open, 0.1 closed, 0.22 squinting
+        eye = np.array([[0, 0], [10, -1], [20, -1], [30, 0], [20, 1], [10, 1]], dtype=float)
+        landmarks = np.repeat(rng.normal(130, 20, (1, 68, 2)), len(timestamps), axis=0)
+        
+        def set_eye(frames, start, h):
+            outline = eye * [1, h]
+            landmarks[frames, start:start + 6] = outline + [100 if start == 36 else 160, 100]
+        
+        set_eye(slice(None), 36, 4.5)
+        set_eye(slice(None), 42, 4.5)
+        clicks = []
+        for k, t in enumerate(np.arange(2, 19, 1.5)):
+            i = int(t * fps)
+            set_eye(slice(i, i + 5), 42 if k % 2 == 0 else 36, 1.5)
+            clicks.append([float(timestamps[i + 5]), 'left' if k % 2 == 0 else 'right'])
+        for t in (2.7, 8.3, 14.1):
+            # Squints that the default threshold of 0.25 takes for blinks
+            set_eye(slice(int(t * fps), int(t * fps) + 6), 42, 3.3)
+        
+        # Small head jitter while still, large deliberate movements afterwards
+        offsets = np.zeros((len(timestamps), 2))
+        still = (timestamps >= 1.5) & (timestamps <= 9.5)
+        offsets[still] = rng.uniform(-4, 4, (still.sum(), 2))
+        offsets[timestamps > 10] = rng.uniform(-20, 20, ((timestamps > 10).sum(), 2))
+        landmarks += offsets[:, None, :]
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.npz")
+            np.savez_compressed(path, timestamps=timestamps, landmarks=landmarks.astype(np.int32),
+                                found=np.ones(len(timestamps), dtype=bool))
+            with open(os.path.join(tmp, "trace.labels.json"), 'w') as f:
+                json.dump({"user": "test", "clicks": clicks, "still": [[1.5, 9.5]]}, f)
+            labels = load_labels(path)
+            trace = load_trace(path)
+        
+        result = tune_user([(path, trace[0], trace[1], labels)], dict(DEFAULT_CONFIG))
+        settings = result['settings']
+        if result['blink_f1'] < 1.0 or result['blink_f1'] <= result['blink_f1_before']:
+            print(f"✗ Blink F1 {result['blink_f1_before']:.2f} -> {result['blink_f1']:.2f}")
+            return False
+        if not 0.1 <= settings['eye_ar_threshold'] < 0.22:
+            print(f"✗ Threshold {settings['eye_ar_threshold']} does not separate blinks from squints")
+            return False
+        print(f"✓ Blink F1 {result['blink_f1_before']:.2f} -> {result['blink_f1']:.2f} "
+              f"at threshold {settings['eye_ar_threshold']:.2f}")
+        if result.get('drift', np.inf) >= result['drift_before']:
+            print("✗ Cursor drift while still did not improve")
+            return False
+        print(f"✓ Cursor drift {result['drift_before']:.1f} -> {result['drift']:.1f} px/s "
+              f"over {result['configurations']} configurations")
+        
+        # The vectorised closures match the live detector, including closures around track gaps
+        from autotune import eye_closures
+        from blinks import EyeBlinkDetector
+        t = np.cumsum(rng.choice([1 / 30, 1 / 30, 1 / 30, 0.8], 900, p=[0.33, 0.33, 0.33, 0.01]))
+        ear = np.where(rng.random(len(t)) < 0.15, rng.uniform(0.05, 0.2, len(t)), rng.uniform(0.2, 0.35, len(t)))
+        thresholds = np.array([0.18, 0.22, 0.26])
+        end_times, durations = eye_closures(ear, t, thresholds)
+        for k, threshold in enumerate(thresholds):
+            live = EyeBlinkDetector(threshold, min_duration=0.0, max_duration=np.inf, adaptive=False)
+            expected = [(ts, d) for ts, e in zip(t, ear) for d in [live.update(e, ts)] if d is not None]
+            found = [(ts, d) for ts, d in zip(end_times[k], durations[k]) if not np.isnan(ts)]
+            if len(found) != len(expected) or not np.allclose(found, expected):
+                print(f"✗ {len(found)} closures at threshold {threshold}, the live detector finds {len(expected)}")
+                return False
+        print(f"✓ Closures match the live detector across {int((np.diff(t) > 0.5).sum())} track gaps")
+        
+        # Blinks of both eyes, including bilateral pairing, match the live BlinkDetector
+        from autotune import BOTH, blink_events
+        from blinks import BlinkDetector
+        ears = np.stack([ear, np.where(rng.random(len(t)) < 0.5, ear, np.roll(ear, 1))], axis=1)
+        times, _, longest, eyes = blink_events(ears, t, thresholds)
+        for k, threshold in enumerate(thresholds):
+            live = BlinkDetector(threshold, min_duration=0.0, max_duration=np.inf, cooldown=0.0, adaptive=False)
+            expected = [(ts, ('left', 'right', 'both').index(eye), d)
+                        for ts, (l, r) in zip(t, ears) for eye, d in live.update(l, r, ts)]
+            found = [(ts, e, d) for ts, e, d in zip(times[k], eyes[k], longest[k]) if not np.isnan(ts)]
+            if len(found) != len(expected) or not np.allclose(found, expected):
+                print(f"✗ {len(found)} blinks at threshold {threshold}, the live detector finds {len(expected)}")
+                return False
+        print(f"✓ Blink events match the live detector with "
+              f"{int(np.nansum(eyes == BOTH))} bilateral blinks")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Autotune test failed: {e}")
+        return False
+
+def test_profiler():
+    """Test the loop profiler's stage attribution and report"""
+    print("\nTesting loop profiler...")
+    try:
+        import tempfile
+        import time
+        from metrics import PipelineMetrics
+        from profiler import LoopProfiler
+        
+        def busy(seconds):
+            start = time.perf_counter()
+            while time.perf_counter() - start < seconds:
+                pass
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            for mode in ('sample', 'cprofile'):
+                metrics = PipelineMetrics()
+                profiler = LoopProfiler(metrics, mode=mode, frames=60, seconds=0, memory_interval=0.2,
+                                        directory=tmp).start()
+                kept = []
+                while True:
+                    frame_start = time.perf_counter()
+                    busy(0.003)
+                    t = metrics.lap('detect', frame_start)
+                    busy(0.001)
+                    metrics.lap('landmarks', t)
+                    kept.append(bytearray(4096))
+                    metrics.frame_done(frame_start)
+                    if profiler.frame_done():
+                        path = profiler.stop()
+                        break
+                with open(path) as f:
+                    report = f.read()
+                if 'lap' in vars(metrics) or metrics.histograms['detect'].count != 60:
+                    print(f"✗ {mode}: metrics not restored after profiling")
+                    return False
+                if mode == 'sample':
+                    detect, landmarks = profiler._stage_time['detect'], profiler._stage_time['landmarks']
+                    if not detect > landmarks > 0 or 'busy' not in report:
+                        print(f"✗ Samples not attributed to stages: detect {detect:.3f}s, "
+                              f"landmarks {landmarks:.3f}s")
+                        return False
+                    print(f"✓ sample: detect {detect / (detect + landmarks) * 100:.0f}% of stage samples "
+                          f"(expected ~75%) from {profiler.samples} samples")
+                elif 'function calls' not in report:
+                    print("✗ cProfile statistics missing from the report")
+                    return False
+                else:
+                    print("✓ cprofile: statistics and .prof written")
+                if 'Memory:' not in report or 'test_system.py' not in report.split('Memory:')[1]:
+                    print(f"✗ {mode}: growing allocation not in the memory report")
+                    return False
+                del kept
+        print("✓ Growing allocation found by the tracemalloc snapshots")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Profiler test failed: {e}")
+        return False
+
+def test_latency_harness():
+    """Test capture timestamps, cursor move times and the synthetic-face response timing"""
+    print("\nTesting latency harness...")
+    try:
+        import numpy as np
+        from capture import ThreadedCapture
+        from cursor_output import NullCursorOutput
+        from frame_sources import SyntheticFaceSource
+        from latency_harness import response_latencies
+        from observation import eye_aspect_ratios
+        
+        # 3.5 s at 100 FPS: rest until 1 s, then right, back, down, back and left every 0.5 s
+        source = SyntheticFaceSource(duration=3.5, fps=100, hold=0.5, step=20, noise=0, lead_in=1.0,
+                                     realtime=False)
+        centres = []
+        while True:
+            ret, frame = source.read()
+            if not ret:
+                break
+            landmarks, rect = frame
+            centres.append(landmarks.mean(axis=0))
+        centres = np.array(centres) - centres[0]
+        expected = [(20, 0), (0, 0), (0, 20), (0, 0), (-20, 0)]
+        if (not np.allclose(centres[[125, 175, 225, 275, 325]], expected, atol=0.5)
+                or [away for _, away in source.onsets] != [True, False, True, False, True]):
+            print(f"✗ Synthetic face path wrong: {centres[[125, 175, 225, 275, 325]].tolist()}")
+            return False
+        if not np.allclose(eye_aspect_ratios(landmarks), 0.3, atol=0.02):
+            print("✗ Synthetic face eyes not open")
+            return False
+        print(f"✓ Synthetic face: {len(source.onsets)} movements, eyes open")
+        
+        # The capture thread hands on the source's capture timestamp with the frame
+        threaded = ThreadedCapture(SyntheticFaceSource(duration=0.2, fps=50), stale_after=1.0).start()
+        ret, frame = threaded.read()
+        stamped = threaded.capture_timestamp
+        threaded.release()
+        if not ret or not 0 < stamped <= threaded.frame_timestamp:
+            print(f"✗ Capture timestamp not carried through: {stamped} vs {threaded.frame_timestamp}")
+            return False
+        print("✓ Capture timestamp carried through the capture thread")
+        
+        cursor = NullCursorOutput((1920, 1080))
+        cursor.move_log = []
+        cursor.move_to(100, 100)
+        cursor.move_to(100, 100)
+        if len(cursor.move_log) != 1 or cursor.move_log[0][0] != cursor.last_move_time:
+            print("✗ Cursor moves not logged")
+            return False
+        
+        # Movements at 1 s (away), 2 s (back), 3 s (away, never followed)
+        onsets = [(1.0, True), (2.0, False), (3.0, True)]
+        moves = [(1.05, 0, 0), (1.5, 0, 0), (2.02, 0, 0), (2.08, 0, 0)]
+        starts, stops = response_latencies(onsets, moves)
+        if not np.allclose(starts[0], 0.05) or starts[1] != np.inf or not np.allclose(stops, [0.08]):
+            print(f"✗ Response latencies wrong: starts {starts}, stops {stops}")
+            return False
+        print("✓ Cursor start and stop latencies timed from the movement onsets")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Latency harness test failed: {e}")
+        return False
+
 def main():
     """Run all tests"""
     print("Face Navigator - System Test")
@@ -105,7 +1721,32 @@ def main():
         test_imports,
         test_camera,
         test_screen_info,
-        test_face_detection
+        test_face_detection,
+        test_threaded_capture,
+        test_face_tracker,
+        test_detection_scale,
+        test_detector_backends,
+        test_frame_sources,
+        test_latency_metrics,
+        test_cursor_output,
+        test_frame_scheduler,
+        test_cursor_filters,
+        test_model_download,
+        test_allocation_free_frame_path,
+        test_camera_modes,
+        test_parallel_pipeline,
+        test_landmark_flow,
+        test_face_observation,
+        test_blink_detection,
+        test_calibration_profiles,
+        test_head_pose,
+        test_motion_gate,
+        test_cpu_governor,
+        test_session_recorder,
+        test_batch_extract,
+        test_autotune,
+        test_profiler,
+        test_latency_harness
     ]
     
     passed = 0
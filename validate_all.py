@@ -85,7 +85,7 @@ def test_configuration():
         required_config_keys = [
             'sensitivity',
             'eye_ar_threshold', 
-            'eye_ar_consecutive_frames',
+            'blink_min_ms',
             'blink_cooldown',
             'smoothing_factor',
             'movement_threshold',
@@ -102,7 +102,7 @@ def test_configuration():
         validations = [
             ('sensitivity', config['sensitivity'] > 0),
             ('eye_ar_threshold', 0.1 <= config['eye_ar_threshold'] <= 0.5),
-            ('eye_ar_consecutive_frames', 1 <= config['eye_ar_consecutive_frames'] <= 10),
+            ('blink_min_ms', 20 <= config['blink_min_ms'] <= 1000),
             ('blink_cooldown', 0.1 <= config['blink_cooldown'] <= 2.0),
             ('smoothing_factor', 0.0 <= config['smoothing_factor'] <= 1.0),
             ('movement_threshold', config['movement_threshold'] >= 0),
@@ -143,8 +143,8 @@ def test_main_script():
             'import cv2',
             'import dlib', 
             'import numpy',
-            'import pyautogui',
-            'from scipy.spatial import distance',
+            'from cursor_output import',
+            'from observation import FaceObservation',
             'from imutils import face_utils'
         ]
         
@@ -161,7 +161,6 @@ def test_main_script():
             'class FaceNavigator',
             'def load_config',
             'def save_config',
-            'def calculate_eye_aspect_ratio',
             'def calibrate_face_center',
             'def move_cursor_with_face',
             'def detect_blinks',
@@ -176,6 +175,16 @@ def test_main_script():
                 print(f"✗ {method} - not found") 
                 missing_methods.append(method)
         
+        # Eye aspect ratios are computed in observation.py, guarded against a collapsed eye's zero width
+        with open('observation.py', 'r') as f:
+            observation = f.read()
+        collapsed_eye_guard = 'if lengths[2] > 0 else 0.0'
+        if collapsed_eye_guard in observation:
+            print("✓ Collapsed-eye guard in eye_aspect_ratios")
+        else:
+            print("✗ Collapsed-eye guard in eye_aspect_ratios - not found")
+            missing_methods.append(collapsed_eye_guard)
+        
         if missing_imports or missing_methods:
             return False
         